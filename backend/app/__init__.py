@@ -14,11 +14,12 @@ from backend.app.database import db, init_db
 from backend.app.sse import sse_bp
 
 # Import models for reference
-from .models import RequestLog, TokenBlocklist
+from .models import TokenBlocklist
 from .models.user import User
 
 # Import settings
 from .config.settings import settings
+from .request_audit import request_audit
 
 # Load environment variables
 load_dotenv()
@@ -49,7 +50,8 @@ def create_app(config_name=None):
     init_db(app)
 
     # Initialize other extensions
-    CORS(app)
+    # paginated listings return the next page's cursor in headers; let cross-origin pages read them
+    CORS(app, expose_headers=["X-Next-Cursor", "Link"])
     migrate.init_app(app, db)
     jwt = JWTManager(app)
     login_manager.init_app(app)
@@ -66,8 +68,13 @@ def create_app(config_name=None):
         return send_from_directory(scripts_dir, filename)
 
     # -------------------- Request logging --------------------
+    # rows are queued and bulk-inserted by a background thread, not committed per request
+    request_audit.init_app(app)
+
     @app.before_request
     def log_request():
+        if not request_audit.wants(request.path):
+            return
         user_id = None
         try:
             verify_jwt_in_request(optional=True)
@@ -75,12 +82,7 @@ def create_app(config_name=None):
         except Exception:
             pass
 
-        log = RequestLog(
-            user_id=user_id,
-            endpoint=request.path
-        )
-        db.session.add(log)
-        db.session.commit()
+        request_audit.record(request.path, user_id)
 
     # -------------------- Orchestration Logger --------------------
     orch_logger = logging.getLogger("infinitybrain")
@@ -171,8 +173,10 @@ def create_app(config_name=None):
     from .routes.main import main_bp
     from .routes.feedback_routes import feedback_bp
     from .routes.recommendation_routes import recommendation_bp
+    from .routes.esg_routes import esg_bp
     from .routes.admin_routes import admin_bp
     from .routes.design_routes import design_bp
+    from .routes.image_routes import images_bp
     from backend.app.routes.persona_mesh import persona_mesh_bp
     from .routes.infinitybrain_routes import ib_bp
     from .routes.workflow_routes import bp as workflow_bp
@@ -184,12 +188,20 @@ def create_app(config_name=None):
     app.register_blueprint(workflow_bp)
     app.register_blueprint(ib_bp)
     app.register_blueprint(design_bp, url_prefix='/designs')
+    app.register_blueprint(images_bp)
     app.register_blueprint(admin_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(product_bp)
     app.register_blueprint(main_bp)
     app.register_blueprint(feedback_bp)
     app.register_blueprint(recommendation_bp)
+    app.register_blueprint(esg_bp)
     app.register_blueprint(persona_mesh_bp)
 
+    # -------------------- Model warm-up --------------------
+    # recommender artifacts load on a background thread instead of at import
+    if app.config.get("RECOMMENDER_WARMUP", True):
+        from .services.model_registry import recommender
+        recommender.warm_up()
+
     return app
@@ -3,7 +3,7 @@ from fastapi import APIRouter
 from backend.app.database import get_db
 from backend.app.models import WaitStepTimer
 from sqlalchemy.orm import Session
-from backend.app.tasks.wait_signal import wait_step_task
+from datetime import datetime
 
 router = APIRouter()
 
@@ -17,9 +17,8 @@ def send_signal(run_id: int, signal_name: str):
         WaitStepTimer.status == "pending"
     ).all()
     for timer in timers:
-        timer.status = "triggered"
-        db.commit()
-        # enqueue step immediately
-        wait_step_task.delay(timer.id)
+        # make the timer due now; the next fire_due_timers tick resumes the step
+        timer.trigger_at = datetime.utcnow()
+    db.commit()
 
     return {"success": True, "triggered_timers": len(timers)}
@@ -0,0 +1,104 @@
+# backend/app/buffered_worker.py
+import os
+import threading
+
+# How long the atexit hooks wait for a final flush before giving up on what is left
+EXIT_FLUSH_TIMEOUT = 5.0
+
+
+class BufferedWorker:
+    """
+    Queue-and-flush machinery shared by the background writers (EventLog,
+    RequestAudit, TaskPulseSender).
+
+    Producers append to the subclass's buffer with `_cond` held, call
+    `_added()` to wake the daemon thread once `batch_size` items are queued,
+    then `_ensure_thread()`. The thread takes a batch with `_take()` every
+    `flush_interval` seconds (sooner when a batch fills) and hands it to
+    `_write()`. Batches are taken and written under `_write_lock`, so flush()
+    never misses one that is in flight.
+
+    Subclasses implement `_pending()` and `_take()` (called with `_cond`
+    held) and `_write(batch)`.
+    """
+
+    def __init__(self, batch_size, flush_interval, thread_name):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._thread_name = thread_name
+        self._cond = threading.Condition()
+        self._write_lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def _pending(self):
+        raise NotImplementedError
+
+    def _take(self):
+        """Remove and return the next batch; empty when nothing is queued."""
+        raise NotImplementedError
+
+    def _write(self, batch):
+        raise NotImplementedError
+
+    # ---------------- producer side ----------------
+    def _added(self):
+        """Call with `_cond` held after queueing: wakes the thread once a batch is full."""
+        if self._pending() >= self.batch_size:
+            self._cond.notify()
+
+    def pending_count(self):
+        with self._cond:
+            return self._pending()
+
+    # ---------------- flushing ----------------
+    def flush(self):
+        """Synchronously write everything queued, after any in-flight batch (tests, exit)."""
+        with self._write_lock:
+            while True:
+                with self._cond:
+                    batch = self._take()
+                if not batch:
+                    return
+                self._write(batch)
+
+    def close(self, timeout=None):
+        """
+        Stop the thread and flush what is queued. With `timeout`, give up
+        after that many seconds and leave the rest (interpreter exit must not
+        hang on a slow sink); returns whether everything was flushed.
+        """
+        self._stopped.set()
+        with self._cond:
+            self._cond.notify()
+        if timeout is None:
+            self.flush()
+            return True
+        closer = threading.Thread(target=self.flush, name=f"{self._thread_name}-close", daemon=True)
+        closer.start()
+        closer.join(timeout)
+        return not closer.is_alive()
+
+    def _ensure_thread(self):
+        # restart after fork: the parent's thread does not exist in a worker child
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name=self._thread_name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            with self._cond:
+                if self._pending() < self.batch_size:
+                    self._cond.wait(timeout=self.flush_interval)
+            with self._write_lock:
+                with self._cond:
+                    batch = self._take()
+                if batch:
+                    self._write(batch)
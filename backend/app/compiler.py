@@ -1,14 +1,27 @@
 # backend/app/compiler.py
+from backend.app.services.plan_cache import build_plan, cached_plan
 
-def compile_workflow_from_yaml(yaml_text: str) -> dict:
+
+def compile_workflow_from_yaml(yaml_text: str, version: str = None) -> dict:
     """
-    Minimal stub: parse YAML and return DAG nodes.
-    Replace with your actual YAML compiler logic later.
+    Minimal stub: parse YAML and return DAG nodes plus the entry nodes
+    (steps without depends_on). Compiled per (yaml_text, version) and cached.
     """
+    return cached_plan("compiler", yaml_text, version, _compile_yaml).payload
+
+
+def _compile_yaml(yaml_text: str):
     import yaml
     dag = yaml.safe_load(yaml_text)
     # For simplicity, return nodes as a list
-    return {"nodes": dag.get("steps", [])}
+    steps = dag.get("steps", [])
+    edges = []
+    for step in steps:
+        depends = step.get("depends_on") or []
+        depends = [depends] if isinstance(depends, str) else depends
+        edges.extend((dep, step["id"]) for dep in depends)
+    entry = [s for s in steps if not s.get("depends_on")]
+    return build_plan([s["id"] for s in steps], edges, payload={"nodes": steps, "entry": entry})
 
 # Store step definitions globally for lookup
 _STEP_DEFS = {}
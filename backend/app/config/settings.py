@@ -25,6 +25,100 @@ class Settings:
     ORCHESTRATOR_MOCK_MODE = True
     ORCHESTRATOR_LOG_LEVEL = "INFO"
 
+    # Workflow executor: "serial" runs steps inline, "thread"/"process" use a shared pool
+    EXECUTOR_MODE = os.getenv("EXECUTOR_MODE", "serial")
+    EXECUTOR_MAX_WORKERS = int(os.getenv("EXECUTOR_MAX_WORKERS", 8))
+    EXECUTOR_RUN_CONCURRENCY = int(os.getenv("EXECUTOR_RUN_CONCURRENCY", 4))
+    EXECUTOR_GLOBAL_CONCURRENCY = int(os.getenv("EXECUTOR_GLOBAL_CONCURRENCY", 32))
+    # /flow/run/start enqueues runs on Celery and returns 202 instead of executing inline
+    FLOW_ASYNC_START = os.getenv("FLOW_ASYNC_START", "False").lower() == "true"
+    # Compiled DAGs kept in the per-process LRU (keyed by DSL hash + version)
+    PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", 256))
+    # Wait-step timers: beat tick interval and timers fired per batch
+    TIMER_TICK_SECONDS = float(os.getenv("TIMER_TICK_SECONDS", 1.0))
+    TIMER_BATCH_SIZE = int(os.getenv("TIMER_BATCH_SIZE", 500))
+
+    # SSE fan-out: per-client buffered events, keep-alive interval
+    SSE_CLIENT_QUEUE_SIZE = int(os.getenv("SSE_CLIENT_QUEUE_SIZE", 256))
+    SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+
+    # TaskPulseOS delivery (background batched sender)
+    TASKPULSEOS_URL = os.getenv("TASKPULSEOS_URL", "https://taskpulseos.example.com/api/workflow-update")
+    TASKPULSEOS_BATCH_SIZE = int(os.getenv("TASKPULSEOS_BATCH_SIZE", 100))
+    TASKPULSEOS_FLUSH_INTERVAL = float(os.getenv("TASKPULSEOS_FLUSH_INTERVAL", 0.5))
+    TASKPULSEOS_MAX_PENDING = int(os.getenv("TASKPULSEOS_MAX_PENDING", 10000))
+    TASKPULSEOS_MAX_RETRIES = int(os.getenv("TASKPULSEOS_MAX_RETRIES", 5))
+    TASKPULSEOS_RETRY_BACKOFF = float(os.getenv("TASKPULSEOS_RETRY_BACKOFF", 0.5))
+    TASKPULSEOS_SPILL_PATH = os.getenv("TASKPULSEOS_SPILL_PATH", "/tmp/taskpulseos_spill.jsonl")
+    TASKPULSEOS_SPILL_MAX_BYTES = int(os.getenv("TASKPULSEOS_SPILL_MAX_BYTES", 10 * 1024 * 1024))
+    # "event": one JSON event per POST (the TaskPulseOS contract); "batch": {"events": [...]} per POST,
+    # only for receivers that accept batches
+    TASKPULSEOS_PAYLOAD = os.getenv("TASKPULSEOS_PAYLOAD", "event")
+
+    # Buffered CSV event logs (recommendation log, AI mock logs); 0 disables a rotation trigger
+    EVENT_LOG_CAPACITY = int(os.getenv("EVENT_LOG_CAPACITY", 10000))
+    EVENT_LOG_BATCH_SIZE = int(os.getenv("EVENT_LOG_BATCH_SIZE", 500))
+    EVENT_LOG_FLUSH_INTERVAL = float(os.getenv("EVENT_LOG_FLUSH_INTERVAL", 1.0))
+    EVENT_LOG_MAX_BYTES = int(os.getenv("EVENT_LOG_MAX_BYTES", 50 * 1024 * 1024))
+    EVENT_LOG_ROTATE_SECONDS = int(os.getenv("EVENT_LOG_ROTATE_SECONDS", 86400))
+
+    # Request audit log (RequestLog rows): buffered and bulk-inserted off the request path.
+    # Excluded path prefixes are never logged; REQUEST_LOG_SAMPLE_RULES ("/prefix=rate,...")
+    # override REQUEST_LOG_SAMPLE_RATE for matching paths
+    REQUEST_LOG_CAPACITY = int(os.getenv("REQUEST_LOG_CAPACITY", 10000))
+    REQUEST_LOG_BATCH_SIZE = int(os.getenv("REQUEST_LOG_BATCH_SIZE", 500))
+    REQUEST_LOG_FLUSH_INTERVAL = float(os.getenv("REQUEST_LOG_FLUSH_INTERVAL", 1.0))
+    REQUEST_LOG_SAMPLE_RATE = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", 1.0))
+    REQUEST_LOG_SAMPLE_RULES = os.getenv("REQUEST_LOG_SAMPLE_RULES", "")
+    REQUEST_LOG_EXCLUDE = tuple(p.strip() for p in os.getenv(
+        "REQUEST_LOG_EXCLUDE",
+        "/metrics,/scripts/,/stream/,/events/,/flasgger_static/,/apidocs/,/apispec.json"
+    ).split(",") if p.strip())
+
+    # Recommendations: results per request (clients may pass "k" up to the max)
+    RECOMMEND_DEFAULT_K = int(os.getenv("RECOMMEND_DEFAULT_K", 3))
+    RECOMMEND_MAX_K = int(os.getenv("RECOMMEND_MAX_K", 50))
+    # Largest page the cursor-paginated listings (catalog, design gallery) return
+    LIST_PAGE_MAX_SIZE = int(os.getenv("LIST_PAGE_MAX_SIZE", 100))
+    # Recommender artifacts (default: repo models/ dir); warm-up loads them off the request path
+    RECOMMENDER_MODEL_PATH = os.getenv("RECOMMENDER_MODEL_PATH")
+    ESG_MODEL_PATH = os.getenv("ESG_MODEL_PATH")
+    RECOMMENDER_ARTIFACT_DIR = os.getenv("RECOMMENDER_ARTIFACT_DIR")
+    RECOMMENDER_WARMUP = os.getenv("RECOMMENDER_WARMUP", "True").lower() == "true"
+    # ESG scoring: max products per /api/esg-score/batch request
+    ESG_BATCH_MAX_SIZE = int(os.getenv("ESG_BATCH_MAX_SIZE", 10000))
+    # Bulk product import: manifests/image dirs must live under PRODUCT_IMPORT_DIR;
+    # rows per committed chunk
+    PRODUCT_IMPORT_DIR = os.getenv("PRODUCT_IMPORT_DIR", "data/imports")
+    PRODUCT_IMPORT_CHUNK_SIZE = int(os.getenv("PRODUCT_IMPORT_CHUNK_SIZE", 200))
+    # Content-addressed image store (product and design images) and thumbnail edge sizes in px
+    IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", "data/images")
+    IMAGE_THUMBNAIL_SIZES = [int(s) for s in os.getenv("IMAGE_THUMBNAIL_SIZES", "128,512").split(",") if s.strip()]
+    IMAGE_CACHE_MAX_AGE = int(os.getenv("IMAGE_CACHE_MAX_AGE", 365 * 24 * 3600))
+    # Cache-Control of read-mostly routes; ETags let browsers and the CDN revalidate with 304s.
+    # IMAGE_CACHE_CONTROL covers id-addressed images (/designs/design-image/<id>, /product/images/<id>)
+    CATALOG_CACHE_CONTROL = os.getenv("CATALOG_CACHE_CONTROL", "public, max-age=30, stale-while-revalidate=60")
+    IMAGE_CACHE_CONTROL = os.getenv("IMAGE_CACHE_CONTROL", "public, max-age=300")
+
+    # Recommendation result cache: per-process LRU (0 disables) plus optional shared Redis tier;
+    # other workers see a catalog change within QUERY_CACHE_VERSION_TTL seconds
+    QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", 1024))
+    QUERY_CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", 300))
+    QUERY_CACHE_REDIS = os.getenv("QUERY_CACHE_REDIS", "True").lower() == "true"
+    QUERY_CACHE_VERSION_TTL = float(os.getenv("QUERY_CACHE_VERSION_TTL", 1.0))
+    # Incremental catalog updates: product changes shared through a Redis list, polled per worker
+    CATALOG_SYNC_REDIS = os.getenv("CATALOG_SYNC_REDIS", "True").lower() == "true"
+    CATALOG_SYNC_INTERVAL = float(os.getenv("CATALOG_SYNC_INTERVAL", 1.0))
+    # Past this many delta products or change-list entries, fold them into a new artifact (Celery task)
+    CATALOG_DELTA_MAX = int(os.getenv("CATALOG_DELTA_MAX", 5000))
+    CATALOG_CHANGES_MAX = int(os.getenv("CATALOG_CHANGES_MAX", 50000))
+    # Candidate retrieval: exact (full scan), inverted (TF-IDF postings) or ivf (ANN);
+    # max postings per term (0 = all, exact) and IVF cells / cells probed per query
+    RECOMMENDER_INDEX = os.getenv("RECOMMENDER_INDEX", "inverted")
+    RECOMMENDER_MAX_POSTINGS = int(os.getenv("RECOMMENDER_MAX_POSTINGS", 0))
+    RECOMMENDER_IVF_LISTS = int(os.getenv("RECOMMENDER_IVF_LISTS", 64))
+    RECOMMENDER_IVF_PROBE = int(os.getenv("RECOMMENDER_IVF_PROBE", 8))
+
     # HTTP Hardening
     HTTP_ALLOWED_HOSTS = os.getenv(
         "HTTP_ALLOWED_HOSTS",
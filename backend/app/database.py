@@ -36,3 +36,5 @@ def init_db(app=None):
         db.init_app(app)
         with app.app_context():
             db.create_all()
+            # non-Flask models (e.g. WaitStepTimer) share the app database
+            Base.metadata.create_all(bind=db.engine)
@@ -0,0 +1,151 @@
+# backend/app/event_log.py
+import atexit
+import csv
+import io
+import logging
+import os
+import threading
+import time
+from collections import deque
+from backend.app.buffered_worker import EXIT_FLUSH_TIMEOUT, BufferedWorker
+from backend.app.config.settings import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: single O_APPEND writes only, no cross-process lock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class EventLog(BufferedWorker):
+    """
+    Buffered CSV event sink shared by every writer of one file.
+
+    write() only appends to an in-memory ring buffer of `capacity` rows (the
+    oldest rows are dropped when it is full), so request handlers never touch
+    the disk. A daemon thread writes the buffer out every `flush_interval`
+    seconds, or as soon as `batch_size` rows are pending, as one append.
+
+    Each flush holds an flock on `<path>.lock`, so workers and the mock
+    services sharing a file never interleave rows, write the header twice or
+    rotate under each other. The file is rotated to `<name>.<timestamp><ext>`
+    once it exceeds `max_bytes` or when its last write falls in an earlier
+    `rotate_seconds` period.
+    """
+
+    def __init__(self, path, fieldnames, capacity=10000, batch_size=500, flush_interval=1.0,
+                 max_bytes=50 * 1024 * 1024, rotate_seconds=None):
+        self.path = os.path.abspath(path)
+        super().__init__(batch_size, flush_interval, f"event-log-{os.path.basename(self.path)}")
+        self.fieldnames = list(fieldnames)
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+
+        self._buffer = deque(maxlen=capacity)
+        self.stats = {"written": 0, "dropped": 0, "rotations": 0, "errors": 0}
+
+    # ---------------- producer side ----------------
+    def write(self, row):
+        """Queue one row: a dict keyed by fieldnames or a sequence in fieldnames order."""
+        if isinstance(row, dict):
+            row = [row.get(name, "") for name in self.fieldnames]
+        with self._cond:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.stats["dropped"] += 1
+            self._buffer.append(row)
+            self._added()
+        self._ensure_thread()
+
+    # ---------------- flushing ----------------
+    def _pending(self):
+        return len(self._buffer)
+
+    def _take(self):
+        rows = list(self._buffer)
+        self._buffer.clear()
+        return rows
+
+    def _write(self, rows):
+        out = io.StringIO()
+        csv.writer(out).writerows(rows)
+        data = out.getvalue().encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(f"{self.path}.lock", "a") as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    self._rotate_if_needed(len(data))
+                    fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    try:
+                        if os.fstat(fd).st_size == 0:
+                            header = io.StringIO()
+                            csv.writer(header).writerow(self.fieldnames)
+                            data = header.getvalue().encode("utf-8") + data
+                        os.write(fd, data)
+                    finally:
+                        os.close(fd)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock, fcntl.LOCK_UN)
+            self.stats["written"] += len(rows)
+        except OSError as e:
+            logger.error("Event log write to %s failed: %s", self.path, e)
+            self.stats["errors"] += 1
+            self.stats["dropped"] += len(rows)
+
+    def _rotate_if_needed(self, incoming):
+        """Called with the file lock held."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if st.st_size == 0:
+            return
+        now = time.time()
+        too_big = self.max_bytes and st.st_size + incoming > self.max_bytes
+        expired = self.rotate_seconds and int(st.st_mtime // self.rotate_seconds) != int(now // self.rotate_seconds)
+        if not (too_big or expired):
+            return
+        root, ext = os.path.splitext(self.path)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(st.st_mtime))
+        target = f"{root}.{stamp}{ext}"
+        n = 1
+        while os.path.exists(target):
+            target = f"{root}.{stamp}.{n}{ext}"
+            n += 1
+        os.replace(self.path, target)
+        self.stats["rotations"] += 1
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def event_log(path, fieldnames):
+    """The process-wide EventLog for `path`, created from settings on first use."""
+    path = os.path.abspath(path)
+    with _logs_lock:
+        log = _logs.get(path)
+        if log is None:
+            log = _logs[path] = EventLog(
+                path,
+                fieldnames,
+                capacity=settings.EVENT_LOG_CAPACITY,
+                batch_size=settings.EVENT_LOG_BATCH_SIZE,
+                flush_interval=settings.EVENT_LOG_FLUSH_INTERVAL,
+                max_bytes=settings.EVENT_LOG_MAX_BYTES,
+                rotate_seconds=settings.EVENT_LOG_ROTATE_SECONDS,
+            )
+        return log
+
+
+def close_all():
+    with _logs_lock:
+        logs = list(_logs.values())
+    for log in logs:
+        log.close(EXIT_FLUSH_TIMEOUT)
+
+
+atexit.register(close_all)
@@ -1,13 +1,24 @@
 import json
+import logging
+import time
+import redis
 import requests
 from datetime import datetime
 from flask import Response
-from threading import Lock
+from backend.app.config.settings import settings
+from backend.app.sse_hub import hub, LOCAL_CHANNEL
+from backend.app.taskpulse_sender import sender as taskpulse
 
-clients = []
-clients_lock = Lock()
+logger = logging.getLogger(__name__)
 
-TASKPULSEOS_URL = "https://taskpulseos.example.com/api/workflow-update"
+TASKPULSEOS_URL = settings.TASKPULSEOS_URL
+
+# Redis channel workflow_{run_id} feeds the /stream/<run_id> SSE endpoint.
+# Publishing is on the executor's hot path: short timeouts, and after a failure
+# events are skipped for REDIS_RETRY_SECONDS instead of stalling every step.
+r = redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.2, socket_timeout=0.2)
+REDIS_RETRY_SECONDS = 30.0
+_redis_down_until = 0.0
 
 def push_update(data: dict):
     """
@@ -15,30 +26,38 @@ def push_update(data: dict):
     """
     data["timestamp"] = datetime.utcnow().isoformat()
 
-    # Push to SSE clients
-    with clients_lock:
-        for q in clients:
-            q.put(data)
+    # Push to SSE clients of /events/stream (bounded buffers, slow clients evicted)
+    hub.dispatch(LOCAL_CHANNEL, json.dumps(data))
 
-    # Push to TaskPulseOS (async / best-effort)
-    try:
-        requests.post(TASKPULSEOS_URL, json=data, timeout=1)
-    except Exception as e:
-        print(f"TaskPulseOS push failed: {e}")
+    # Push to TaskPulseOS: queued for the background batched sender, never blocks the step
+    taskpulse.submit(data)
 
-def register_client(queue):
-    with clients_lock:
-        clients.append(queue)
 
-def unregister_client(queue):
-    with clients_lock:
-        if queue in clients:
-            clients.remove(queue)
+# -------------------------
+# Run progress (Redis pub/sub)
+# -------------------------
+def publish_workflow_event(run_id, data: dict):
+    """
+    Publish a run/step event on the workflow_{run_id} channel (best-effort).
+    """
+    global _redis_down_until
+    if time.monotonic() < _redis_down_until:
+        return
+    event = dict(data)
+    event["run_id"] = run_id
+    event["timestamp"] = datetime.utcnow().isoformat()
+    try:
+        r.publish(f"workflow_{run_id}", json.dumps(event))
+    except redis.RedisError as e:
+        logger.warning("Workflow event publish failed (%s); skipping events for %.0fs", e, REDIS_RETRY_SECONDS)
+        _redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
 
-def sse_stream(queue):
-    while True:
-        data = queue.get()
-        yield f"data: {json.dumps(data)}\n\n"
+def publish_step_event(run_id, step_id, status):
+    """
+    Publish a step status change to SSE subscribers and TaskPulseOS.
+    """
+    publish_workflow_event(run_id, {"type": "step", "step_id": step_id, "status": status})
+    push_update({"run_id": run_id, "step_id": step_id, "status": status})
 
 
 # -------------------------
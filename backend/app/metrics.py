@@ -1,5 +1,5 @@
 # backend/app/metrics.py
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 # Count how many tasks are started and failed
 TASKS_STARTED = Counter("tasks_started_total", "Total tasks started", ["name"])
@@ -40,3 +40,28 @@ STEP_COMPENSATION_COUNTER = Counter(
     "Total number of compensations executed",
     ["workflow_name", "step_id"]
 )
+
+# SSE fan-out hub
+SSE_CLIENTS_GAUGE = Gauge(
+    "sse_clients",
+    "SSE clients currently attached to this process"
+)
+
+SSE_EVICTIONS_COUNTER = Counter(
+    "sse_client_evictions_total",
+    "SSE clients dropped because their buffer overflowed"
+)
+
+# Recommendation query cache
+QUERY_CACHE_COUNTER = Counter(
+    "recommend_query_cache_total",
+    "Recommendation query cache lookups",
+    ["tier", "result"]
+)
+
+# Request audit log (RequestLog rows)
+REQUEST_LOG_COUNTER = Counter(
+    "request_log_entries_total",
+    "Request audit log entries by outcome: flushed, dropped or sampled_out",
+    ["result"]
+)
@@ -1,16 +1,18 @@
 # backend/app/models/WaitStepTimer.py
-from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from ..database import Base
 
 class WaitStepTimer(Base):
     __tablename__ = "wait_step_timers"
+    # due-timer scans: WHERE status = 'pending' AND trigger_at <= now ORDER BY trigger_at
+    __table_args__ = (Index("ix_wait_step_timers_due", "status", "trigger_at"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     run_id = Column(Integer, nullable=False)
     step_id = Column(String, nullable=False)
     trigger_at = Column(DateTime, nullable=False)  # when timer expires
     payload_json = Column(JSON, nullable=True)
-    status = Column(String, default="pending")  # pending, triggered
+    status = Column(String, default="pending")  # pending, triggered, retry (run not enqueued yet)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -10,6 +10,7 @@ from .feedback import Feedback
 from .request_log import RequestLog
 from .design import Design
 from .product_image import ProductImage
+from .product_import import ProductImport
 from .roles import Role
 from .permission import Permission
 from .token_blocklist import TokenBlocklist
@@ -17,14 +18,14 @@ from .workflow_defs import WorkflowDef
 from .runs import Run
 from .run_steps import RunStep
 from .run_var import RunVar
-from .signals import Signal
+from .signals import Signal, SignalWait
 from .locks import Lock
 from .compensations import Compensation
 from .WaitStepTimer import WaitStepTimer  
 
 __all__ = [
     "Base",  # <-- make sure Base is exported
-    "User", "Product", "Feedback", "RequestLog", "Design", "ProductImage",
+    "User", "Product", "Feedback", "RequestLog", "Design", "ProductImage", "ProductImport",
     "Role", "Permission", "TokenBlocklist",
-    "WorkflowDef", "Run", "RunStep", "RunVar", "Signal", "Lock", "Compensation","WaitStepTimer"
+    "WorkflowDef", "Run", "RunStep", "RunVar", "Signal", "SignalWait", "Lock", "Compensation","WaitStepTimer"
 ]
@@ -1,11 +1,18 @@
+from sqlalchemy.orm import deferred
 from ..database import db
 from datetime import datetime
 
 class Design(db.Model):
+    # keyset pagination of the gallery: ORDER BY timestamp DESC, id DESC
+    __table_args__ = (db.Index("ix_design_timestamp_id", "timestamp", "id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(150), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    image_url = db.Column(db.LargeBinary(length=(2**24 - 1))) 
+    # sha256 of the bytes in the image store; image_url (raw bytes) only holds rows not yet moved there
+    image_key = db.Column(db.String(64), index=True)
+    # loaded only when accessed, never by listings
+    image_url = deferred(db.Column(db.LargeBinary(length=(2**24 - 1))))
     image_mime = db.Column(db.String(50), nullable=False)
     category = db.Column(db.String(50), nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
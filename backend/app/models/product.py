@@ -4,6 +4,9 @@ import base64
 import json
 
 class Product(db.Model):
+    # keyset pagination of the catalog: ORDER BY created_at DESC, id DESC
+    __table_args__ = (db.Index("ix_product_created_at_id", "created_at", "id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     brand = db.Column(db.String(100))
@@ -21,6 +24,8 @@ class Product(db.Model):
     likes = db.Column(db.Integer, default=0)
     views = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # row version for HTTP validators (catalog ETags)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Use back_populates here to pair with ProductImage.product
     images = db.relationship("ProductImage", back_populates="product", cascade="all, delete-orphan")
@@ -1,9 +1,14 @@
+from sqlalchemy.orm import deferred
 from ..database import db
 
 class ProductImage(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     product_id = db.Column(db.Integer, db.ForeignKey('product.id'), nullable=False)
-    image_data = db.Column(db.LargeBinary, nullable=False)
+    # sha256 of the bytes in the image store; image_data only holds rows not yet moved there
+    image_key = db.Column(db.String(64), index=True)
+    image_mime = db.Column(db.String(50))
+    # loaded only when accessed, never by listings
+    image_data = deferred(db.Column(db.LargeBinary))
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
 
     # Use back_populates here as well
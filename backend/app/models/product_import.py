@@ -0,0 +1,40 @@
+from ..database import db
+from datetime import datetime
+
+
+class ProductImport(db.Model):
+    """
+    A bulk product import job. Counters are updated in the same transaction
+    as each imported chunk, so `rows_done` is exactly where a resumed job
+    continues reading the manifest.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    manifest = db.Column(db.String(500), nullable=False)
+    image_dir = db.Column(db.String(500), nullable=False)
+    # sha1 of the manifest; a job only resumes on the file it started with
+    fingerprint = db.Column(db.String(40), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    status = db.Column(db.String(20), default="pending")  # pending, running, completed, failed
+    rows_done = db.Column(db.Integer, default=0)
+    inserted = db.Column(db.Integer, default=0)
+    rejected = db.Column(db.Integer, default=0)
+    errors = db.Column(db.JSON, default=list)  # first rejected rows: [{"row": n, "error": "..."}]
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "manifest": self.manifest,
+            "image_dir": self.image_dir,
+            "user_id": self.user_id,
+            "status": self.status,
+            "rows_done": self.rows_done,
+            "inserted": self.inserted,
+            "rejected": self.rejected,
+            "errors": self.errors or [],
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
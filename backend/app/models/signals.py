@@ -9,3 +9,18 @@ class Signal(db.Model):
     name = db.Column(db.String(255), nullable=False)
     payload_json = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class SignalWait(db.Model):
+    """Index of parked steps: which step of a run is waiting for which signal."""
+    __tablename__ = "signal_waits"
+    __table_args__ = (
+        db.UniqueConstraint("run_id", "step_id", name="uq_signal_waits_run_step"),
+        db.Index("ix_signal_waits_run_signal", "run_id", "signal_name"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    run_id = db.Column(db.Integer, db.ForeignKey("runs.id"), nullable=False)
+    step_id = db.Column(db.String(100), nullable=False)
+    signal_name = db.Column(db.String(255))  # NULL: resumed by any signal
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -1,3 +1,4 @@
+from sqlalchemy.orm import deferred
 from ..database import db
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
@@ -14,7 +15,8 @@ class User(db.Model):
     feedbacks = db.relationship('Feedback', backref='user', lazy=True)
     status = db.Column(db.String(10), default='Inactive')
     bio = db.Column(db.Text, nullable=True)  
-    image_url = db.Column(db.LargeBinary(length=(2**24 - 1))) 
+    # profile image bytes, loaded only where served (never by listings or auth checks)
+    image_url = deferred(db.Column(db.LargeBinary(length=(2**24 - 1))))
     image_mime = db.Column(db.String(50), nullable=True)
 
 
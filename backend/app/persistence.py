@@ -1,12 +1,121 @@
 # backend/app/persistence.py
 from datetime import datetime
+from sqlalchemy import insert, update, func
 from sqlalchemy.orm import Session
 from backend.app.models.workflow_defs import WorkflowDef
 from backend.app.models.runs import Run
 from backend.app.models.run_steps import RunStep
 
+# Statuses that close a step's execution window (ended_at is stamped)
+TERMINAL_STEP_STATUSES = ("done", "success", "completed", "failed", "skipped", "cancelled")
 
 
+# ----------------------
+# Bulk helpers (no commit; callers commit once per batch)
+# ----------------------
+def bulk_create_steps(db: Session, run_id: int, steps: list[dict]) -> list[RunStep]:
+    """Insert every RunStep for a run with a single multi-row INSERT ... RETURNING."""
+    if not steps:
+        return []
+    rows = [
+        {
+            "run_id": run_id,
+            "step_id": s["id"],
+            "type": s.get("type"),
+            "status": s.get("status", "pending"),
+            "attempt": 0,
+            "input_json": s.get("input_json"),
+        }
+        for s in steps
+    ]
+    stmt = insert(RunStep).returning(RunStep, sort_by_parameter_order=True)
+    return db.scalars(stmt, rows).all()
+
+
+def bulk_update_steps(db: Session, run_id: int, step_ids: list[str], status: str,
+                      now: datetime | None = None, **values):
+    """Move `step_ids` of a run to `status` with one multi-row UPDATE."""
+    if not step_ids:
+        return 0
+    now = now or datetime.utcnow()
+    values["status"] = status
+    if status == "running":
+        values.setdefault("started_at", now)
+        values.setdefault("attempt", func.coalesce(RunStep.attempt, 0) + 1)
+    elif status in TERMINAL_STEP_STATUSES:
+        values.setdefault("ended_at", now)
+
+    stmt = (
+        update(RunStep)
+        .where(RunStep.run_id == run_id, RunStep.step_id.in_(step_ids))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).rowcount
+
+
+def claim_steps(db: Session, run_id: int, step_ids: list[str], now: datetime | None = None) -> list[str]:
+    """
+    Move the still-pending `step_ids` of a run to "running" with one
+    conditional UPDATE; returns the ids this call claimed. A step that a
+    concurrent pass (or a cancel) already moved is left alone.
+    """
+    if not step_ids:
+        return []
+    now = now or datetime.utcnow()
+    stmt = (
+        update(RunStep)
+        .where(RunStep.run_id == run_id, RunStep.step_id.in_(step_ids), RunStep.status == "pending")
+        .values(status="running", started_at=now, attempt=func.coalesce(RunStep.attempt, 0) + 1)
+        .returning(RunStep.step_id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(db.scalars(stmt))
+
+
+class StepWriteBuffer:
+    """
+    Collects RunStep status transitions for one run and writes them as one
+    UPDATE per target status. The executor flushes it once per scheduling
+    wave, so a wave costs a single commit regardless of how many steps moved.
+    Moves to "running" only apply to steps that are still pending (see
+    claim_steps); the others are left out of the flushed transitions.
+    """
+
+    def __init__(self, db: Session, run_id: int):
+        self.db = db
+        self.run_id = run_id
+        self.transitions = {}  # step_id -> status (last transition wins)
+
+    def transition(self, step_id: str, status: str):
+        self.transitions.pop(step_id, None)
+        self.transitions[step_id] = status
+
+    def flush(self):
+        """Write pending transitions; returns them as (step_id, status) pairs."""
+        flushed = list(self.transitions.items())
+        by_status = {}
+        for step_id, status in flushed:
+            by_status.setdefault(status, []).append(step_id)
+        now = datetime.utcnow()
+        for status, step_ids in by_status.items():
+            if status == "running":
+                claimed = set(claim_steps(self.db, self.run_id, step_ids, now=now))
+                flushed = [(sid, st) for sid, st in flushed if st != "running" or sid in claimed]
+            else:
+                bulk_update_steps(self.db, self.run_id, step_ids, status, now=now)
+        self.transitions.clear()
+        return flushed
+
+    def commit(self):
+        flushed = self.flush()
+        self.db.commit()
+        return flushed
+
+
+# ----------------------
+# Run / step API
+# ----------------------
 def create_run(db: Session, workflow_id: int, version: str, status: str = "running", tenant: str | None = None,
                caller: str | None = None, inputs_json: str | None = None) -> Run:
     run = Run(
@@ -19,57 +128,59 @@ def create_run(db: Session, workflow_id: int, version: str, status: str = "runni
     )
     db.add(run)
     db.commit()
-    db.refresh(run)
     return run
 
 def create_run_steps(db: Session, run_id: int, steps: list[dict]) -> list[RunStep]:
-    created = []
-    for s in steps:
-        rs = RunStep(
-            run_id=run_id,
-            step_id=s["id"],
-            type=s.get("type"),
-            status="pending",
-            attempt=0,
-            input_json=s.get("input_json"),
-        )
-        db.add(rs)
-        created.append(rs)
+    created = bulk_create_steps(db, run_id, steps)
     db.commit()
-    for r in created:
-        db.refresh(r)
     return created
 
 def update_step_start(db: Session, run_id: int, step_id: str):
-    step = db.query(RunStep).filter_by(run_id=run_id, step_id=step_id).first()
-    if step:
-        step.status = "running"
-        step.started_at = datetime.utcnow()
-        step.attempt += 1
-        db.commit()
-        db.refresh(step)
+    stmt = (
+        update(RunStep)
+        .where(RunStep.run_id == run_id, RunStep.step_id == step_id)
+        .values(status="running", started_at=datetime.utcnow(), attempt=func.coalesce(RunStep.attempt, 0) + 1)
+        .returning(RunStep)
+        .execution_options(synchronize_session=False)
+    )
+    step = db.scalars(stmt).first()
+    db.commit()
     return step
 
 def update_step_finish(db: Session, run_id: int, step_id: str, success: bool, output_json: str | None, error_json: str | None):
-    step = db.query(RunStep).filter_by(run_id=run_id, step_id=step_id).first()
+    stmt = (
+        update(RunStep)
+        .where(RunStep.run_id == run_id, RunStep.step_id == step_id)
+        .values(
+            status="success" if success else "failed",
+            output_json=output_json,
+            error_json=error_json,
+            ended_at=datetime.utcnow(),
+        )
+        .returning(RunStep)
+        .execution_options(synchronize_session=False)
+    )
+    step = db.scalars(stmt).first()
     if step:
-        step.status = "success" if success else "failed"
-        step.output_json = output_json
-        step.error_json = error_json
-        step.ended_at = datetime.utcnow()
-        db.commit()
-        db.refresh(step)
-        # Update run overall status
-        run = db.query(Run).get(run_id)
-        if run:
-            failed_steps = db.query(RunStep).filter_by(run_id=run_id, status="failed").count()
-            pending_steps = db.query(RunStep).filter(RunStep.run_id == run_id, RunStep.status.in_(["pending", "running"])).count()
-            if failed_steps:
-                run.status = "failed"
-            elif pending_steps == 0:
-                run.status = "succeeded"
-            db.commit()
-            db.refresh(run)
+        # Update run overall status from a single grouped count
+        counts = dict(
+            db.query(RunStep.status, func.count())
+            .filter(RunStep.run_id == run_id)
+            .group_by(RunStep.status)
+            .all()
+        )
+        if counts.get("failed"):
+            run_status = "failed"
+        elif counts.get("pending", 0) + counts.get("running", 0) == 0:
+            run_status = "succeeded"
+        else:
+            run_status = None
+        if run_status:
+            db.execute(
+                update(Run).where(Run.id == run_id).values(status=run_status)
+                .execution_options(synchronize_session=False)
+            )
+    db.commit()
     return step
 
 def mark_run_canceled(db: Session, run_id: int):
@@ -77,8 +188,9 @@ def mark_run_canceled(db: Session, run_id: int):
     if not run:
         return None
     run.status = "canceled"
-    db.commit()
-    db.query(RunStep).filter(RunStep.run_id == run_id, RunStep.status.in_(["pending", "running"])).update({"status": "skipped"})
+    db.query(RunStep).filter(RunStep.run_id == run_id, RunStep.status.in_(["pending", "running"])).update(
+        {"status": "skipped"}, synchronize_session=False
+    )
     db.commit()
     return run
 
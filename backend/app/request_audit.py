@@ -0,0 +1,130 @@
+# backend/app/request_audit.py
+import atexit
+import logging
+import random
+from collections import deque
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from backend.app.buffered_worker import EXIT_FLUSH_TIMEOUT, BufferedWorker
+from backend.app.config.settings import settings
+from backend.app.database import db
+from backend.app.metrics import REQUEST_LOG_COUNTER
+from backend.app.models import RequestLog
+
+logger = logging.getLogger(__name__)
+
+
+def parse_sample_rules(spec):
+    """"/images/=0.1,/product=0.5" -> [("/images/", 0.1), ("/product", 0.5)], longest prefix first."""
+    rules = []
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        prefix, _, rate = item.partition("=")
+        rules.append((prefix.strip(), min(max(float(rate), 0.0), 1.0)))
+    return sorted(rules, key=lambda rule: len(rule[0]), reverse=True)
+
+
+class RequestAudit(BufferedWorker):
+    """
+    Asynchronous RequestLog writer.
+
+    record() decides whether a request is logged and only appends the row to
+    an in-memory buffer of `capacity` rows (the oldest rows are dropped when
+    it is full), so requests never wait on a database write. A daemon thread
+    bulk-inserts the buffer in one transaction every `flush_interval`
+    seconds, or as soon as `batch_size` rows are pending.
+
+    Paths starting with an `exclude` prefix are never logged. Other paths are
+    kept with the rate of their longest matching `rules` prefix, else
+    `sample_rate`. Rows that are dropped (overflow or a failed insert),
+    sampled out or flushed are counted in `stats` and on /metrics.
+    """
+
+    def __init__(self, capacity=10000, batch_size=500, flush_interval=1.0, sample_rate=1.0,
+                 rules=(), exclude=()):
+        super().__init__(batch_size, flush_interval, "request-audit")
+        self.sample_rate = sample_rate
+        self.rules = sorted(rules, key=lambda rule: len(rule[0]), reverse=True)
+        self.exclude = tuple(exclude)
+
+        self._app = None
+        self._buffer = deque(maxlen=capacity)
+        self.stats = {"flushed": 0, "dropped": 0, "sampled_out": 0, "errors": 0}
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            capacity=settings.REQUEST_LOG_CAPACITY,
+            batch_size=settings.REQUEST_LOG_BATCH_SIZE,
+            flush_interval=settings.REQUEST_LOG_FLUSH_INTERVAL,
+            sample_rate=settings.REQUEST_LOG_SAMPLE_RATE,
+            rules=parse_sample_rules(settings.REQUEST_LOG_SAMPLE_RULES),
+            exclude=settings.REQUEST_LOG_EXCLUDE,
+        )
+
+    def init_app(self, app):
+        """Write to `app`'s database from now on (rows queued for a previous app are written first)."""
+        if self._app is not None and self._app is not app:
+            self.flush()
+        self._app = app
+        if app.static_url_path and not any(p == app.static_url_path + "/" for p in self.exclude):
+            self.exclude += (app.static_url_path + "/",)
+
+    # ---------------- producer side ----------------
+    def wants(self, path):
+        """Whether a request for `path` should be logged; counts the ones sampled out."""
+        if path.startswith(self.exclude):
+            return False
+        rate = next((r for prefix, r in self.rules if path.startswith(prefix)), self.sample_rate)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self._count("sampled_out")
+        return False
+
+    def record(self, endpoint, user_id=None):
+        """Queue one RequestLog row, timestamped now."""
+        row = {"user_id": user_id, "endpoint": endpoint[:255], "timestamp": datetime.utcnow()}
+        with self._cond:
+            if len(self._buffer) == self._buffer.maxlen:
+                self._count("dropped")
+            self._buffer.append(row)
+            self._added()
+        self._ensure_thread()
+
+    # ---------------- flushing ----------------
+    def _pending(self):
+        return len(self._buffer)
+
+    def _take(self):
+        rows = list(self._buffer)
+        self._buffer.clear()
+        return rows
+
+    def _write(self, rows):
+        if self._app is None:
+            logger.error("Request audit has no app; dropping %d rows", len(rows))
+            self._count("dropped", len(rows))
+            return
+        with self._app.app_context():
+            try:
+                # Core insert: one executemany, NULL user ids included (ORM bulk mode splits on them)
+                db.session.execute(insert(RequestLog.__table__), rows)
+                db.session.commit()
+                self._count("flushed", len(rows))
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                logger.error("Request audit insert of %d rows failed: %s", len(rows), e)
+                self.stats["errors"] += 1
+                self._count("dropped", len(rows))
+            finally:
+                db.session.remove()
+
+    def _count(self, result, n=1):
+        self.stats[result] += n
+        REQUEST_LOG_COUNTER.labels(result=result).inc(n)
+
+
+request_audit = RequestAudit.from_settings()
+atexit.register(request_audit.close, EXIT_FLUSH_TIMEOUT)
@@ -1,10 +1,12 @@
 # app/routes/admin_routes.py
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, current_app, url_for
 from flask_jwt_extended import jwt_required
 from ..models import User, Role, Permission
 from ..database import db
 from ..routes.auth_routes import role_required
+from ..utils.pagination import id_page, page_limit
+from ..utils.queries import roles_with_permissions, user_summaries
 from sqlalchemy.exc import IntegrityError
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -17,7 +19,7 @@ admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 @role_required('admin')
 def get_all_users():
     """
-    List all users (admin only)
+    List users (admin only), one page per request, ordered by id
     ---
     tags:
       - "Admin - Users"
@@ -25,9 +27,14 @@ def get_all_users():
       - BearerAuth: []
     x-roles:
       - admin
+    parameters:
+      - { name: limit, in: query, type: integer, description: "page size (default 50)" }
+      - { name: cursor, in: query, type: string, description: "X-Next-Cursor of the previous page" }
+      - { name: role, in: query, type: string }
+      - { name: status, in: query, type: string }
     responses:
       200:
-        description: Array of users
+        description: Array of users; X-Next-Cursor and a rel="next" Link header point to the next page
         schema:
           type: array
           items:
@@ -43,18 +50,36 @@ def get_all_users():
       403:
         description: Forbidden (requires admin)
     """
-    users = User.query.all()
+    try:
+        limit = page_limit(request.args.get('limit'), 50, current_app.config.get("LIST_PAGE_MAX_SIZE", 100))
+    except ValueError:
+        return jsonify({"msg": "Invalid limit"}), 400
+
+    query = user_summaries()
+    if request.args.get('role'):
+        query = query.filter(Role.role_name == request.args['role'])
+    if request.args.get('status'):
+        query = query.filter(User.status == request.args['status'])
+    try:
+        users, next_cursor = id_page(query, User.id, request.args.get('cursor'), limit)
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
     result = [
         {
             "id": user.id,
             "name": user.name,
             "email": user.email,
-            "role": user.role.role_name if user.role else None,
+            "role": user.role,
             "status": user.status
         }
         for user in users
     ]
-    return jsonify(result), 200
+    resp = jsonify(result)
+    if next_cursor:
+        resp.headers['X-Next-Cursor'] = next_cursor
+        resp.headers['Link'] = f'<{url_for("admin.get_all_users", **dict(request.args, cursor=next_cursor))}>; rel="next"'
+    return resp, 200
 
 
 @admin_bp.route('/users', methods=['POST'])
@@ -236,7 +261,7 @@ def list_roles():
       200:
         description: List of roles
     """
-    roles = Role.query.all()
+    roles = roles_with_permissions().all()
     result = []
     for role in roles:
         permissions = [
@@ -393,10 +418,12 @@ def delete_role(role_id):
       404:
         description: Role not found
     """
-    role = Role.query.get(role_id)
-    if not role:
+    if not db.session.query(Role.id).filter_by(id=role_id).first():
         return jsonify({"msg": "Role not found"}), 404
 
-    db.session.delete(role)
+    # set-based, instead of loading every member User and Permission to unlink them one by one
+    User.query.filter_by(role_id=role_id).update({User.role_id: None}, synchronize_session=False)
+    Permission.query.filter_by(role_id=role_id).delete(synchronize_session=False)
+    Role.query.filter_by(id=role_id).delete(synchronize_session=False)
     db.session.commit()
     return jsonify({"msg": "Role deleted successfully"}), 200
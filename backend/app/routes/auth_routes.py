@@ -9,13 +9,14 @@ import os
 import base64
 from functools import wraps
 from datetime import datetime, timedelta
-from ..models import User, Product, Design
+from ..models import User
 from ..database import get_db_session, db
 from flask_jwt_extended import (
     jwt_required, get_jwt_identity, get_jwt, verify_jwt_in_request
 )
 from ..models import Role
 from ..models import TokenBlocklist
+from ..utils.queries import content_counts, role_name_of, user_with_role
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
@@ -32,11 +33,8 @@ def role_required(*allowed_roles):
             token_role = claims.get("role")
             if token_role and token_role in allowed_roles:
                 return fn(*args, **kwargs)
-            # fallback: check DB for up-to-date role
-            user_id = get_jwt_identity()
-            user = User.query.get(int(user_id))
-
-            if user and user.role and user.role.role_name in allowed_roles:
+            # fallback: check DB for up-to-date role (one joined lookup of the role name)
+            if role_name_of(get_jwt_identity()) in allowed_roles:
                 return fn(*args, **kwargs)
             return jsonify({"msg": "Forbidden - missing role"}), 403
         return wrapper
@@ -190,7 +188,7 @@ def login():
         email = data.get('email')
         password = data.get('password')
 
-        user = User.query.filter_by(email=email).first()
+        user = user_with_role(email=email)
 
         if not user or not user.verify_password(password):
             return jsonify({"msg": "Bad email or password"}), 401
@@ -251,7 +249,7 @@ def get_profile():
         description: User not found
     """    
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = user_with_role(with_image=True, id=int(user_id))
 
     if not user:
         return jsonify({"msg": "User not found"}), 404
@@ -264,8 +262,7 @@ def get_profile():
         profile_image_url = "/static/images/default-profile.png"
 
     # Count designs and products
-    design_count = Design.query.filter_by(user_id=user.id).count()
-    product_count = Product.query.filter_by(user_id=user.id).count()
+    design_count, product_count = content_counts(user.id)
 
     return jsonify({
         "name": user.name,
@@ -330,8 +327,7 @@ def update_profile():
 
     if name:
         user.name = name
-    if role:
-        role_obj = Role.query.filter_by(role_name=role).first()
+    role_obj = Role.query.filter_by(role_name=role).first() if role else None
     if role_obj:
         user.role = role_obj
     if bio is not None:
@@ -381,7 +377,7 @@ def refresh():
         description: Unauthorized / invalid refresh token
     """    
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = user_with_role(id=int(user_id))
     if not user:
         return jsonify({"msg": "User not found"}), 404
     role_name = user.role.role_name if user.role else "user"
@@ -1,13 +1,21 @@
-from flask import Blueprint, request, jsonify, Response
+from flask import Blueprint, request, jsonify, Response, send_file, url_for, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import base64
 
 from ..models.design import Design
 from ..models.user import User
 from ..database import db
+from ..services.image_store import image_store, image_urls
+from ..utils.http_cache import not_modified, strong_etag, with_validators
+from ..utils.pagination import keyset_page, page_limit
 
 design_bp = Blueprint('design_bp', __name__)
 
+
+def _design_image_urls(design):
+    # 'image_data_url' keeps its name for existing clients but now holds a URL, not inline data
+    return image_urls(design.image_key, url_for('design_bp.get_design_image', design_id=design.id))
+
+
 @design_bp.route('/upload', methods=['POST'])
 @jwt_required()
 def upload_design():
@@ -35,12 +43,14 @@ def upload_design():
         return jsonify({'message': 'Invalid file extension'}), 400
 
     image_data = image_file.read()
+    if not image_data:
+        return jsonify({'message': 'Empty image file'}), 400
 
     design = Design(
         title=title,
         description=description,
         category=category,
-        image_url=image_data,  
+        image_key=image_store.put(image_data),
         image_mime=image_file.mimetype,
         user_id=user.id
     )
@@ -57,6 +67,7 @@ def upload_design():
 @design_bp.route('/my-designs', methods=['GET'])
 @jwt_required()
 def get_my_designs():
+    """The caller's designs, paged like the public gallery below."""
     user_id = get_jwt_identity()
     user = User.query.get(user_id)
 
@@ -64,53 +75,81 @@ def get_my_designs():
         return jsonify({'message': 'User not found'}), 404
 
     category = request.args.get('category')
+    try:
+        limit = page_limit(request.args.get('limit'), 24, current_app.config.get('LIST_PAGE_MAX_SIZE', 100))
+    except ValueError:
+        return jsonify({'message': 'Invalid limit'}), 400
+
     query = Design.query.filter_by(user_id=user_id)
     if category and category != 'All':
         query = query.filter_by(category=category)
 
-    designs = query.all()
+    try:
+        designs, next_cursor = keyset_page(query, Design.timestamp, Design.id, request.args.get('cursor'), limit)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
 
     designs_data = []
     for d in designs:
-        encoded_image = base64.b64encode(d.image_url).decode('utf-8')
-        image_data_url = f"data:{d.image_mime};base64,{encoded_image}"
-
+        urls = _design_image_urls(d)
         designs_data.append({
             'id': d.id,
             'title': d.title,
             'description': d.description,
             'category': d.category,
-            'image_data_url': image_data_url
+            'image_data_url': urls['preview'],
+            'image': urls
         })
 
-    return jsonify(designs_data)
+    resp = jsonify(designs_data)
+    if next_cursor:
+        args = dict(request.args, cursor=next_cursor, limit=limit)
+        resp.headers['X-Next-Cursor'] = next_cursor
+        resp.headers['Link'] = f'<{url_for("design_bp.get_my_designs", **args)}>; rel="next"'
+    return resp
 
 
 @design_bp.route('/designs', methods=['GET'])
 def get_all_designs():
+    """
+    Public gallery, newest first, one page per request (?limit=, default 24).
+    The body stays a list; the next page's cursor is in the X-Next-Cursor
+    header and a rel="next" Link, and is passed back as ?cursor=.
+    """
     category = request.args.get('category')
+    try:
+        limit = page_limit(request.args.get('limit'), 24, current_app.config.get('LIST_PAGE_MAX_SIZE', 100))
+    except ValueError:
+        return jsonify({'message': 'Invalid limit'}), 400
 
     query = Design.query
     if category and category != 'All':
         query = query.filter_by(category=category)
 
-    designs = query.all()
+    try:
+        designs, next_cursor = keyset_page(query, Design.timestamp, Design.id, request.args.get('cursor'), limit)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
 
     designs_data = []
     for d in designs:
-        encoded_image = base64.b64encode(d.image_url).decode('utf-8')
-        image_data_url = f"data:{d.image_mime};base64,{encoded_image}"
-
+        urls = _design_image_urls(d)
         designs_data.append({
             'id': d.id,
             'title': d.title,
             'description': d.description,
             'category': d.category,
-            'image_data_url': image_data_url,
+            'image_data_url': urls['preview'],
+            'image': urls,
             'user_id': d.user_id
         })
 
-    return jsonify(designs_data)
+    resp = jsonify(designs_data)
+    if next_cursor:
+        args = dict(request.args, cursor=next_cursor, limit=limit)
+        resp.headers['X-Next-Cursor'] = next_cursor
+        resp.headers['Link'] = f'<{url_for("design_bp.get_all_designs", **args)}>; rel="next"'
+    return resp
 
 
 @design_bp.route('/design-image/<int:design_id>', methods=['GET'])
@@ -118,11 +157,27 @@ def get_design_image(design_id):
     """
     Serve raw binary image for <img src="/api/design-image/1"> usage.
     """
-    design = Design.query.get(design_id)
-    if not design:
+    row = (
+        db.session.query(Design.image_key, Design.image_mime, Design.timestamp)
+        .filter(Design.id == design_id).first()
+    )
+    if not row:
         return jsonify({'message': 'Design not found'}), 404
+    image_key, image_mime, timestamp = row
+    # stored images: the content hash; rows not yet moved: a design's image is never replaced
+    tag = strong_etag('design-image', design_id, image_key or timestamp)
+    cached = not_modified(tag, 'IMAGE_CACHE_CONTROL')
+    if cached:
+        return cached
+
+    if image_key:
+        # streamed from disk in blocks; also answers Range requests
+        resp = send_file(image_store.path(image_key), mimetype=image_mime, conditional=True, etag=False)
+    else:
+        data = db.session.query(Design.image_url).filter(Design.id == design_id).scalar()
+        resp = Response(data, mimetype=image_mime)
+    return with_validators(resp, tag, 'IMAGE_CACHE_CONTROL')
 
-    return Response(design.image_url, mimetype=design.image_mime)
 
 @design_bp.route('/designs/<int:design_id>', methods=['PUT'])
 @jwt_required()
@@ -0,0 +1,37 @@
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from ..utils.esg_module import process_product_esg, process_products_esg
+
+esg_bp = Blueprint('esg', __name__)
+
+
+@esg_bp.route('/api/esg-score', methods=['POST'])
+@jwt_required()
+def esg_score():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    try:
+        return jsonify(process_product_esg(data))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid ESG input: {e}"}), 400
+
+
+@esg_bp.route('/api/esg-score/batch', methods=['POST'])
+@jwt_required()
+def esg_score_batch():
+    """Score {"products": [{water_use, carbon_emission, ethical_rating, material}, ...]} in one model call."""
+    data = request.get_json(silent=True) or {}
+    products = data.get('products') if isinstance(data, dict) else None
+    if not isinstance(products, list) or not all(isinstance(p, dict) for p in products):
+        return jsonify({"error": "Expected {\"products\": [...]} with one object per product"}), 400
+
+    max_size = current_app.config.get("ESG_BATCH_MAX_SIZE", 10000)
+    if len(products) > max_size:
+        return jsonify({"error": f"At most {max_size} products per batch"}), 413
+
+    try:
+        results = process_products_esg(products)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid ESG input: {e}"}), 400
+    return jsonify({"results": results})
@@ -1,5 +1,5 @@
 # routes/flow.py
-from flask import Blueprint, json, request, jsonify, current_app
+from flask import Blueprint, json, request, jsonify, current_app, url_for
 from backend.app.models import Run, RunStep, Compensation
 from ..database import db
 from ..services import planner, executor, signals
@@ -31,30 +31,36 @@ def plan_flow():
 @flow_bp.route("/run/start", methods=["POST"])
 def start_run():
     """
-    Helper endpoint: create Run and start executing synchronously.
+    Helper endpoint: create Run and start executing it.
     Expects:
       {
         "workflow_id": "<required>",
         "dsl": "<dsl>",
         "created_by": "<optional user id/email>",
-        "version": "<optional version>"
+        "version": "<optional version>",
+        "async": <optional bool, defaults to FLOW_ASYNC_START>
       }
-    Returns Run id and status.
+    Sync mode runs the workflow in the request and returns 200 with the final status.
+    Async mode persists the Run, enqueues it on Celery and returns 202 with the run id;
+    progress is streamed on /stream/<run_id>.
     """
     payload = request.get_json(force=True, silent=True) or {}
     dsl = payload.get("dsl")
     created_by = payload.get("created_by")
     workflow_id = payload.get("workflow_id")
     version = payload.get("version", "1.0")
+    run_async = _parse_bool(payload.get("async"), current_app.config.get("FLOW_ASYNC_START", False))
 
     # --- Validation ---
+    if run_async is None:
+        return jsonify({"error": "'async' must be a boolean"}), 400
     if not workflow_id:
         return jsonify({"error": "missing 'workflow_id' in body"}), 400
     if dsl is None:
         return jsonify({"error": "missing 'dsl' in body"}), 400
 
     try:
-        dag = planner.parse_dsl(dsl)
+        dag = planner.parse_dsl(dsl, version)
     except Exception as e:
         current_app.logger.exception("planner.parse_dsl failed")
         return jsonify({"error": "failed to parse DSL", "detail": str(e)}), 400
@@ -69,6 +75,9 @@ def start_run():
             created_by=created_by
         )
 
+        if run_async:
+            return _enqueue_run(run)
+
         run_workflow(run.id)
 
         return jsonify({"run_id": run.id, "status": run.status}), 200
@@ -80,6 +89,43 @@ def start_run():
             "detail": str(e)
         }), 500
 
+_TRUE = ("true", "1", "yes")
+_FALSE = ("false", "0", "no")
+
+
+def _parse_bool(value, default):
+    """JSON booleans, 0/1 and "true"/"false" strings; None for anything else."""
+    if value is None:
+        return bool(default)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in _TRUE + _FALSE:
+        return value.strip().lower() in _TRUE
+    return None
+
+
+def _enqueue_run(run):
+    from backend.app.tasks.orchestration import run_workflow_task
+
+    try:
+        run_workflow_task.apply_async(args=[run.id])
+    except Exception as e:
+        current_app.logger.exception("failed to enqueue run %s", run.id)
+        run.status = "failed"
+        db.session.commit()
+        return jsonify({"run_id": run.id, "error": "failed to enqueue run", "detail": str(e)}), 503
+
+    resp = jsonify({
+        "run_id": run.id,
+        "status": "pending",
+        "stream_url": url_for("sse.stream", run_id=run.id),
+        "status_url": url_for("flow.get_run", run_id=run.id),
+    })
+    resp.headers["Location"] = url_for("flow.get_run", run_id=run.id)
+    return resp, 202
+
 @flow_bp.route("/run/<int:run_id>/cancel", methods=["POST"])
 def cancel_run(run_id):
     run = Run.query.get(run_id)
@@ -94,6 +140,7 @@ def cancel_run(run_id):
         RunStep.run_id == run.id,
         RunStep.status.in_(["pending", "running", "waiting_for_signal"])
     ).update({"status": "cancelled"}, synchronize_session="fetch")
+    signals.clear_waits(run.id)
     db.session.commit()
 
     return jsonify({"run_id": run.id, "status": run.status}), 200
@@ -121,7 +168,7 @@ def signal_run(name):
     try:
         handled = signals.handle_signal(run_id=run.id, signal_name=name, payload=signal_payload)
         if handled:
-            return jsonify({"run_id": run.id, "signal": name, "handled": True}), 200
+            return jsonify({"run_id": run.id, "signal": name, "handled": True, "status": run.status}), 200
         else:
             return jsonify({"run_id": run.id, "signal": name, "handled": False, "detail": "no waiting step for signal"}), 200
     except Exception as e:
@@ -0,0 +1,24 @@
+from flask import Blueprint, request, jsonify, send_file, current_app
+from ..services.image_store import image_store
+
+images_bp = Blueprint('images', __name__)
+
+
+@images_bp.route('/images/<key>', methods=['GET'])
+def get_image(key):
+    """
+    Serve a stored image, or its thumbnail with ?size=<px> (one of
+    IMAGE_THUMBNAIL_SIZES). Keys are content hashes, so responses are
+    immutable and cached by browsers and CDNs for IMAGE_CACHE_MAX_AGE.
+    """
+    size = request.args.get('size', type=int)
+    found = image_store.open_path(key, size)
+    if found is None:
+        return jsonify({'message': 'Image not found'}), 404
+
+    path, mimetype = found
+    resp = send_file(path, mimetype=mimetype, conditional=True, etag=f"{key}-{size or 'orig'}",
+                     max_age=current_app.config.get('IMAGE_CACHE_MAX_AGE', 31536000))
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    return resp
@@ -1,5 +1,6 @@
 from flask import Flask, jsonify, request
 from datetime import datetime
+from backend.app.event_log import event_log as get_event_log
 import csv
 import os
 import random
@@ -9,8 +10,8 @@ import numpy as np
 app = Flask(__name__)
 
 log_file = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'logs', 'infinitybrain_logs.csv'))
-if not os.path.exists(os.path.dirname(log_file)):
-    os.makedirs(os.path.dirname(log_file))
+LOG_FIELDS = ["user_id", "timestamp", "api_call", "response_type", "response_value", "confidence", "request_data"]
+event_log = get_event_log(log_file, LOG_FIELDS)
 
 # Loading existing logs or initializing empty list with a proper structure
 try:
@@ -90,12 +91,7 @@ def predict():
         # Appending a new log entry
         logs.append(log_entry)
 
-        fieldnames = ["user_id", "timestamp", "api_call", "response_type", "response_value", "confidence", "request_data"]
-        with open(log_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            if os.stat(log_file).st_size == 0:
-                writer.writeheader()
-            writer.writerow(log_entry)
+        event_log.write(log_entry)
 
         return jsonify(prediction)
     except Exception as e:
@@ -109,9 +105,7 @@ def predict():
             "request_data": str(data)
         }
         logs.append(error_entry)
-        with open(log_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writerow(error_entry)
+        event_log.write(error_entry)
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/personamesh/recommend', methods=['POST'])
@@ -133,12 +127,7 @@ def recommend():
         }
         logs.append(log_entry)
 
-        fieldnames = ["user_id", "timestamp", "api_call", "response_type", "response_value", "confidence", "request_data"]
-        with open(log_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            if os.stat(log_file).st_size == 0:
-                writer.writeheader()
-            writer.writerow(log_entry)
+        event_log.write(log_entry)
 
         return jsonify(recommendation)
     except Exception as e:
@@ -153,9 +142,7 @@ def recommend():
         }
         logs.append(error_entry)
         
-        with open(log_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writerow(error_entry)
+        event_log.write(error_entry)
         return jsonify({"error": str(e)}), 500
 
 # Placeholder health check endpoint    
@@ -201,12 +188,7 @@ def ecosense():
 
         logs.append(log_entry)
 
-        fieldnames = ["user_id", "timestamp", "api_call", "response_type", "response_value", "confidence", "request_data"]
-        with open(log_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            if os.stat(log_file).st_size == 0:
-                writer.writeheader()
-            writer.writerow(log_entry)
+        event_log.write(log_entry)
 
         return jsonify(response)
     except Exception as e:
@@ -221,9 +203,7 @@ def ecosense():
         }
         logs.append(error_entry)
         
-        with open(log_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writerow(error_entry)
+        event_log.write(error_entry)
         return jsonify({"error": str(e)}), 500
 
 if __name__ == '__main__':
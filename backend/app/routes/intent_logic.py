@@ -3,12 +3,13 @@ import random
 import os
 import csv
 from datetime import datetime
+from backend.app.event_log import event_log as get_event_log
 
 app = Flask(__name__)
 
 log_file = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'logs', 'infinitybrain_logs.csv'))
-if not os.path.exists(os.path.dirname(log_file)):
-    os.makedirs(os.path.dirname(log_file))
+LOG_FIELDS = ["user_id", "timestamp", "api_call", "response_type", "response_value", "confidence", "request_data"]
+event_log = get_event_log(log_file, LOG_FIELDS)
 
 # Loading existing logs or initializing empty list with a proper structure
 try:
@@ -49,12 +50,7 @@ def intentlogic():
 
         logs.append(log_entry)
 
-        fieldnames = ["user_id", "timestamp", "api_call", "response_type", "response_value", "confidence", "request_data"]
-        with open(log_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            if os.stat(log_file).st_size == 0:
-                writer.writeheader()
-            writer.writerow(log_entry)
+        event_log.write(log_entry)
 
         return jsonify(result)
     except Exception as e:
@@ -70,9 +66,7 @@ def intentlogic():
 
         logs.append(error_entry)
         
-        with open(log_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writerow(error_entry)
+        event_log.write(error_entry)
         return jsonify({"error": str(e)}), 500
 
 if __name__ == '__main__':
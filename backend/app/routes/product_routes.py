@@ -1,14 +1,20 @@
-import base64
-from flask import Blueprint, request, jsonify
-from ..models import Product, ProductImage
+import os
+from flask import Blueprint, request, jsonify, current_app, url_for, Response, send_file
+from ..models import Product, ProductImage, ProductImport
 from ..database import db
+from ..services.catalog_index import catalog_index
+from ..services.image_store import image_store, image_urls, sniff_content_type
+from ..services.product_import import resolve_under, start_import
+from ..services.query_cache import query_cache
+from ..utils.esg_module import compute_esg_score
+from ..utils.http_cache import not_modified, strong_etag, with_validators
+from ..utils.pagination import keyset_page, page_limit
+from sqlalchemy.orm import selectinload
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 
 product_bp = Blueprint('product', __name__, url_prefix='/product')
 
-import requests
-
 @product_bp.route('', methods=['POST'])
 @jwt_required()
 def add_product():
@@ -44,7 +50,8 @@ def add_product():
         if not image_data:
             return jsonify({"error": f"Empty image file: {img.filename}"}), 400
         image_records.append(ProductImage(
-            image_data=image_data
+            image_key=image_store.put(image_data),
+            image_mime=sniff_content_type(image_data, img.mimetype or "application/octet-stream")
         ))
 
     current_user_id = get_jwt_identity()
@@ -57,15 +64,11 @@ def add_product():
         "material": material or ""
     }
 
+    # scored in-process (same model as /api/esg-score), no HTTP round trip to ourselves
     try:
-        esg_response = requests.post("http://127.0.0.1:5000/api/esg-score", json=esg_data)
-        if esg_response.status_code == 200:
-            esg_result = esg_response.json()
-            esg_score = esg_result.get("score", 0.0)
-        else:
-            esg_score = 0.0  
-    except Exception as e:
-        print("ESG API Error:", e)
+        esg_score = compute_esg_score(esg_data)
+    except Exception:
+        current_app.logger.exception("ESG scoring failed for new product %r", title)
         esg_score = 0.0
 
     new_product = Product(
@@ -89,6 +92,8 @@ def add_product():
 
     db.session.add(new_product)
     db.session.commit()
+    catalog_index.product_changed(new_product.id)
+    query_cache.bump_product_version()
 
     return jsonify({
         "msg": "Product uploaded successfully",
@@ -137,6 +142,8 @@ def update_product(product_id):
         product.views = data['views']
 
     db.session.commit()
+    catalog_index.product_changed(product.id)
+    query_cache.bump_product_version()
 
     return jsonify({"msg": "Product updated successfully", "product": product.to_dict()}), 200
 
@@ -150,33 +157,112 @@ def delete_product(product_id):
 
     db.session.delete(product)
     db.session.commit()
+    catalog_index.product_changed(product_id)
+    query_cache.bump_product_version()
 
     return jsonify({"msg": f"Product with id {product_id} deleted successfully"}), 200
 
 
+@product_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_products():
+    """
+    Start (or resume) a bulk import of a server-side manifest:
+      {"manifest": "<file under PRODUCT_IMPORT_DIR>", "image_dir": "<dir under PRODUCT_IMPORT_DIR>"}
+    The import runs on Celery; poll GET /product/import/<id> for progress.
+    """
+    data = request.get_json(silent=True) or {}
+    root = current_app.config.get("PRODUCT_IMPORT_DIR", "data/imports")
+    try:
+        manifest = resolve_under(root, str(data.get('manifest') or ''))
+        image_dir = resolve_under(root, str(data.get('image_dir') or ''))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not os.path.isfile(manifest) or not os.path.isdir(image_dir):
+        return jsonify({"error": "manifest file and image_dir directory must exist"}), 400
+
+    # resumes the user's unfinished job on the same manifest; a duplicate runner is harmless
+    job = start_import(manifest, image_dir, int(get_jwt_identity()))
+    from ..tasks.product_import import import_products_task
+
+    try:
+        import_products_task.apply_async(args=[job.id])
+    except Exception as e:
+        current_app.logger.exception("failed to enqueue product import %s", job.id)
+        job.status, job.error = "failed", f"failed to enqueue: {e}"
+        db.session.commit()
+        return jsonify({"error": "failed to enqueue import", "detail": str(e)}), 503
+
+    resp = jsonify({"import": job.to_dict(), "status_url": url_for("product.get_import", job_id=job.id)})
+    resp.headers["Location"] = url_for("product.get_import", job_id=job.id)
+    return resp, 202
+
+
+@product_bp.route('/import/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_import(job_id):
+    job = db.session.get(ProductImport, job_id)
+    if not job or job.user_id != int(get_jwt_identity()):
+        return jsonify({"error": "Import not found"}), 404
+    return jsonify(job.to_dict()), 200
+
+
 @product_bp.route('', methods=['GET'])
 def get_products():
+    """
+    Catalog page, newest first. Pass the response's next_cursor as ?cursor=
+    for the next page; each page costs O(limit) however deep it is. The
+    older ?offset= paging is still accepted but reads every skipped row.
+    """
+    cursor = request.args.get('cursor')
     try:
-        limit = int(request.args.get('limit', 10))
+        limit = page_limit(request.args.get('limit'), 10, current_app.config.get("LIST_PAGE_MAX_SIZE", 100))
         offset = int(request.args.get('offset', 0))
     except ValueError:
         return jsonify({"error": "Invalid limit or offset"}), 400
 
-    products_query = Product.query.limit(limit).offset(offset).all()
+    # validator from the page's (id, updated_at) pairs; full rows are only loaded on a miss
+    keys = db.session.query(Product.id, Product.created_at, Product.updated_at)
+    try:
+        page, next_cursor = keyset_page(keys, Product.created_at, Product.id, cursor, limit, offset)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    tag = strong_etag("catalog", cursor, limit, offset, next_cursor,
+                      *(f"{row.id}@{row.updated_at}" for row in page))
+    cached = not_modified(tag, "CATALOG_CACHE_CONTROL")
+    if cached:
+        return cached
+
+    ids = [row.id for row in page]
+    products_query = (
+        Product.query.filter(Product.id.in_(ids))
+        # image ids for to_dict() in one extra query, without the image bytes
+        .options(selectinload(Product.images).load_only(ProductImage.id, ProductImage.product_id))
+        .order_by(Product.created_at.desc(), Product.id.desc())
+        .all()
+    ) if ids else []
 
     products_list = [p.to_dict() for p in products_query]
 
-    return jsonify({
+    resp = jsonify({
         "products": products_list,
         "limit": limit,
-        "offset": offset
-    }), 200
+        "offset": offset,
+        "next_cursor": next_cursor
+    })
+    return with_validators(resp, tag, "CATALOG_CACHE_CONTROL"), 200
 
 @product_bp.route("/my-products", methods=["GET"])
 @jwt_required()
 def get_my_products():
     current_user_id = get_jwt_identity()
-    products = Product.query.filter_by(user_id=current_user_id).all()
+    products = (
+        Product.query.filter_by(user_id=current_user_id)
+        .options(selectinload(Product.images).load_only(
+            ProductImage.id, ProductImage.product_id, ProductImage.image_key))
+        .all()
+    )
+    image_lists = {p.id: [_product_image_urls(img) for img in p.images] for p in products}
     return jsonify([
         {
             "id": p.id,
@@ -185,10 +271,37 @@ def get_my_products():
             "sale_price": p.sale_price,
             "category": p.category,
             "brand": p.brand,
-            "images": [
-                "data:image/jpeg;base64," + base64.b64encode(img.image_data).decode('utf-8')
-                for img in p.images
-            ]
+            # gallery-sized URLs, not inline data; image_urls has the original and every thumbnail
+            "images": [urls["preview"] for urls in image_lists[p.id]],
+            "image_urls": image_lists[p.id]
         }
         for p in products
     ])
+
+
+def _product_image_urls(img):
+    return image_urls(img.image_key, url_for('product.get_product_image', image_id=img.id))
+
+
+@product_bp.route('/images/<int:image_id>', methods=['GET'])
+def get_product_image(image_id):
+    """Serve one product image by id (rows not yet moved to the image store included)."""
+    row = (
+        db.session.query(ProductImage.image_key, ProductImage.image_mime, ProductImage.created_at)
+        .filter(ProductImage.id == image_id).first()
+    )
+    if not row:
+        return jsonify({"error": "Image not found"}), 404
+    image_key, image_mime, created_at = row
+    # stored images: the content hash; rows not yet moved: images are never rewritten in place
+    tag = strong_etag("product-image", image_id, image_key or created_at)
+    cached = not_modified(tag, "IMAGE_CACHE_CONTROL")
+    if cached:
+        return cached
+
+    if image_key:
+        resp = send_file(image_store.path(image_key), mimetype=image_mime or "image/jpeg", conditional=True, etag=False)
+    else:
+        data = db.session.query(ProductImage.image_data).filter(ProductImage.id == image_id).scalar()
+        resp = Response(data, mimetype=image_mime or sniff_content_type(data, "image/jpeg"))
+    return with_validators(resp, tag, "IMAGE_CACHE_CONTROL")
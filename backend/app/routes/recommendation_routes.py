@@ -1,72 +1,47 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, current_app
 from flask_cors import CORS
-import pickle
-import csv
 import os
 from datetime import datetime
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-import random
 from flask_jwt_extended import jwt_required
-import joblib
-import pandas as pd
+from ..event_log import event_log
 from ..models import Product, ProductImage
-from ..utils.esg_utils import generate_esg_columns, compute_esg_score
-
-esg_model_path = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '..', '..', '..', 'models', 'esg_model.pkl')
-)
-esg_model = joblib.load(esg_model_path)
+from ..services.catalog_index import catalog_index
+from ..services.query_cache import query_cache
 
 recommendation_bp = Blueprint('recommendation', __name__)
 
-# Loading the saved model data
-MODEL_PATH = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), '..', '..', '..', 'models', 'new_recommender_model.pkl')
-)
-
-with open(MODEL_PATH, 'rb') as f:
-    model_data = pickle.load(f)
-    df = model_data['df']
-    combined_similarities = model_data['similarities']
-
-df['product_id'] = df['product_id'].astype(str).str.strip()
-
-df['combined_text'] = df['title'] + " " + df['descriptions']
-
-# Recompute TF-IDF only which is needed to process new user text input
-tfidf = TfidfVectorizer(stop_words='english')
-tfidf_matrix = tfidf.fit_transform(df['combined_text'])
-
 # Log file setup
 # Set up a relative path for the log file
 log_file = os.path.abspath(
     os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'logs', 'recommendation_log.csv')
 )
+recommendation_log = event_log(log_file, ['timestamp', 'product_id', 'title', 'action', 'input'])
 
-# Ensure the parent directory exists
-os.makedirs(os.path.dirname(log_file), exist_ok=True)
-
-if not os.path.exists(log_file):
-    with open(log_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['timestamp', 'product_id', 'title', 'action', 'input'])
-
-# Log function
+# Log function (buffered; written out in batches by the event log's flusher)
 def log_event(product_id, title, action, user_input):
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    with open(log_file, 'a', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow([timestamp, product_id, title, action, user_input])
+    recommendation_log.write([timestamp, product_id, title, action, user_input])
+
 
+# Below this best score the query matched nothing useful; show random picks instead
+FALLBACK_MIN_SCORE = 0.1
 
-# Add ESG columns and compute ESG scores
-df = generate_esg_columns(df)
-df = compute_esg_score(df, esg_model)
 
-# Preview results
-print(df.head())
+def _requested_k(data):
+    """Number of results requested via "k", clamped to RECOMMEND_MAX_K."""
+    default_k = current_app.config.get("RECOMMEND_DEFAULT_K", 3)
+    max_k = current_app.config.get("RECOMMEND_MAX_K", 50)
+    k = int(data.get('k', default_k))
+    if k < 1:
+        raise ValueError("k must be a positive integer")
+    return min(k, max_k)
+
+def _ranked(engine, user_input, k):
+    """Top-k rows for the query, or a fallback marker when nothing matches well enough."""
+    idx, scores = engine.recommend(user_input, k)
+    if not len(scores) or scores.max() < FALLBACK_MIN_SCORE:
+        return {"fallback": True, "results": []}
+    return {"fallback": False, "results": engine.rows(idx, scores)}
 
 # Recommend products
 @recommendation_bp.route('/api/recommend', methods=['POST'])
@@ -79,64 +54,29 @@ def recommend():
         if not user_input:
             return jsonify({"error": "No input provided"}), 400
 
-        # Convert user input to TF-IDF vector
-        user_vector = tfidf.transform([user_input])
-        text_scores = cosine_similarity(user_vector, tfidf_matrix).flatten()
-
-        category_scores = np.max(combined_similarities, axis=1)
-        color_scores = np.max(combined_similarities, axis=1)
-
-        # Combine weighted scores
-        weight_text = 0.6
-        weight_category = 0.2
-        weight_color = 0.2
-
-        combined_scores = (
-            weight_text * text_scores +
-            weight_category * category_scores +
-            weight_color * color_scores
-        )
-
-        # Get top 3
-        scores_with_indices = sorted(enumerate(combined_scores), key=lambda x: x[1], reverse=True)
-        top_3 = scores_with_indices[:3]
-
-        recommendations = []
-        for i, score in top_3:
-            product = {
-                'product_id': df.loc[i, 'product_id'],
-                'title': df.loc[i, 'title'],
-                'description': df.loc[i, 'descriptions'],
-                'category': df.loc[i, 'category'],
-                'color': df.loc[i, 'color'],
-                'image_url': df.loc[i, 'image_url'],
-                'score': float(score)
-            }
+        try:
+            k = _requested_k(data)
+        except (TypeError, ValueError):
+            return jsonify({"error": "k must be a positive integer"}), 400
+
+        engine = catalog_index.engine()
+        key = query_cache.key('recommend', user_input, k, engine.version)
+        ranked = query_cache.get_or_compute(key, lambda: _ranked(engine, user_input, k))
+
+        # fallback process (not cached: a fresh random pick every time)
+        if ranked['fallback']:
+            recommendations = engine.rows(engine.sample(k))
+        else:
+            recommendations = ranked['results']
+
+        for product in recommendations:
             log_event(product['product_id'], product['title'], 'shown', user_input)
-            recommendations.append(product)
-
-        # fallback process
-        if max(score for _, score in top_3) < 0.1:
-            recommendations = []
-            fallback_indices = random.sample(range(len(df)), 3)
-            for i in fallback_indices:
-                product = {
-                    'product_id': df.loc[i, 'product_id'],
-                    'title': df.loc[i, 'title'],
-                    'description': df.loc[i, 'descriptions'],
-                    'category': df.loc[i, 'category'],
-                    'color': df.loc[i, 'color'],
-                    'image_url': df.loc[i, 'image_url'],
-                    'score': 0.0
-                }
-                log_event(product['product_id'], product['title'], 'shown', user_input)
-                recommendations.append(product)
 
         return jsonify({"results": recommendations})
 
-    except Exception as e:
-        print("Error in /api/recommend:", e)
-        return jsonify({"error": str(e)}), 500
+    except Exception:
+        current_app.logger.exception("/api/recommend failed")
+        return jsonify({"error": "Internal server error"}), 500
 
 # Log event
 @recommendation_bp.route('/api/log-click', methods=['POST'])
@@ -156,6 +96,44 @@ def log_click():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def _ranked_products(engine, user_input, k):
+    """ESG-ranked products joined with their Product rows, plus the catalog rows shown."""
+    # Boosted (x1.1 at ESG >= 70, x1.2 at >= 85) and filtered (ESG >= 50) top k
+    idx, scores = engine.recommend_esg(user_input, k)
+
+    shown = [(row['product_id'], row['title']) for row in engine.rows(idx)]
+    product_ids = [pid for pid, _ in shown]
+
+    # Convert IDs to integers 
+    int_ids = [int(pid) for pid in product_ids]
+
+    products = Product.query.filter(Product.id.in_(int_ids)).all()
+
+    score_map = {pid: float(score) for pid, score in zip(int_ids, scores)}
+    # keep ranking order; ESG fields come from the catalog row of each product
+    products.sort(key=lambda p: -score_map[p.id])
+
+    results = []
+    for p in products:
+        esg_score, esg_badge = engine.esg_of(engine.row_of(p.id))
+        results.append({
+            "id": p.id,
+            "title": p.title,
+            "brand": p.brand,
+            "category": p.category,
+            "description": p.description,
+            "sale_price": p.sale_price,
+            "discount": p.discount,
+            "colors": p.colors.split(",") if p.colors else [],
+            "sizes": p.sizes.split(",") if p.sizes else [],
+            "tags": p.tags.split(",") if p.tags else [],
+            "publish_date": p.publish_date.isoformat() if p.publish_date else None,
+            "score": score_map.get(p.id, 0.0),
+            "esg_score": esg_score,
+            "esg_badge": esg_badge
+        })
+    return {"shown": shown, "results": results}
+
 @recommendation_bp.route('/api/recommend-full', methods=['POST'])
 @jwt_required()
 def recommend_full():
@@ -167,87 +145,24 @@ def recommend_full():
             return jsonify({"error": "No input provided"}), 400
 
          
-        user_vector = tfidf.transform([user_input])
-        text_scores = cosine_similarity(user_vector, tfidf_matrix).flatten()
-
-        category_scores = np.max(combined_similarities, axis=1)
-        color_scores = np.max(combined_similarities, axis=1)
-
-        weight_text = 0.6
-        weight_category = 0.2
-        weight_color = 0.2
-
-        combined_scores = (
-            weight_text * text_scores +
-            weight_category * category_scores +
-            weight_color * color_scores
-        )
-
-        # Boost ESG scores if score ≥ 70 by 10% and 20% if score >= 85
-        eco_boost_1 = 1.1
-        eco_boost_2 = 1.2   # For highly sustainable products
-        for i in range(len(combined_scores)):
-            if df.loc[i, 'esg_score'] >= 85:
-                combined_scores[i] *= eco_boost_2
-            elif df.loc[i, 'esg_score'] >= 70:
-                combined_scores[i] *= eco_boost_1
-                
-        # Sort by updated combined score
-        scores_with_indices = sorted(enumerate(combined_scores), key=lambda x: x[1], reverse=True)
-        
-        # Filter out products with ESG < 50
-        filtered = [(i, score) for i, score in scores_with_indices if df.loc[i, 'esg_score'] >= 50]
-        
-        # Take top 3
-        top_3 = filtered[:3]
-
-        print("Top 3 after ESG filtering:")
-        for i, score in top_3:
-            print(f"Title: {df.loc[i, 'title']}, ESG Score: {df.loc[i, 'esg_score']}, Final Score: {score}")
-
-        # scores_with_indices = sorted(enumerate(combined_scores), key=lambda x: x[1], reverse=True)
-        # top_3 = scores_with_indices[:3]
-
-        product_ids = [df.loc[i, 'product_id'] for i, _ in top_3]
-
-        # Log events
-        for pid in product_ids:
-            title = df[df['product_id'] == pid]['title'].values[0]
-            log_event(pid, title, 'shown', user_input)
+        try:
+            k = _requested_k(data)
+        except (TypeError, ValueError):
+            return jsonify({"error": "k must be a positive integer"}), 400
 
-        # Convert IDs to integers 
-        int_ids = [int(pid) for pid in product_ids]
-
-    
-        products = Product.query.filter(Product.id.in_(int_ids)).all()
-
-       
-        score_map = {int(pid): float(score) for pid, score in zip(product_ids, [s for _, s in top_3])}
-
-        results = []
-        for p in products:
-            results.append({
-                "id": p.id,
-                "title": p.title,
-                "brand": p.brand,
-                "category": p.category,
-                "description": p.description,
-                "sale_price": p.sale_price,
-                "discount": p.discount,
-                "colors": p.colors.split(",") if p.colors else [],
-                "sizes": p.sizes.split(",") if p.sizes else [],
-                "tags": p.tags.split(",") if p.tags else [],
-                "publish_date": p.publish_date.isoformat() if p.publish_date else None,
-                "score": score_map.get(p.id, 0.0),
-                "esg_score": float(df_row['esg_score']),
-                "esg_badge": df_row['esg_badge']
-            })
+        engine = catalog_index.engine()
+        key = query_cache.key('recommend-full', user_input, k, engine.version)
+        ranked = query_cache.get_or_compute(key, lambda: _ranked_products(engine, user_input, k))
+
+        for pid, title in ranked['shown']:
+            log_event(pid, title, 'shown', user_input)
+        results = ranked['results']
 
         if not results:
             return jsonify({"error": "No matching products found in database."}), 404
 
         return jsonify({"results": results})
 
-    except Exception as e:
-        print("Error in /api/recommend-full:", e)
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+    except Exception:
+        current_app.logger.exception("/api/recommend-full failed")
+        return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
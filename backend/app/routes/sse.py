@@ -1,14 +1,9 @@
-from flask import Blueprint, Response
-from queue import SimpleQueue
-from backend.app.event_publisher import register_client, unregister_client, sse_stream
+from flask import Blueprint
+from backend.app.sse_hub import hub, LOCAL_CHANNEL
 
 sse_bp = Blueprint("sse", __name__)
 
 @sse_bp.route("/events/stream")
 def stream_events():
-    q = SimpleQueue()
-    register_client(q)
-    try:
-        return Response(sse_stream(q), mimetype="text/event-stream")
-    finally:
-        unregister_client(q)
+    # the subscription is released when the response is closed, iterated or not
+    return hub.response(LOCAL_CHANNEL)
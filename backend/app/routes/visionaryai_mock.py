@@ -3,14 +3,13 @@ import random
 import os
 import csv
 from datetime import datetime
+from backend.app.event_log import event_log as get_event_log
 
 app = Flask(__name__)
 
-<<<<<<< HEAD
-=======
 log_file = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'logs', 'infinitybrain_logs.csv'))
-if not os.path.exists(os.path.dirname(log_file)):
-    os.makedirs(os.path.dirname(log_file))
+LOG_FIELDS = ["user_id", "timestamp", "api_call", "response_type", "response_value", "confidence", "request_data"]
+event_log = get_event_log(log_file, LOG_FIELDS)
 
 # Loading existing logs or initializing empty list with a proper structure
 try:
@@ -20,7 +19,6 @@ try:
 except FileNotFoundError:
     logs = []
 
->>>>>>> ef030e382c61d85b6655a2ed69f924d9ffc1c9c7
 # Mock VisionaryAI analyze function
 def mock_visionaryai_analyze(image_input):
     return {
@@ -46,15 +44,10 @@ def analyze_image():
     try:
         data = request.get_json()
 
-<<<<<<< HEAD
-    if not data or "image" not in data:
-        return jsonify({"error": "Missing 'image' in request body"}), 400
-=======
         if not data or "image" not in data:
             return jsonify({"error": "Missing 'image' in request body"}), 400
         
         mock_response = mock_visionaryai_analyze(data["image"])
->>>>>>> ef030e382c61d85b6655a2ed69f924d9ffc1c9c7
 
         log_entry = {
             "user_id": data.get('user_id', 'unknown'),
@@ -66,13 +59,7 @@ def analyze_image():
             "request_data": str(data)
         }
         logs.append(log_entry)
-
-        fieldnames = ["user_id", "timestamp", "api_call", "response_type", "response_value", "confidence", "request_data"]
-        with open(log_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            if os.stat(log_file).st_size == 0:
-                writer.writeheader()
-            writer.writerow(log_entry)
+        event_log.write(log_entry)
 
         return jsonify(mock_response)
     except Exception as e:
@@ -86,10 +73,7 @@ def analyze_image():
             "request_data": str(data)
         }
         logs.append(error_entry)
-
-        with open(log_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writerow(error_entry)
+        event_log.write(error_entry)
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/visionaryai/infer', methods=['POST'])
@@ -112,13 +96,7 @@ def infer_image():
             "request_data": str(data)
         }
         logs.append(log_entry)
-
-        fieldnames = ["user_id", "timestamp", "api_call", "response_type", "response_value", "confidence", "request_data"]
-        with open(log_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            if os.stat(log_file).st_size == 0:
-                writer.writeheader()
-            writer.writerow(log_entry)
+        event_log.write(log_entry)
 
         return jsonify(mock_response)
     except Exception as e:
@@ -132,21 +110,8 @@ def infer_image():
             "request_data": str(data)
         }
         logs.append(error_entry)
-        
-        with open(log_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writerow(error_entry)
+        event_log.write(error_entry)
         return jsonify({"error": str(e)}), 500
 
-@app.route('/api/visionaryai/infer', methods=['POST'])
-def infer_image():
-    data = request.get_json()
-
-    if not data or "image" not in data:
-        return jsonify({"error": "Missing 'image' in request body"}), 400
-
-    mock_response = mock_visionaryai_infer(data["image"])
-    return jsonify(mock_response)
-
 if __name__ == '__main__':
     app.run(debug=True, port=5001)
@@ -5,6 +5,8 @@ from backend.app.database import db
 from backend.app.models.workflow_defs import WorkflowDef
 from backend.app.models.runs import Run
 from backend.app.models.run_steps import RunStep
+from backend.app.persistence import bulk_create_steps
+from backend.app.services.plan_cache import build_plan, cached_plan
 import yaml
 import json
 from typing import List, Dict, Tuple
@@ -44,7 +46,11 @@ def validate_workflow_structure(parsed: dict) -> Tuple[bool, str]:
 # ----------------------
 # Helpers: DAG builder
 # ----------------------
-def build_dag(parsed: dict) -> Tuple[List[Dict], List[Tuple[str, str]]]:
+class WorkflowSpecError(ValueError):
+    pass
+
+
+def _compile_parsed(parsed: dict):
     steps = parsed.get("steps", [])
     ids = [str(s["id"]) for s in steps]
     nodes = []
@@ -74,25 +80,38 @@ def build_dag(parsed: dict) -> Tuple[List[Dict], List[Tuple[str, str]]]:
                     raise ValueError(f"step '{sid}' depends_on unknown step '{dep_id}'")
                 edges.append((dep_id, sid))
 
-    # cycle detection (Kahn's algorithm)
-    adjacency = {n["id"]: [] for n in nodes}
-    indegree = {n["id"]: 0 for n in nodes}
-    for a, b in edges:
-        adjacency[a].append(b)
-        indegree[b] += 1
-    queue = [n for n in indegree if indegree[n] == 0]
-    visited = 0
-    while queue:
-        node = queue.pop(0)
-        visited += 1
-        for neigh in adjacency[node]:
-            indegree[neigh] -= 1
-            if indegree[neigh] == 0:
-                queue.append(neigh)
-    if visited != len(nodes):
-        raise ValueError("Cycle detected in workflow steps")
-
-    return nodes, edges
+    # topological sort / cycle detection (Kahn's algorithm)
+    return build_plan(ids, edges, payload={"nodes": nodes, "edges": edges})
+
+
+def build_dag(parsed: dict) -> Tuple[List[Dict], List[Tuple[str, str]]]:
+    plan = _compile_parsed(parsed)
+    return plan.payload["nodes"], plan.payload["edges"]
+
+
+def _compile_yaml(dsl_yaml: str):
+    try:
+        parsed = yaml.safe_load(dsl_yaml)
+    except yaml.YAMLError as e:
+        raise WorkflowSpecError(f"Invalid YAML: {str(e)}")
+
+    ok, msg = validate_workflow_structure(parsed)
+    if not ok:
+        raise WorkflowSpecError(f"Invalid workflow spec: {msg}")
+
+    try:
+        return _compile_parsed(parsed)
+    except ValueError as e:
+        raise WorkflowSpecError(f"Invalid workflow DAG: {str(e)}")
+
+
+def compile_workflow(dsl_yaml: str, version: str = None):
+    """
+    Parse, validate and compile a workflow YAML into a CompiledPlan.
+    Plans are cached by (YAML content, version), so repeated starts of the same
+    WorkflowDef skip YAML parsing and DAG construction.
+    """
+    return cached_plan("workflow", dsl_yaml, version, _compile_yaml)
 
 # ----------------------
 # POST /flow/workflows
@@ -108,18 +127,10 @@ def register_workflow():
         return jsonify({"error": "name and dsl_yaml are required"}), 400
 
     try:
-        parsed = yaml.safe_load(dsl_yaml)
-    except yaml.YAMLError as e:
-        return jsonify({"error": f"Invalid YAML: {str(e)}"}), 400
-
-    ok, msg = validate_workflow_structure(parsed)
-    if not ok:
-        return jsonify({"error": f"Invalid workflow spec: {msg}"}), 400
-
-    try:
-        nodes, edges = build_dag(parsed)
-    except ValueError as e:
-        return jsonify({"error": f"Invalid workflow DAG: {str(e)}"}), 400
+        plan = compile_workflow(dsl_yaml, version)
+    except WorkflowSpecError as e:
+        return jsonify({"error": str(e)}), 400
+    nodes, edges = plan.payload["nodes"], plan.payload["edges"]
 
     existing = WorkflowDef.query.filter_by(name=name, version=version).first()
     if existing:
@@ -177,11 +188,10 @@ def flow_plan():
     if not dsl_yaml:
         return jsonify({"error": "dsl_yaml is required"}), 400
     try:
-        parsed = yaml.safe_load(dsl_yaml)
-        nodes, edges = build_dag(parsed)
+        plan = compile_workflow(dsl_yaml, payload.get("version"))
     except Exception as e:
         return jsonify({"error": f"Invalid DSL: {str(e)}"}), 400
-    return jsonify({"dag": {"nodes": nodes, "edges": edges}}), 200
+    return jsonify({"dag": plan.payload}), 200
 
 @bp.route("/<int:run_id>/cancel", methods=["POST"])
 @jwt_required()
@@ -214,6 +224,12 @@ def start_workflow(wf_id):
     if not wf:
         return jsonify({"error": "workflow not found"}), 404
 
+    # Compiled plan is cached per (dsl_yaml, version), so repeat starts skip parsing
+    try:
+        plan = compile_workflow(wf.dsl_yaml, wf.version)
+    except WorkflowSpecError:
+        return jsonify({"error": "invalid workflow DSL"}), 400
+
     # Create run with explicit version
     run = Run(
         workflow_id=wf.id,
@@ -222,23 +238,10 @@ def start_workflow(wf_id):
         started_at=datetime.utcnow()
     )
     db.session.add(run)
-    db.session.commit()
+    db.session.flush()
 
-    # Create run steps from workflow DAG
-    try:
-        parsed = yaml.safe_load(wf.dsl_yaml)
-        steps = parsed.get("steps", [])
-    except Exception:
-        return jsonify({"error": "invalid workflow DSL"}), 400
-
-    for s in steps:
-        rs = RunStep(
-            run_id=run.id,
-            step_id=str(s["id"]),
-            status="pending",
-            output_json=json.dumps({})
-        )
-        db.session.add(rs)
+    # Create run steps from workflow DAG in topological order, one INSERT
+    bulk_create_steps(db.session, run.id, [{"id": sid} for sid in plan.topo_ids])
     db.session.commit()
 
     return jsonify({
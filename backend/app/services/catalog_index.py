@@ -0,0 +1,395 @@
+# services/catalog_index.py
+import logging
+import threading
+import time
+import numpy as np
+import redis
+from scipy import sparse
+from ..config.settings import settings
+from ..database import db
+from ..models import Product
+from ..utils.esg_utils import esg_badges as badges_for
+from .model_registry import recommender
+from .recommender import WEIGHT_CATEGORY, WEIGHT_COLOR, RecommendationEngine, top_k
+
+logger = logging.getLogger(__name__)
+
+# Redis list of changed product ids, appended by product_routes; its length is the change offset
+CHANGES_KEY = "catalog:changes"
+# Version of the artifact that already contains every change trimmed off the list, and a
+# counter bumped on each trim (list indices start over, so workers replay it from 0)
+BASE_KEY = "catalog:changes:base"
+EPOCH_KEY = "catalog:changes:epoch"
+# Held while a rebuild task is queued or running, so workers past the cap enqueue one between them
+REBUILD_LOCK_KEY = "catalog:rebuild:lock"
+REBUILD_LOCK_SECONDS = 1800
+
+# A product's strongest item-item affinity in the base catalog is its self-similarity (1.0)
+NEW_PRODUCT_AFFINITY = 1.0
+
+# Product ids per IN (...) query when loading changed products
+APPLY_BATCH_SIZE = 1000
+
+
+def product_record(product):
+    """Catalog fields of a Product row, in the shape of the recommender's columns."""
+    return {
+        "product_id": str(product.id),
+        "title": product.title or "",
+        "description": product.description or "",
+        "category": product.category or "",
+        "color": product.colors or "",
+        "image_url": "",
+        # NaN = unscored: never filtered out by the ESG ranking, unlike a score of 0
+        "esg_score": np.nan if product.esg_score is None else float(product.esg_score),
+    }
+
+
+def delta_engine(records, vectorizer, base=None):
+    """
+    Small in-memory segment for added/updated products. Texts are projected
+    with the base catalog's fitted vectorizer, so nothing is refit; terms
+    the base vocabulary lacks are ignored until the artifact is rebuilt.
+
+    A product that replaces a `base` row keeps that row's image URL and
+    static (category/colour affinity) score; only products new to the
+    catalog get NEW_PRODUCT_AFFINITY.
+    """
+    records = list(records)
+    columns = {
+        key: np.array([r[key] for r in records], dtype=object)
+        for key in ("product_id", "title", "description", "category", "color", "image_url")
+    }
+    texts = [f"{r['title']} {r['description']}" for r in records]
+    static_scores = np.full(len(records), (WEIGHT_CATEGORY + WEIGHT_COLOR) * NEW_PRODUCT_AFFINITY)
+    if base is not None:
+        matches = [(i, base.row_of(r["product_id"])) for i, r in enumerate(records)]
+        matches = np.array([(i, row) for i, row in matches if row is not None], dtype=np.intp).reshape(-1, 2)
+        if matches.size:
+            static_scores[matches[:, 0]] = base.static_scores[matches[:, 1]]
+            columns["image_url"][matches[:, 0]] = base.columns["image_url"][matches[:, 1]]
+    esg_scores = np.array([r["esg_score"] for r in records], dtype=np.float64)
+    esg_badges = badges_for(esg_scores)
+    return RecommendationEngine(columns, static_scores, vectorizer, vectorizer.transform(texts),
+                                esg_scores, esg_badges)
+
+
+class SegmentedEngine:
+    """
+    The base catalog engine plus a delta segment, served as one catalog.
+
+    Rows 0..base.size-1 are base rows and the delta's rows follow them.
+    `replaced` lists base rows superseded by a delta row or deleted; they
+    are never returned. The base (usually memory-mapped) is shared, not
+    copied: only the delta is rebuilt when products change.
+    """
+
+    def __init__(self, base, delta, replaced, version):
+        self.base = base
+        self.delta = delta
+        self.replaced = np.asarray(sorted(replaced), dtype=np.intp)
+        # tombstones masked inside the base's ranking, so its candidate index still serves top k
+        self.tombstones = np.zeros(base.size, dtype=bool)
+        self.tombstones[self.replaced] = True
+        self.version = version
+        self.offset = base.size
+        self.size = base.size - self.replaced.size + (delta.size if delta else 0)
+
+    def _merge(self, method, query, k):
+        exclude = self.tombstones if self.replaced.size else None
+        idx, scores = getattr(self.base, method)(query, k, exclude=exclude)
+        if self.delta is not None and self.delta.size:
+            d_idx, d_scores = getattr(self.delta, method)(query, k)
+            idx = np.concatenate([idx, d_idx + self.offset])
+            scores = np.concatenate([scores, d_scores])
+        best = top_k(scores, k)
+        return idx[best], scores[best]
+
+    def recommend(self, query, k):
+        return self._merge("recommend", query, k)
+
+    def recommend_esg(self, query, k):
+        return self._merge("recommend_esg", query, k)
+
+    def row_of(self, product_id):
+        if self.delta is not None:
+            row = self.delta.row_of(product_id)
+            if row is not None:
+                return row + self.offset
+        row = self.base.row_of(product_id)
+        if row is None or self.tombstones[row]:
+            return None
+        return row
+
+    def esg_of(self, row):
+        return self.base.esg_of(row) if row < self.offset else self.delta.esg_of(row - self.offset)
+
+    def sample(self, k, rng=None):
+        rng = rng or np.random.default_rng()
+        live = np.setdiff1d(np.arange(self.offset), self.replaced)
+        if self.delta is not None:
+            live = np.concatenate([live, np.arange(self.delta.size) + self.offset])
+        return rng.choice(live, size=min(int(k), live.size), replace=False)
+
+    def compact(self):
+        """
+        One in-memory RecommendationEngine with the live base rows followed
+        by the delta rows, for persisting as a new artifact. The dense
+        similarity matrix is not carried over.
+        """
+        from .recommender_artifact import configured_index
+
+        base, delta = self.base, self.delta
+        live = np.setdiff1d(np.arange(self.offset), self.replaced)
+        parts = [(base, live)] + ([(delta, np.arange(delta.size))] if delta is not None else [])
+        columns = {
+            key: np.concatenate([np.asarray(engine.columns[key][rows], dtype=object) for engine, rows in parts])
+            for key in base.columns
+        }
+        tfidf = sparse.vstack([engine.tfidf_matrix[rows] for engine, rows in parts]).tocsr()
+        return RecommendationEngine(
+            columns,
+            np.concatenate([np.asarray(engine.static_scores[rows]) for engine, rows in parts]),
+            base.vectorizer,
+            tfidf,
+            np.concatenate([np.asarray(engine.esg_scores[rows]) for engine, rows in parts]),
+            np.concatenate([np.asarray(engine.esg_badges[rows], dtype=object) for engine, rows in parts]),
+            index=configured_index(tfidf),
+        )
+
+    def rows(self, idx, scores=None):
+        idx = np.asarray(idx)
+        in_base = idx < self.offset
+        base_rows = iter(self.base.rows(idx[in_base]))
+        delta_rows = iter(self.delta.rows(idx[~in_base] - self.offset) if (~in_base).any() else [])
+        results = [next(base_rows) if b else next(delta_rows) for b in in_base]
+        for result, score in zip(results, [0.0] * len(results) if scores is None else scores):
+            result["score"] = float(score)
+        return results
+
+
+class CatalogIndexer:
+    """
+    Keeps the served recommender in step with the Product table.
+
+    product_changed() appends the id to a Redis change list and applies it
+    at once in this process; every other worker notices the longer list
+    within `sync_interval` seconds and applies the same ids. Applying loads
+    the products, rebuilds the small delta segment and swaps a new
+    SegmentedEngine into the registry in one step, so requests see either
+    the old or the new catalog, never a mix. Without Redis, changes stay
+    local to the worker that made them.
+
+    Once the delta holds more than `delta_max` products or the list more
+    than `changes_max` entries, one worker enqueues a rebuild task that
+    folds every product into a new artifact (publish_artifact()), then
+    trims the list entries it contains and records the artifact's version
+    under BASE_KEY. Workers switch to that artifact on their next sync and
+    replay only the rest of the list, so neither grows without bound.
+    """
+
+    def __init__(self, redis_url=None, sync_interval=1.0, redis_retry=30.0, delta_max=5000, changes_max=50000):
+        self.sync_interval = sync_interval
+        self.redis_retry = redis_retry
+        self.delta_max = delta_max
+        self.changes_max = changes_max
+        self._redis = (
+            redis.from_url(redis_url, socket_connect_timeout=0.2, socket_timeout=0.2) if redis_url else None
+        )
+        self._redis_down_until = 0.0
+        self._lock = threading.RLock()
+        self._checked = 0.0
+        self._local_changes = []
+        self._forget()
+
+    def reset(self):
+        """Forget the delta and serve the base engine again; the next sync replays changes."""
+        with self._lock:
+            if self._published is not None and self._published is not self._base:
+                recommender.replace(self._published, self._base)
+            self._forget()
+            self._checked = 0.0
+
+    def _forget(self, base=None):
+        self._base = self._published = base
+        self._records = {}     # product_id -> record, for products in the delta
+        self._removed = set()  # deleted product ids
+        self._applied = 0      # entries of the Redis change list applied
+        self._epoch = None     # EPOCH_KEY when _applied was counted
+        self._local_applied = 0
+
+    def engine(self):
+        """The engine requests should use, after applying pending catalog changes."""
+        self.sync()
+        return recommender.get()
+
+    def product_changed(self, product_id):
+        """Record that a product was added, updated or deleted, and apply it here now."""
+        self.products_changed([product_id])
+
+    def products_changed(self, product_ids):
+        """product_changed() for many products, applied in one delta rebuild."""
+        ids = [int(pid) for pid in product_ids]
+        if not ids:
+            return
+        if self._call_redis(lambda r: r.rpush(CHANGES_KEY, *ids)) is None:
+            with self._lock:
+                self._local_changes.extend(ids)
+        self.sync(force=True)
+
+    def sync(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checked < self.sync_interval:
+            return
+        with self._lock:
+            self._checked = now
+            current = recommender.get()
+            if current is not self._published:
+                # a new artifact was loaded (or the registry was reset): replay every change onto it
+                self._forget(current.base if isinstance(current, SegmentedEngine) else current)
+                self._published = current
+            ids, self._local_changes = self._local_changes, []
+            self._local_applied += len(ids)
+            state = self._call_redis(lambda r: r.mget(BASE_KEY, EPOCH_KEY))
+            if state is not None:
+                ids.extend(self._follow(*(v.decode() if v else None for v in state)))
+            length = self._call_redis(lambda r: r.llen(CHANGES_KEY))
+            if length is not None and length > self._applied:
+                entries = self._call_redis(lambda r: r.lrange(CHANGES_KEY, self._applied, length - 1))
+                if entries is not None:
+                    ids.extend(int(e) for e in entries)
+                    self._applied = length
+            if ids:
+                self._apply(ids)
+                self._maybe_rebuild()
+
+    def _follow(self, base_version, epoch):
+        """
+        Catch up with a trimmed change list: serve the artifact it was trimmed
+        into and replay the list from its new start. Returns product ids to
+        apply besides the list (all of them if that artifact is not here).
+        """
+        if epoch == self._epoch:
+            return []
+        self._epoch, self._applied = epoch, 0
+        if base_version is None or base_version == self._base.version:
+            return []
+        from .recommender_artifact import default_paths, load
+
+        try:
+            fresh = load(default_paths()[2])
+        except Exception:
+            logger.exception("Could not load the published catalog artifact")
+            fresh = None
+        if fresh is not None and fresh.version == base_version and recommender.replace(self._published, fresh):
+            self._forget(fresh)
+            self._published = fresh
+            self._epoch = epoch
+            logger.info("Catalog now served from published artifact %s", base_version)
+            return []
+        # the trimmed changes are not in this worker's base: replay the whole Product table
+        logger.warning("Catalog artifact %s not available here; replaying every product", base_version)
+        return [pid for (pid,) in db.session.query(Product.id)]
+
+    def _maybe_rebuild(self):
+        if len(self._records) + len(self._removed) <= self.delta_max and self._applied <= self.changes_max:
+            return
+        if not self._call_redis(lambda r: r.set(REBUILD_LOCK_KEY, 1, nx=True, ex=REBUILD_LOCK_SECONDS)):
+            return
+        from ..tasks.catalog import rebuild_catalog_artifact
+
+        try:
+            rebuild_catalog_artifact.apply_async()
+            logger.info("Catalog delta past its cap (%d products, %d changes); artifact rebuild queued",
+                        len(self._records) + len(self._removed), self._applied)
+        except Exception:
+            logger.exception("Failed to enqueue the catalog artifact rebuild")
+            self._call_redis(lambda r: r.delete(REBUILD_LOCK_KEY))
+
+    def publish_artifact(self):
+        """
+        Fold every product into a new artifact, publish it and trim the change
+        list entries it contains. Runs in the rebuild task; needs Redis.
+        Returns the new artifact version, or None if Redis is unavailable.
+        """
+        from .recommender_artifact import default_paths, load, load_or_build, save, source_signature
+
+        try:
+            offset = self._call_redis(lambda r: r.llen(CHANGES_KEY))
+            if offset is None:
+                return None
+            changed = self._call_redis(lambda r: r.lrange(CHANGES_KEY, 0, offset - 1)) or []
+            # read the products after the offset: they are at least as new as the changes being trimmed
+            records = {}
+            for product in Product.query.order_by(Product.id).yield_per(APPLY_BATCH_SIZE):
+                records[str(product.id)] = product_record(product)
+            removed = {e.decode() for e in changed} - set(records)
+
+            model_path, esg_path, artifact_dir = default_paths()
+            # the current artifact already lacks products deleted before earlier folds
+            base = load_or_build()
+            replaced = {base.row_of(pid) for pid in list(records) + list(removed)} - {None}
+            delta = delta_engine(records.values(), base.vectorizer, base) if records else None
+            folded = SegmentedEngine(base, delta, replaced, None).compact()
+            signature = source_signature(model_path, esg_path)
+            save(folded, artifact_dir, {**signature, "catalog": {"products": len(records), "at": time.time()}})
+            version = load(artifact_dir).version
+
+            def publish(r):
+                pipe = r.pipeline()
+                pipe.ltrim(CHANGES_KEY, offset, -1)
+                pipe.set(BASE_KEY, version)
+                pipe.incr(EPOCH_KEY)
+                pipe.execute()
+                return True
+
+            if not self._call_redis(publish):
+                return None
+            logger.info("Published catalog artifact %s (%d rows, %d changes trimmed)", version, folded.size, offset)
+            return version
+        finally:
+            self._call_redis(lambda r: r.delete(REBUILD_LOCK_KEY))
+
+    def _apply(self, ids):
+        unique = list(dict.fromkeys(ids))
+        found = {}
+        for start in range(0, len(unique), APPLY_BATCH_SIZE):
+            batch = unique[start:start + APPLY_BATCH_SIZE]
+            found.update((p.id, p) for p in Product.query.filter(Product.id.in_(batch)))
+        for pid in unique:
+            key = str(pid)
+            if pid in found:
+                self._records[key] = product_record(found[pid])
+                self._removed.discard(key)
+            else:
+                self._records.pop(key, None)
+                self._removed.add(key)
+
+        base = self._base
+        replaced = {base.row_of(pid) for pid in list(self._records) + list(self._removed)} - {None}
+        delta = delta_engine(self._records.values(), base.vectorizer, base) if self._records else None
+        version = f"{base.version}+{self._applied}" + (f".l{self._local_applied}" if self._local_applied else "")
+        engine = SegmentedEngine(base, delta, replaced, version)
+        # atomic swap; if a new artifact was loaded meanwhile, the next sync rebuilds on it
+        if recommender.replace(self._published, engine):
+            self._published = engine
+        logger.info("Catalog delta now %d products (%d base rows replaced)",
+                    delta.size if delta else 0, len(replaced))
+
+    def _call_redis(self, fn):
+        if self._redis is None or time.monotonic() < self._redis_down_until:
+            return None
+        try:
+            return fn(self._redis)
+        except redis.RedisError as e:
+            logger.warning("Catalog change list unavailable (%s); local changes only for %.0fs", e, self.redis_retry)
+            self._redis_down_until = time.monotonic() + self.redis_retry
+            return None
+
+
+catalog_index = CatalogIndexer(
+    redis_url=settings.REDIS_URL if settings.CATALOG_SYNC_REDIS else None,
+    sync_interval=settings.CATALOG_SYNC_INTERVAL,
+    delta_max=settings.CATALOG_DELTA_MAX,
+    changes_max=settings.CATALOG_CHANGES_MAX,
+)
@@ -1,8 +1,17 @@
 # services/executor.py
 import json
+import itertools
+from concurrent.futures import wait, FIRST_COMPLETED
+from sqlalchemy import update
 from ..database import db
 from ..models import Run, RunStep
+from ..event_publisher import publish_workflow_event
+from ..persistence import bulk_create_steps, StepWriteBuffer
 from ..services import compensator
+from ..services import step_pool
+from ..services import signals
+from ..services import timers
+from ..services.scheduler import DagScheduler
 from flask import current_app
 
 def start_run_from_dag(dag_steps, workflow_id=None, version="1.0", created_by=None):
@@ -18,12 +27,17 @@ def start_run_from_dag(dag_steps, workflow_id=None, version="1.0", created_by=No
         raise ValueError(f"Invalid dag_steps format: {dag_steps}")
 
     # Build DAG
-    nodes = {step["step_id"]: {"action": step.get("action")} for step in steps_list}
-    edges = [
-        (dep, step["step_id"]) 
-        for step in steps_list 
-        for dep in step.get("depends_on", [])
-    ]
+    # planner.parse_dsl emits "id"; older callers pass "step_id"
+    nodes = {}
+    edges = []
+    for step in steps_list:
+        sid = step.get("step_id", step.get("id"))
+        nodes[sid] = {"action": step.get("action")}
+        if step.get("args"):
+            nodes[sid]["args"] = step["args"]
+        if step.get("signal"):
+            nodes[sid]["signal"] = step["signal"]
+        edges.extend((dep, sid) for dep in step.get("depends_on", []))
 
 
     dag = {"nodes": nodes, "edges": edges}
@@ -36,37 +50,64 @@ def start_run_from_dag(dag_steps, workflow_id=None, version="1.0", created_by=No
         inputs_json=json.dumps(dag)
     )
     db.session.add(run)
-    db.session.commit()
+    db.session.flush()  # assigns run.id without a separate commit
 
-    # create RunStep objects
-    for step_id in nodes:
-        step = RunStep(
-            run_id=run.id,
-            step_id=step_id,
-            status="pending"
-        )
-        db.session.add(step)
+    # create all RunStep rows with one multi-row INSERT, then commit once
+    bulk_create_steps(db.session, run.id, [{"id": step_id} for step_id in nodes])
     db.session.commit()
 
-    # refresh the run object so relationships are loaded
-    db.session.refresh(run)
-
     return run
 
 
+# A pass may only take over a run in one of these states; anything else is finished or being driven
+CLAIMABLE_RUN_STATUSES = ("pending", "waiting_for_signal")
+
+
 def run_workflow(run_id):
+    """
+    Drive a run until it completes, fails or parks on a signal.
+
+    The run is claimed first with a conditional UPDATE (pending/waiting ->
+    running), so the worker, a signal resume and a timer never drive the same
+    run at once, and a finished or cancelled run is returned untouched.
+    """
     run = Run.query.get(run_id)
     if not run:
         raise ValueError(f"Run {run_id} not found")
 
-    # If already terminal or running, just log and continue
-    if run.status in ("completed", "failed", "cancelled", "running"):
-        current_app.logger.info("Run already in terminal or running state: %s", run.status)
+    if not _claim_run(run_id):
+        current_app.logger.info("Run %s is %s; not driving it", run_id, run.status)
+        return run
+
+    while True:
+        run, parked = _drive(run)
+        # a signal or timer that completed a parked step while this pass held the run could not
+        # claim it; the step is committed before its claim, so it is visible here after release
+        if run.status != "waiting_for_signal" or not _any_done(run_id, parked) or not _claim_run(run_id):
+            return run
+
 
-    run.status = "running"
+def _claim_run(run_id):
+    claimed = db.session.execute(
+        update(Run)
+        .where(Run.id == run_id, Run.status.in_(CLAIMABLE_RUN_STATUSES))
+        .values(status="running")
+        .execution_options(synchronize_session=False)
+    ).rowcount
     db.session.commit()
-    db.session.refresh(run)  # ensure relationships and latest data are loaded
+    return bool(claimed)
 
+
+def _any_done(run_id, step_ids):
+    return bool(step_ids) and db.session.query(
+        RunStep.query.filter(RunStep.run_id == run_id, RunStep.step_id.in_(step_ids),
+                             RunStep.status == "done").exists()
+    ).scalar()
+
+
+def _drive(run):
+    """One scheduling pass over a claimed run; returns the run and the steps it left parked."""
+    run_id = run.id
     dag = json.loads(run.inputs_json or "{}")
     nodes = dag.get("nodes", {})
     edges = dag.get("edges", [])
@@ -76,90 +117,149 @@ def run_workflow(run_id):
     for a, b in edges:
         preds[b].add(a)
 
-    def get_step_model(step_id):
-        return RunStep.query.filter_by(run_id=run.id, step_id=step_id).first()
+    # Load every step status once; the scheduler tracks readiness from here on
+    statuses = dict(db.session.query(RunStep.step_id, RunStep.status).filter_by(run_id=run.id).all())
+    step_ids = list(nodes) + [sid for sid in statuses if sid not in nodes]
+    scheduler = DagScheduler(step_ids, preds, statuses)
+
+    # Step transitions are buffered and written once per scheduling wave
+    writes = StepWriteBuffer(db.session, run.id)
+
+    mode = current_app.config.get("EXECUTOR_MODE", "serial")
+    run_limit = 1 if mode == "serial" else max(1, int(current_app.config.get("EXECUTOR_RUN_CONCURRENCY", 4)))
+    pool = step_pool.get_pool(mode, int(current_app.config.get("EXECUTOR_MAX_WORKERS", 8)))
+
+    in_flight = {}  # future -> (dispatch seq, step_id)
+    seq = itertools.count()
+    failed_sid = None
 
     try:
         while True:
-            pending_steps = RunStep.query.filter_by(run_id=run.id, status="pending").all()
-            if not pending_steps:
-                break
-
-            progressed = False
-            for step in pending_steps:
-                sid = step.step_id
-                step_meta = nodes.get(sid, {})
-                pred_done = all(get_step_model(p).status == "done" for p in preds.get(sid, []))
+            # Dispatch ready steps up to the per-run limit; stop dispatching once a step failed
+            batch = []
+            while failed_sid is None and scheduler.has_ready() and len(in_flight) + len(batch) < run_limit:
+                sid = scheduler.pop()
+                writes.transition(sid, "running")
+                batch.append(sid)
+            # Persist results harvested in the previous wave together with newly running steps
+            claimed = {sid for sid, status in _commit_wave(writes, run_id) if status == "running"}
 
-                if not pred_done:
+            for sid in batch:
+                if sid not in claimed:
+                    # moved by someone else (e.g. cancelled) since the statuses were loaded
+                    current_app.logger.warning("Step %s of run %s is no longer pending; skipping it", sid, run_id)
                     continue
+                current_app.logger.info("Executing step %s action=%s", sid, nodes.get(sid, {}).get("action"))
+                fut = step_pool.submit(pool, execute_action, sid, nodes.get(sid, {}))
+                in_flight[fut] = (next(seq), sid)
 
-                progressed = True
-                step.status = "running"
-                db.session.commit()
-                db.session.refresh(step)
+            if not in_flight:
+                break
 
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            # Apply results in dispatch order so RunStep transitions are deterministic
+            for fut in sorted(done, key=lambda f: in_flight[f][0]):
+                _, sid = in_flight.pop(fut)
                 try:
-                    ok = execute_action(sid, step_meta, run, step)
-                    if ok:
-                        step.status = "done"
-                        db.session.commit()
-                        db.session.refresh(step)
+                    outcome = fut.result()
                 except Exception:
                     current_app.logger.exception("Step execution failed for %s", sid)
-                    step.status = "failed"
-                    db.session.commit()
-                    run.status = "failed"
-                    db.session.commit()
-                    db.session.refresh(run)
-                    compensator.handle_failure(run, step, dag)
-                    return run
-
-            if not progressed:
-                # No steps could progress → deadlock
-                current_app.logger.error("Deadlock detected for run %s - marking as failed", run.id)
-                run.status = "failed"
-                db.session.commit()
-                db.session.refresh(run)
-                return run
+                    scheduler.mark_failed(sid)
+                    writes.transition(sid, "failed")
+                    failed_sid = failed_sid or sid
+                    continue
+
+                if outcome == "waiting_for_signal":
+                    writes.transition(sid, "waiting_for_signal")
+                    scheduler.park(sid)
+                    meta = nodes.get(sid, {})
+                    if meta.get("action") == "wait":
+                        # durable timer; the timer tick completes the step and re-drives the run
+                        args = meta.get("args", {})
+                        timers.schedule_timer(db.session, run_id, sid, args.get("seconds", 0), args)
+                    else:
+                        # index the parked step so handle_signal can find and resume it directly
+                        signals.register_wait(db.session, run_id, sid, meta.get("signal"))
+                else:
+                    writes.transition(sid, "done")
+                    scheduler.mark_done(sid)
+
+        if failed_sid is not None:
+            _commit_wave(writes, run_id, run_status="failed")
+            failed_step = RunStep.query.filter_by(run_id=run_id, step_id=failed_sid).first()
+            compensator.handle_failure(run, failed_step, dag)
+            return run, []
+
+        if scheduler.failed:
+            # A step failed in an earlier pass; the run stays failed
+            _commit_wave(writes, run_id, run_status="failed")
+            return run, []
 
         # If any steps are waiting for signal, mark run accordingly
-        waiting_steps = RunStep.query.filter_by(run_id=run.id, status="waiting_for_signal").count()
-        if waiting_steps > 0:
-            run.status = "waiting_for_signal"
-            db.session.commit()
-            db.session.refresh(run)
-            return run
+        if scheduler.waiting:
+            _commit_wave(writes, run_id, run_status="waiting_for_signal")
+            return run, scheduler.waiting
+
+        if scheduler.blocked():
+            # Pending steps whose predecessors can never finish → deadlock
+            current_app.logger.error("Deadlock detected for run %s - marking as failed", run_id)
+            _commit_wave(writes, run_id, run_status="failed")
+            return run, []
 
         # All steps done
-        run.status = "completed"
-        db.session.commit()
-        db.session.refresh(run)
-        return run
+        _commit_wave(writes, run_id, run_status="completed")
+        return run, []
 
     except Exception:
         current_app.logger.exception("Unexpected executor error")
-        run.status = "failed"
+        db.session.rollback()
+        _set_run_status(run_id, "failed")
         db.session.commit()
-        db.session.refresh(run)
-        return run
+        return run, []
+
+
+def _set_run_status(run_id, status):
+    """Move a run this pass holds to `status`; a no-op if it left "running" meanwhile (e.g. cancelled)."""
+    return bool(db.session.execute(
+        update(Run)
+        .where(Run.id == run_id, Run.status == "running")
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    ).rowcount)
 
 
+def _commit_wave(writes, run_id, run_status=None):
+    """Commit one scheduling wave and publish its transitions to the run's SSE channel."""
+    flushed = writes.flush()
+    moved = _set_run_status(run_id, run_status) if run_status else False
+    db.session.commit()
+    for sid, status in flushed:
+        publish_workflow_event(run_id, {"type": "step", "step_id": sid, "status": status})
+    if moved:
+        publish_workflow_event(run_id, {"type": "run", "status": run_status})
+    return flushed
+
 
-def execute_action(step_id, step_meta, run, step_model):
+def execute_action(step_id, step_meta):
+    """
+    Run the body of a single step and return its outcome ("done" or
+    "waiting_for_signal"); raise to fail the step.
+
+    Runs on a pool worker (thread or process), so it must not touch the
+    Flask app context or the DB session; run_workflow applies the outcome.
+    """
     action = step_meta.get("action")
-    current_app.logger.info("Executing step %s action=%s", step_id, action)
 
     if action == "fail":
         raise RuntimeError("simulated failure for testing")
-    if action == "wait_for_signal":
-        step_model.status = "waiting_for_signal"
-        db.session.commit()          # <-- commit here!
-        db.session.refresh(step_model)  # ensure latest data
-        run.status = "waiting_for_signal"
-        db.session.commit()
-        db.session.refresh(run)
-        return False
+    if action in ("wait_for_signal", "wait"):
+        return "waiting_for_signal"
+    if action == "http_call":
+        from backend.app.tasks.http_call import http_call
+        result = http_call(**step_meta.get("args", {}))
+        if result.get("error"):
+            raise RuntimeError(f"http_call failed for step {step_id}: {result['error']}")
+        return "done"
 
     # default success
-    return True
\ No newline at end of file
+    return "done"
@@ -0,0 +1,278 @@
+# services/image_store.py
+"""
+Content-addressed image store on the local filesystem.
+
+    <root>/<aa>/<bb>/<sha256>                      original bytes
+    <root>/thumbs/<size>/<aa>/<bb>/<sha256>.jpg    longest edge <= size (.png if transparent)
+
+An image's key is the SHA-256 of its bytes, so identical uploads share one
+file and a key's contents never change: URLs built from keys can be cached
+forever. Files are written to a temporary name and renamed into place, so
+readers never see partial files and concurrent writers of the same image
+are harmless. Thumbnails are generated when an image is stored (and on
+first request if missing); without Pillow, or for bytes Pillow cannot
+decode, the original is served at every size.
+
+Existing database blobs are moved here by the image_blob_store migration,
+or by `python -m backend.app.services.image_store migrate`.
+"""
+import argparse
+import hashlib
+import io
+import logging
+import os
+import re
+import sys
+import tempfile
+import sqlalchemy as sa
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# magic bytes of the formats the upload routes accept or browsers render
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def sniff_content_type(data, default="application/octet-stream"):
+    head = bytes(data[:16])
+    for signature, content_type in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return default
+
+
+class ImageStore:
+    def __init__(self, root, thumbnail_sizes=(128, 512), jpeg_quality=85):
+        self.root = root
+        self.thumbnail_sizes = tuple(sorted(int(s) for s in thumbnail_sizes))
+        self.jpeg_quality = jpeg_quality
+
+    # ---------------- paths ----------------
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def _thumbnail_paths(self, key, size):
+        base = os.path.join(self.root, "thumbs", str(size), key[:2], key[2:4], key)
+        return base + ".jpg", base + ".png"
+
+    def exists(self, key):
+        return os.path.isfile(self.path(key))
+
+    # ---------------- writes ----------------
+    def put(self, data):
+        """Store `data` (bytes) and its thumbnails; returns its key."""
+        key = hashlib.sha256(data).hexdigest()
+        if not self.exists(key):
+            self._write(self.path(key), data)
+        self.ensure_thumbnails(key, data)
+        return key
+
+    def put_file(self, path, block_size=1 << 20):
+        """put() for a file on disk, hashed and copied in blocks."""
+        digest = hashlib.sha256()
+        fd, tmp = self._tempfile(self.root)
+        try:
+            with open(path, "rb") as src, os.fdopen(fd, "wb") as dst:
+                for block in iter(lambda: src.read(block_size), b""):
+                    digest.update(block)
+                    dst.write(block)
+            key = digest.hexdigest()
+            target = self.path(key)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(tmp, target)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        self.ensure_thumbnails(key)
+        return key
+
+    def _tempfile(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        return tempfile.mkstemp(dir=directory, prefix=".tmp-")
+
+    def _write(self, target, data):
+        directory = os.path.dirname(target)
+        fd, tmp = self._tempfile(directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    # ---------------- thumbnails ----------------
+    def ensure_thumbnails(self, key, data=None):
+        missing = [s for s in self.thumbnail_sizes if self._thumbnail(key, s) is None]
+        if not missing:
+            return
+        try:
+            from PIL import Image
+        except ImportError:
+            logger.debug("Pillow not installed; serving originals instead of thumbnails")
+            return
+        try:
+            with Image.open(io.BytesIO(data) if data is not None else self.path(key)) as image:
+                image.load()
+                transparent = image.mode in ("RGBA", "LA", "P") and (
+                    image.mode != "P" or "transparency" in image.info)
+                for size in missing:
+                    thumb = image.copy()
+                    thumb.thumbnail((size, size))
+                    jpg, png = self._thumbnail_paths(key, size)
+                    out = io.BytesIO()
+                    if transparent:
+                        thumb.convert("RGBA").save(out, "PNG", optimize=True)
+                        self._write(png, out.getvalue())
+                    else:
+                        thumb.convert("RGB").save(out, "JPEG", quality=self.jpeg_quality, optimize=True)
+                        self._write(jpg, out.getvalue())
+        except Exception as e:
+            # undecodable or unsupported image: the original stands in for its thumbnails
+            logger.warning("No thumbnails for image %s: %s", key, e)
+
+    def _thumbnail(self, key, size):
+        for path in self._thumbnail_paths(key, size):
+            if os.path.isfile(path):
+                return path
+        return None
+
+    # ---------------- reads ----------------
+    def open_path(self, key, size=None):
+        """
+        (file path, content type) to serve `key` at `size` (a configured
+        thumbnail size, or None for the original); None if the key is unknown.
+        """
+        if not KEY_PATTERN.match(key or "") or not self.exists(key):
+            return None
+        if size is not None and int(size) in self.thumbnail_sizes:
+            thumb = self._thumbnail(key, int(size))
+            if thumb is None:
+                self.ensure_thumbnails(key)
+                thumb = self._thumbnail(key, int(size))
+            if thumb is not None:
+                return thumb, "image/png" if thumb.endswith(".png") else "image/jpeg"
+        path = self.path(key)
+        with open(path, "rb") as f:
+            head = f.read(16)
+        return path, sniff_content_type(head)
+
+    def read(self, key):
+        with open(self.path(key), "rb") as f:
+            return f.read()
+
+
+image_store = ImageStore(settings.IMAGE_STORE_DIR, settings.IMAGE_THUMBNAIL_SIZES)
+
+
+def image_urls(key, fallback_url=None):
+    """
+    URLs of a stored image: the original, one per thumbnail size, and the
+    largest thumbnail as "preview" for list pages. Rows not yet moved to the
+    store (no key) get `fallback_url` for all of them.
+    """
+    from flask import url_for
+
+    if not key:
+        return {"url": fallback_url, "thumbnails": {}, "preview": fallback_url}
+    thumbnails = {
+        str(size): url_for("images.get_image", key=key, size=size)
+        for size in image_store.thumbnail_sizes
+    }
+    url = url_for("images.get_image", key=key)
+    return {"url": url, "thumbnails": thumbnails, "preview": list(thumbnails.values())[-1] if thumbnails else url}
+
+
+# (table, blob column, key column, mime column) of the image blobs kept in the database
+BLOB_COLUMNS = (
+    ("product_image", "image_data", "image_key", "image_mime"),
+    ("design", "image_url", "image_key", "image_mime"),
+)
+
+
+def move_blobs(connection, store=None, batch_size=200):
+    """
+    Move image bytes out of the tables into the store: set each row's key
+    (and content type, when empty) and clear its blob. Runs in batches of
+    `batch_size` rows; safe to re-run. Returns the number of rows moved.
+    """
+    store = store or image_store
+    moved = 0
+    for table_name, blob, key, mime in BLOB_COLUMNS:
+        table = sa.table(table_name, sa.column("id"), sa.column(blob), sa.column(key), sa.column(mime))
+        last_id = 0
+        while True:
+            rows = connection.execute(
+                sa.select(table.c.id, table.c[blob], table.c[mime])
+                .where(table.c.id > last_id, table.c[blob].isnot(None))
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            for row_id, data, content_type in rows:
+                connection.execute(
+                    table.update().where(table.c.id == row_id).values({
+                        key: store.put(bytes(data)),
+                        mime: content_type or sniff_content_type(data),
+                        blob: None,
+                    })
+                )
+            last_id = rows[-1][0]
+            moved += len(rows)
+            logger.info("Moved %d %s images to the image store", moved, table_name)
+    return moved
+
+
+def restore_blobs(connection, store=None, batch_size=200):
+    """Inverse of move_blobs(): copy stored bytes back into the blob columns."""
+    store = store or image_store
+    for table_name, blob, key, _ in BLOB_COLUMNS:
+        table = sa.table(table_name, sa.column("id"), sa.column(blob), sa.column(key))
+        last_id = 0
+        while True:
+            rows = connection.execute(
+                sa.select(table.c.id, table.c[key])
+                .where(table.c.id > last_id, table.c[key].isnot(None))
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            for row_id, image_key in rows:
+                connection.execute(
+                    table.update().where(table.c.id == row_id).values({blob: store.read(image_key)})
+                )
+            last_id = rows[-1][0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="move image blobs from the database into the store")
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        from .. import create_app
+        from ..database import db
+
+        with create_app().app_context():
+            with db.engine.begin() as connection:
+                moved = move_blobs(connection)
+        print(f"moved {moved} images to {image_store.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
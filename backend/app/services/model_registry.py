@@ -0,0 +1,81 @@
+# services/model_registry.py
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """
+    Process-wide, lazily loaded model slot.
+
+    Nothing is loaded at import: the first get() runs `loader` (others block on
+    the lock until it finishes), or warm_up() runs it on a background thread
+    so the first request usually finds it ready.
+    """
+
+    def __init__(self, name, loader):
+        self.name = name
+        self._loader = loader
+        self._value = None
+        self._lock = threading.Lock()
+        self._warmup = None
+
+    def get(self):
+        value = self._value
+        if value is None:
+            with self._lock:
+                if self._value is None:
+                    self._value = self._loader()
+                    logger.info("Model %s loaded", self.name)
+                value = self._value
+        return value
+
+    def is_ready(self):
+        return self._value is not None
+
+    def warm_up(self):
+        """Start loading in a daemon thread (no-op if loaded or already warming)."""
+        if self._value is not None or (self._warmup is not None and self._warmup.is_alive()):
+            return self._warmup
+        self._warmup = threading.Thread(target=self._warm, name=f"warmup-{self.name}", daemon=True)
+        self._warmup.start()
+        return self._warmup
+
+    def _warm(self):
+        try:
+            self.get()
+        except Exception:
+            # surfaced again by the first request that calls get()
+            logger.exception("Warm-up of model %s failed", self.name)
+
+    def set(self, value):
+        """Swap in a new value (tests, hot reload)."""
+        with self._lock:
+            self._value = value
+
+    def replace(self, expected, value):
+        """Swap in `value` only if `expected` is still current; returns whether it did."""
+        with self._lock:
+            if self._value is not expected:
+                return False
+            self._value = value
+            return True
+
+    def reset(self):
+        self.set(None)
+
+
+def _load_recommender():
+    from .recommender_artifact import load_or_build
+    return load_or_build()
+
+
+def _load_esg_model():
+    import joblib
+    from .recommender_artifact import default_paths
+    return joblib.load(default_paths()[1])
+
+
+recommender = ModelRegistry("recommender", _load_recommender)
+esg_model = ModelRegistry("esg", _load_esg_model)
@@ -0,0 +1,133 @@
+# services/plan_cache.py
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple
+from ..config.settings import settings
+
+
+@dataclass(frozen=True)
+class CompiledPlan:
+    """Immutable result of compiling a workflow DSL into a DAG."""
+    step_ids: Tuple[str, ...]
+    order: Tuple[int, ...]                 # topological order, as indices into step_ids
+    preds: Tuple[Tuple[int, ...], ...]     # predecessor indices per step
+    succs: Tuple[Tuple[int, ...], ...]     # successor indices per step
+    entry: FrozenSet[str]                  # steps with no predecessors
+    payload: Any = None                    # caller-specific compiled output (steps, nodes/edges, ...)
+
+    @property
+    def topo_ids(self) -> List[str]:
+        return [self.step_ids[i] for i in self.order]
+
+
+def build_plan(step_ids, edges, payload=None) -> CompiledPlan:
+    """
+    Index the graph and run Kahn's algorithm once.
+    Raises ValueError on unknown dependencies or cycles.
+    """
+    step_ids = tuple(str(s) for s in step_ids)
+    index = {sid: i for i, sid in enumerate(step_ids)}
+    preds = [[] for _ in step_ids]
+    succs = [[] for _ in step_ids]
+    for a, b in edges:
+        a, b = str(a), str(b)
+        if a not in index:
+            raise ValueError(f"step '{b}' depends_on unknown step '{a}'")
+        if b not in index:
+            raise ValueError(f"edge targets unknown step '{b}'")
+        preds[index[b]].append(index[a])
+        succs[index[a]].append(index[b])
+
+    indegree = [len(p) for p in preds]
+    queue = [i for i, d in enumerate(indegree) if d == 0]
+    order = []
+    head = 0
+    while head < len(queue):
+        node = queue[head]
+        head += 1
+        order.append(node)
+        for neigh in succs[node]:
+            indegree[neigh] -= 1
+            if indegree[neigh] == 0:
+                queue.append(neigh)
+    if len(order) != len(step_ids):
+        raise ValueError("Cycle detected in workflow steps")
+
+    return CompiledPlan(
+        step_ids=step_ids,
+        order=tuple(order),
+        preds=tuple(tuple(p) for p in preds),
+        succs=tuple(tuple(s) for s in succs),
+        entry=frozenset(step_ids[i] for i, p in enumerate(preds) if not p),
+        payload=payload,
+    )
+
+
+def plan_key(kind: str, dsl, version=None) -> str:
+    """Content hash of the DSL text (or canonical JSON of a parsed DSL) plus version."""
+    if isinstance(dsl, (bytes, str)):
+        text = dsl if isinstance(dsl, str) else dsl.decode("utf-8")
+    else:
+        text = json.dumps(dsl, sort_keys=True, default=str)
+    h = hashlib.sha256()
+    for part in (kind, str(version), text):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class PlanCache:
+    """Thread-safe LRU of compiled plans keyed by plan_key()."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, CompiledPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        with self._lock:
+            plan = self._entries.get(key)
+            if plan is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return plan
+
+    def put(self, key: str, plan: CompiledPlan):
+        with self._lock:
+            self._entries[key] = plan
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_compile(self, key: str, compile_fn: Callable[[], CompiledPlan]) -> CompiledPlan:
+        plan = self.get(key)
+        if plan is None:
+            # compile outside the lock; a concurrent duplicate compile is harmless
+            plan = compile_fn()
+            self.put(key, plan)
+        return plan
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+plan_cache = PlanCache(maxsize=settings.PLAN_CACHE_SIZE)
+
+
+def cached_plan(kind: str, dsl, version, compile_fn: Callable[[Any], CompiledPlan]) -> CompiledPlan:
+    """Return the compiled plan for (kind, dsl, version), compiling it on a miss."""
+    return plan_cache.get_or_compile(plan_key(kind, dsl, version), lambda: compile_fn(dsl))
@@ -4,13 +4,36 @@ try:
     import yaml
 except Exception:
     yaml = None
+from .plan_cache import build_plan, cached_plan
 
-# services/planner.py
-def parse_dsl(dsl):
+
+def parse_dsl(dsl, version=None):
     """
     Convert DSL (YAML/JSON) into DAG steps format compatible with start_run_from_dag.
     Always returns: {"steps": [...]} or raises exception on invalid DSL.
+    Results are memoized per (DSL content, version); treat them as read-only.
     """
+    return compile_dsl(dsl, version).payload
+
+
+def compile_dsl(dsl, version=None):
+    """Return the cached CompiledPlan for a DSL, compiling it on first use."""
+    return cached_plan("planner", dsl, version, _compile_dsl)
+
+
+def _compile_dsl(dsl):
+    parsed = _parse_dsl(dsl)
+    steps = parsed["steps"]
+    ids = [s.get("step_id", s.get("id")) for s in steps]
+    edges = []
+    for sid, step in zip(ids, steps):
+        depends = step.get("depends_on") or []
+        depends = [depends] if isinstance(depends, str) else depends
+        edges.extend((dep, sid) for dep in depends)
+    return build_plan(ids, edges, payload=parsed)
+
+
+def _parse_dsl(dsl):
 
     # If DSL is a string, try to parse as JSON
     if isinstance(dsl, str):
@@ -0,0 +1,324 @@
+# services/product_import.py
+"""
+Bulk product import from a CSV or JSONL manifest plus a directory of images.
+
+    python -m backend.app.services.product_import brand.csv --images brand_images/ --user-id 1
+
+One manifest row per product. Columns (JSONL keys) follow POST /product:
+title (or product_name), category, description, brand, sale_price,
+discount, sizes, colors, tags, visibility, publish_date (YYYY-MM-DD),
+water_use, carbon_emission, ethical_rating, material, and images: image
+file names relative to the image directory, ";"-separated in CSV or a list
+in JSONL.
+
+Rows are read as a stream and imported in chunks. Each chunk is validated,
+its images copied into the image store, ESG-scored with one model call,
+bulk-inserted and committed together with the job's counters, so an
+interrupted job resumes after its last committed chunk. Invalid rows are counted and skipped, not fatal.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import insert, update
+from ..config.settings import settings
+from ..database import db
+from ..models import Product, ProductImage, ProductImport
+from ..utils.esg_module import compute_esg_scores
+from .catalog_index import catalog_index
+from .image_store import image_store, sniff_content_type
+from .query_cache import query_cache
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FIELDS = ("title", "category", "description")
+# same minimum as POST /product
+MIN_IMAGES = 4
+IMAGE_SEPARATOR = ";"
+# rejected rows kept on the job for the report; the rest are only counted
+MAX_RECORDED_ERRORS = 100
+
+
+class RowError(ValueError):
+    """A manifest row that cannot be imported."""
+
+
+def resolve_under(root, name):
+    """`name` resolved inside `root`; ValueError if it escapes it."""
+    root = os.path.realpath(root)
+    path = os.path.realpath(os.path.join(root, name))
+    if path != root and not path.startswith(root + os.sep):
+        raise ValueError(f"{name!r} is outside {root}")
+    return path
+
+
+def manifest_fingerprint(path, block_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest(path):
+    """Stream the manifest's rows as dicts (JSONL if the file ends in .jsonl/.ndjson, else CSV)."""
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        yield {"__error__": f"invalid JSON: {e}"}
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+
+def _text(row, *names):
+    for name in names:
+        value = row.get(name)
+        if value not in (None, ""):
+            return value if isinstance(value, str) else str(value)
+    return None
+
+
+def _listed(row, *names):
+    value = next((row[n] for n in names if row.get(n) not in (None, "")), None)
+    if isinstance(value, list):
+        return ",".join(str(v) for v in value)
+    return value
+
+
+def _number(row, name):
+    value = row.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise RowError(f"{name} is not a number: {value!r}")
+
+
+def parse_row(row, image_dir, min_images=MIN_IMAGES):
+    """Validate one manifest row: (Product column values, ESG inputs, image paths)."""
+    if not isinstance(row, dict):
+        raise RowError("expected an object")
+    if "__error__" in row:
+        raise RowError(row["__error__"])
+    fields = {
+        "title": _text(row, "title", "product_name"),
+        "category": _text(row, "category"),
+        "description": _text(row, "description"),
+    }
+    missing = [name for name in REQUIRED_FIELDS if not fields[name]]
+    if missing:
+        raise RowError(f"missing {', '.join(missing)}")
+
+    publish_date = _text(row, "publish_date", "schedule_date")
+    try:
+        publish_date = datetime.strptime(publish_date, "%Y-%m-%d").date() if publish_date else None
+    except ValueError:
+        raise RowError(f"publish_date is not YYYY-MM-DD: {publish_date!r}")
+    fields.update(
+        brand=_text(row, "brand"),
+        sale_price=_number(row, "sale_price"),
+        discount=_number(row, "discount"),
+        sizes=_listed(row, "sizes", "size"),
+        colors=_listed(row, "colors", "color"),
+        tags=_listed(row, "tags", "tag"),
+        visibility=_text(row, "visibility") or "Published",
+        publish_date=publish_date,
+    )
+    esg = {
+        "water_use": _number(row, "water_use") or 0,
+        "carbon_emission": _number(row, "carbon_emission") or 0,
+        "ethical_rating": _number(row, "ethical_rating") or 0,
+        "material": _text(row, "material") or "",
+    }
+
+    images = row.get("images") or []
+    if isinstance(images, str):
+        images = [name.strip() for name in images.split(IMAGE_SEPARATOR) if name.strip()]
+    if len(images) < min_images:
+        raise RowError(f"at least {min_images} images are required, got {len(images)}")
+    paths = []
+    for name in images:
+        try:
+            path = resolve_under(image_dir, str(name))
+        except ValueError as e:
+            raise RowError(str(e))
+        if not os.path.isfile(path):
+            raise RowError(f"image not found: {name}")
+        paths.append(path)
+    return fields, esg, paths
+
+
+def _store_image(path):
+    """Copy an image file into the image store: (key, content type)."""
+    with open(path, "rb") as f:
+        head = f.read(16)
+    if not head:
+        raise RowError(f"empty image file: {os.path.basename(path)}")
+    return image_store.put_file(path), sniff_content_type(head, "image/jpeg")
+
+
+def start_import(manifest, image_dir, user_id):
+    """
+    The job for this manifest: the user's unfinished job on the same file
+    contents (resumed), or a new one.
+    """
+    fingerprint = manifest_fingerprint(manifest)
+    job = (
+        ProductImport.query
+        .filter_by(fingerprint=fingerprint, user_id=user_id)
+        .filter(ProductImport.status != "completed")
+        .order_by(ProductImport.id.desc())
+        .first()
+    )
+    if job is None:
+        job = ProductImport(manifest=os.path.abspath(manifest), image_dir=os.path.abspath(image_dir),
+                            fingerprint=fingerprint, user_id=user_id, status="pending",
+                            rows_done=0, inserted=0, rejected=0, errors=[])
+        db.session.add(job)
+    else:
+        job.manifest, job.image_dir = os.path.abspath(manifest), os.path.abspath(image_dir)
+    db.session.commit()
+    return job
+
+
+def run_import(job_id, chunk_size=None, progress=None, min_images=MIN_IMAGES):
+    """
+    Import the job's manifest from `rows_done` on. `progress(job)` is called
+    after every committed chunk. Returns the job; it is left "failed" (and
+    the error re-raised) if a chunk cannot be committed.
+    """
+    chunk_size = chunk_size or settings.PRODUCT_IMPORT_CHUNK_SIZE
+    job = db.session.get(ProductImport, job_id)
+    if job is None:
+        raise LookupError(f"Product import {job_id} not found")
+    if job.status == "completed":
+        return job
+    job.status, job.error = "running", None
+    db.session.commit()
+
+    rows = islice(read_manifest(job.manifest), job.rows_done, None)
+    try:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            if not _import_chunk(job, chunk, min_images):
+                logger.warning("Product import %s was advanced by another worker; stopping", job.id)
+                db.session.refresh(job)
+                return job
+            logger.info("Product import %s: %d rows, %d inserted, %d rejected",
+                        job.id, job.rows_done, job.inserted, job.rejected)
+            if progress:
+                progress(job)
+    except Exception as e:
+        db.session.rollback()
+        job.status, job.error = "failed", str(e)
+        db.session.commit()
+        raise
+
+    job.status = "completed"
+    db.session.commit()
+    _publish(job)
+    return job
+
+
+def _import_chunk(job, chunk, min_images):
+    """Insert one chunk and advance the job in one transaction; False if the job moved meanwhile."""
+    first_row = job.rows_done + 1
+    parsed, errors = [], []
+    for number, row in enumerate(chunk, start=first_row):
+        try:
+            fields, esg, paths = parse_row(row, job.image_dir, min_images)
+            parsed.append((fields, esg, [_store_image(p) for p in paths]))
+        except (RowError, OSError) as e:
+            errors.append({"row": number, "error": str(e)})
+
+    try:
+        scores = compute_esg_scores([esg for _, esg, _ in parsed])
+    except Exception as e:
+        # same fallback as POST /product
+        logger.warning("ESG scoring failed for product import %s (%s); scoring 0.0", job.id, e)
+        scores = [0.0] * len(parsed)
+
+    # claim the rows first: a second runner on the same job matches nothing here and backs off
+    claimed = db.session.execute(
+        update(ProductImport)
+        .where(ProductImport.id == job.id, ProductImport.rows_done == job.rows_done)
+        .values(
+            rows_done=job.rows_done + len(chunk),
+            inserted=job.inserted + len(parsed),
+            rejected=job.rejected + len(errors),
+            errors=(job.errors or []) + errors[:max(0, MAX_RECORDED_ERRORS - len(job.errors or []))],
+            updated_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not claimed:
+        db.session.rollback()
+        return False
+
+    if parsed:
+        product_rows = [
+            dict(fields, user_id=job.user_id, esg_score=score, likes=0, views=0)
+            for (fields, _, _), score in zip(parsed, scores)
+        ]
+        ids = db.session.execute(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True), product_rows
+        ).scalars().all()
+        db.session.execute(insert(ProductImage), [
+            {"product_id": product_id, "image_key": key, "image_mime": mime}
+            for product_id, (_, _, images) in zip(ids, parsed)
+            for key, mime in images
+        ])
+    db.session.commit()
+    db.session.refresh(job)
+    return True
+
+
+def _publish(job):
+    """Make the job's products visible to recommendations and drop cached results."""
+    ids = [
+        pid for (pid,) in db.session.query(Product.id)
+        .filter(Product.user_id == job.user_id, Product.created_at >= job.created_at)
+        .order_by(Product.id)
+    ]
+    # one delta rebuild for the whole job; the indexer batches its own IN (...) queries
+    catalog_index.products_changed(ids)
+    query_cache.bump_product_version()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", help="CSV or JSONL manifest")
+    parser.add_argument("--images", required=True, help="directory the manifest's image names are relative to")
+    parser.add_argument("--user-id", type=int, required=True, help="owner of the imported products")
+    parser.add_argument("--chunk-size", type=int, help="rows per committed chunk")
+    args = parser.parse_args(argv)
+
+    from .. import create_app
+
+    with create_app().app_context():
+        job = start_import(args.manifest, args.images, args.user_id)
+        if job.rows_done:
+            print(f"resuming import {job.id} after row {job.rows_done}")
+        job = run_import(job.id, args.chunk_size, progress=lambda j: print(
+            f"import {j.id}: {j.rows_done} rows, {j.inserted} inserted, {j.rejected} rejected", flush=True))
+        for error in job.errors or []:
+            print(f"row {error['row']}: {error['error']}")
+        print(f"import {job.id} {job.status}: {job.inserted} inserted, {job.rejected} rejected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
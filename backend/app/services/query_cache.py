@@ -0,0 +1,147 @@
+# services/query_cache.py
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+import redis
+from ..config.settings import settings
+from ..metrics import QUERY_CACHE_COUNTER
+
+logger = logging.getLogger(__name__)
+
+# Redis key holding the product-table version, bumped by product_routes on every write
+PRODUCT_VERSION_KEY = "catalog:product_version"
+
+
+def normalize_query(text):
+    """Case- and whitespace-insensitive form of a free-text query."""
+    return " ".join(str(text).lower().split())
+
+
+class QueryCache:
+    """
+    Two-tier cache of recommendation results.
+
+    Tier 1 is a per-process LRU; tier 2 (optional) is Redis, shared by every
+    worker. Keys combine the endpoint, the normalized query, k and the
+    catalog version: the serving engine's version (changes when a new
+    artifact is loaded) plus the product-table version (bumped through
+    bump_product_version() when products change). A version change makes
+    old entries unreachable; they age out of the LRU and expire in Redis.
+
+    Other workers pick up a product-version bump within `version_ttl`
+    seconds, the time the version read from Redis is trusted locally. When
+    Redis fails it is skipped for `redis_retry` seconds and only the local
+    tier is used.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300, redis_url=None, version_ttl=1.0, redis_retry=30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version_ttl = version_ttl
+        self.redis_retry = redis_retry
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._redis = (
+            redis.from_url(redis_url, socket_connect_timeout=0.2, socket_timeout=0.2) if redis_url else None
+        )
+        self._redis_down_until = 0.0
+        self._product_version = 0
+        self._product_version_read = 0.0
+
+    # ---------------- versions ----------------
+    def product_version(self):
+        now = time.monotonic()
+        if now - self._product_version_read >= self.version_ttl:
+            value = self._call_redis(lambda r: r.get(PRODUCT_VERSION_KEY))
+            if value is not None:
+                self._product_version = max(self._product_version, int(value))
+            self._product_version_read = now
+        return self._product_version
+
+    def bump_product_version(self):
+        """Invalidate every cached result that depends on the Product table."""
+        value = self._call_redis(lambda r: r.incr(PRODUCT_VERSION_KEY))
+        with self._lock:
+            self._product_version = max(self._product_version + 1, int(value or 0))
+            self._product_version_read = time.monotonic()
+            self._entries.clear()
+
+    def key(self, endpoint, query, k, engine_version):
+        digest = hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()
+        return f"reccache:{endpoint}:{engine_version}:{self.product_version()}:{k}:{digest}"
+
+    # ---------------- lookups ----------------
+    def get(self, key):
+        if not self.maxsize:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                QUERY_CACHE_COUNTER.labels(tier="local", result="hit").inc()
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        QUERY_CACHE_COUNTER.labels(tier="local", result="miss").inc()
+
+        raw = self._call_redis(lambda r: r.get(key))
+        if raw is None:
+            if self._redis_available():
+                QUERY_CACHE_COUNTER.labels(tier="redis", result="miss").inc()
+            return None
+        QUERY_CACHE_COUNTER.labels(tier="redis", result="hit").inc()
+        value = json.loads(raw)
+        self._put_local(key, value)
+        return value
+
+    def put(self, key, value):
+        if not self.maxsize:
+            return
+        self._put_local(key, value)
+        payload = json.dumps(value, default=str)
+        self._call_redis(lambda r: r.set(key, payload, ex=int(self.ttl)))
+
+    def get_or_compute(self, key, compute_fn):
+        value = self.get(key)
+        if value is None:
+            # computed outside the lock; concurrent duplicate work is harmless
+            value = compute_fn()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _put_local(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    # ---------------- Redis tier ----------------
+    def _redis_available(self):
+        return self._redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _call_redis(self, fn):
+        if not self._redis_available():
+            return None
+        try:
+            return fn(self._redis)
+        except redis.RedisError as e:
+            logger.warning("Query cache Redis unavailable (%s); local tier only for %.0fs", e, self.redis_retry)
+            self._redis_down_until = time.monotonic() + self.redis_retry
+            return None
+
+
+query_cache = QueryCache(
+    maxsize=settings.QUERY_CACHE_SIZE,
+    ttl=settings.QUERY_CACHE_TTL,
+    redis_url=settings.REDIS_URL if settings.QUERY_CACHE_REDIS else None,
+    version_ttl=settings.QUERY_CACHE_VERSION_TTL,
+)
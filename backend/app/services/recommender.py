@@ -0,0 +1,207 @@
+# services/recommender.py
+import itertools
+import numpy as np
+
+# Score = 0.6 * text similarity + 0.2 * category + 0.2 * color
+WEIGHT_TEXT = 0.6
+WEIGHT_CATEGORY = 0.2
+WEIGHT_COLOR = 0.2
+
+# ESG re-ranking: eco boosts and the minimum score to be recommended at all
+ESG_BOOSTS = ((85, 1.2), (70, 1.1))  # (min esg_score, multiplier), highest first
+ESG_MIN_SCORE = 50
+
+# Products ranked by the query-independent score alone, kept per engine so
+# index-based retrieval stays exact for products sharing no term with the query
+STATIC_HEAD_SIZE = 1024
+
+_local_versions = itertools.count(1)
+
+# Response field -> catalog column
+RESULT_COLUMNS = {
+    "product_id": "product_id",
+    "title": "title",
+    "description": "descriptions",
+    "category": "category",
+    "color": "color",
+    "image_url": "image_url",
+}
+
+
+def top_k(scores, k):
+    """
+    Indices of the k highest scores, best first, in O(n + k log k).
+    Equal scores keep catalog order, like a stable descending sort.
+    """
+    n = scores.shape[0]
+    k = min(int(k), n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        # argpartition picks arbitrarily among ties at the k-th score; take the earliest rows
+        kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > kth)
+        idx = np.concatenate([above, np.flatnonzero(scores == kth)[:k - above.size]])
+    else:
+        idx = np.arange(n)
+    return idx[np.lexsort((idx, -scores[idx]))]
+
+
+class RecommendationEngine:
+    """
+    Serving-side view of the recommender catalog.
+
+    Everything that does not depend on the query is computed once here: the
+    static category/color component of the score and one NumPy array per
+    response column. A request then costs one sparse mat-vec for the text
+    similarity, an argpartition for the top k, and k fancy-index reads.
+
+    With a retrieval `index` (see services/retrieval.py) only the products
+    the index returns, plus the best products by static score, are scored
+    instead of the whole catalog.
+
+    The arrays may be read-only memory maps (see recommender_artifact.load),
+    so nothing here writes to them.
+    """
+
+    def __init__(self, columns, static_scores, vectorizer, tfidf_matrix, esg_scores=None, esg_badges=None,
+                 similarities=None, index=None, version=None):
+        self.columns = columns
+        self.product_ids = columns["product_id"]
+        self.size = len(self.product_ids)
+        self.static_scores = static_scores
+        self.vectorizer = vectorizer
+        self.tfidf_matrix = tfidf_matrix.tocsr()
+        # dense item-item matrix; kept for the artifact, not used when scoring
+        self.similarities = similarities
+        self.index = index
+        # identifies this catalog snapshot in cache keys; artifacts pass a digest shared by all workers
+        self.version = version or f"local-{next(_local_versions)}"
+        self.static_head = top_k(static_scores, STATIC_HEAD_SIZE)
+        self.row_by_id = {pid: row for row, pid in enumerate(self.product_ids.tolist())}
+
+        # ESG stage: per-row multiplier and eligibility mask, fixed for the catalog's lifetime
+        self.esg_scores = esg_scores
+        self.esg_badges = esg_badges
+        if esg_scores is not None:
+            self.esg_multiplier = np.select(
+                [esg_scores >= threshold for threshold, _ in ESG_BOOSTS],
+                [boost for _, boost in ESG_BOOSTS],
+                default=1.0,
+            )
+            # unscored products (NaN) get no boost but are not filtered out
+            self.esg_eligible = (esg_scores >= ESG_MIN_SCORE) | np.isnan(esg_scores)
+            esg_static = np.where(self.esg_eligible, static_scores * self.esg_multiplier, -np.inf)
+            self.esg_static_head = top_k(esg_static, min(STATIC_HEAD_SIZE, int(self.esg_eligible.sum())))
+        else:
+            self.esg_multiplier = self.esg_eligible = self.esg_static_head = None
+
+    @classmethod
+    def from_catalog(cls, catalog, similarities, vectorizer, tfidf_matrix, index=None):
+        """Build from the training DataFrame and the dense item-item similarity matrix."""
+        # category and color similarity both come from the combined item-item matrix
+        item_affinity = np.asarray(similarities).max(axis=1)
+        static_scores = (WEIGHT_CATEGORY * item_affinity + WEIGHT_COLOR * item_affinity).astype(np.float64)
+        columns = {key: catalog[col].to_numpy() for key, col in RESULT_COLUMNS.items()}
+        esg_scores = esg_badges = None
+        if "esg_score" in catalog:
+            esg_scores = catalog["esg_score"].to_numpy(dtype=np.float64)
+            esg_badges = catalog["esg_badge"].to_numpy()
+        return cls(columns, static_scores, vectorizer, tfidf_matrix, esg_scores, esg_badges,
+                   similarities=np.asarray(similarities), index=index)
+
+    def text_scores(self, query):
+        """Cosine similarity of the query against every product (TF-IDF rows are L2-normalized)."""
+        query_vector = self.vectorizer.transform([query])
+        return (self.tfidf_matrix @ query_vector.T).toarray().ravel()
+
+    def score(self, query):
+        return WEIGHT_TEXT * self.text_scores(query) + self.static_scores
+
+    def candidates(self, query, head):
+        """
+        Rows worth scoring for `query` and their text similarity: the index's
+        matches plus `head`, the best rows by static score. Rows left out
+        score no higher than these, so the top len(head) stay exact when the
+        index returns every textual match. Returns None without an index.
+        """
+        if self.index is None:
+            return None
+        rows, text = self.index.search(self.vectorizer.transform([query]))
+        extra = np.setdiff1d(head, rows, assume_unique=True)
+        rows = np.concatenate([rows, extra])
+        text = np.concatenate([text, np.zeros(extra.size)])
+        order = np.argsort(rows, kind="stable")  # catalog order, so ties break like a full scan
+        return rows[order], text[order]
+
+    @staticmethod
+    def _head(head, k, exclude):
+        """First k rows of a static head that are not excluded; None (full scan) if fewer remain."""
+        if exclude is not None:
+            head = head[~exclude[head]]
+        return head[:k] if k <= head.size else None
+
+    def recommend(self, query, k, exclude=None):
+        """
+        Return (row indices, scores) of the k best products for `query`.
+        Rows set in the boolean mask `exclude` are never returned.
+        """
+        head = self._head(self.static_head, k, exclude)
+        found = self.candidates(query, head) if head is not None else None
+        if found is None:
+            scores = self.score(query)
+            if exclude is not None:
+                scores[exclude] = -np.inf
+            idx = top_k(scores, k)
+            if exclude is not None:
+                idx = idx[~exclude[idx]]
+            return idx, scores[idx]
+        rows, text = found
+        if exclude is not None:
+            keep = ~exclude[rows]
+            rows, text = rows[keep], text[keep]
+        scores = WEIGHT_TEXT * text + self.static_scores[rows]
+        best = top_k(scores, k)
+        return rows[best], scores[best]
+
+    def recommend_esg(self, query, k, exclude=None):
+        """
+        Like recommend(), re-ranked by ESG: boosted scores, and products below
+        ESG_MIN_SCORE never returned. May return fewer than k rows.
+        """
+        if self.esg_multiplier is None:
+            raise ValueError("catalog has no ESG columns")
+        head = self._head(self.esg_static_head, k, exclude)
+        found = self.candidates(query, head) if head is not None else None
+        if found is None:
+            rows = np.arange(self.size)
+            scores = self.score(query) * self.esg_multiplier
+        else:
+            rows, text = found
+            scores = (WEIGHT_TEXT * text + self.static_scores[rows]) * self.esg_multiplier[rows]
+        eligible = self.esg_eligible[rows]
+        if exclude is not None:
+            eligible = eligible & ~exclude[rows]
+        best = top_k(np.where(eligible, scores, -np.inf), k)
+        best = best[eligible[best]]
+        return rows[best], scores[best]
+
+    def row_of(self, product_id):
+        """Catalog row of `product_id` (string or int), or None."""
+        return self.row_by_id.get(str(product_id).strip())
+
+    def esg_of(self, row):
+        """(ESG score, badge) of catalog row `row`; the score is None for unscored products."""
+        score = float(self.esg_scores[row])
+        return (None if np.isnan(score) else score), str(self.esg_badges[row])
+
+    def sample(self, k, rng=None):
+        """k random distinct rows (fallback when nothing matches)."""
+        rng = rng or np.random.default_rng()
+        return rng.choice(self.size, size=min(int(k), self.size), replace=False)
+
+    def rows(self, idx, scores=None):
+        """Materialize result dicts for rows `idx` from the columnar arrays."""
+        fields = {key: col[idx].tolist() for key, col in self.columns.items()}
+        fields["score"] = [0.0] * len(idx) if scores is None else [float(s) for s in scores]
+        return [dict(zip(fields, values)) for values in zip(*fields.values())]
@@ -0,0 +1,302 @@
+# services/recommender_artifact.py
+"""
+Build and load the on-disk recommender artifact.
+
+Every array is a plain .npy file opened with np.load(mmap_mode='r'), so all
+worker processes on a box map the same pages from the OS page cache instead
+of each holding a private copy of the catalog, TF-IDF and similarity matrix:
+
+    columns/<field>.offsets.npy, columns/<field>.utf8.npy
+                             response columns: row i is utf8[offsets[i]:offsets[i+1]]
+    esg_badges.npy           fixed-width unicode (a handful of short labels)
+    tfidf_{data,indices,indptr}.npy   CSR components of the TF-IDF matrix
+    postings_{indptr,rows,weights}.npy   inverted index over the TF-IDF terms
+    static_scores.npy, esg_scores.npy, similarities.npy
+    vectorizer.joblib        the fitted TfidfVectorizer (vocabulary + idf)
+    meta.json                source signature, row count, TF-IDF shape
+
+Build it ahead of time (e.g. in the image or before starting gunicorn):
+
+    python -m backend.app.services.recommender_artifact build
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from ..config.settings import settings
+from ..utils.esg_utils import generate_esg_columns, compute_esg_score
+from .recommender import RecommendationEngine
+from .retrieval import InvertedIndex, build_index
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout or the build output changes; older artifacts are rebuilt
+ARTIFACT_VERSION = 5
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+
+def default_paths():
+    """(recommender pickle, ESG model, artifact directory) from settings or the repo's models/ dir."""
+    models_dir = os.path.join(_REPO_ROOT, 'models')
+    return (
+        settings.RECOMMENDER_MODEL_PATH or os.path.join(models_dir, 'new_recommender_model.pkl'),
+        settings.ESG_MODEL_PATH or os.path.join(models_dir, 'esg_model.pkl'),
+        settings.RECOMMENDER_ARTIFACT_DIR or os.path.join(models_dir, 'recommender_artifact'),
+    )
+
+
+def source_signature(*paths):
+    """Identity of the source files an artifact was built from (path, mtime, size)."""
+    sig = []
+    for path in paths:
+        st = os.stat(path)
+        sig.append([os.path.basename(path), st.st_mtime_ns, st.st_size])
+    return {"version": ARTIFACT_VERSION, "sources": sig}
+
+
+def build_engine(model_path, esg_model_path):
+    """
+    The expensive path: unpickle the catalog, fit TF-IDF and compute ESG
+    columns, then precompute the serving arrays.
+    """
+    with open(model_path, 'rb') as f:
+        model_data = pickle.load(f)
+    df = model_data['df']
+    similarities = model_data['similarities']
+
+    df['product_id'] = df['product_id'].astype(str).str.strip()
+    df['combined_text'] = df['title'] + " " + df['descriptions']
+
+    # TF-IDF is only needed to project new user text into the catalog's space
+    tfidf = TfidfVectorizer(stop_words='english')
+    tfidf_matrix = tfidf.fit_transform(df['combined_text'])
+
+    df = generate_esg_columns(df)
+    df = compute_esg_score(df, joblib.load(esg_model_path))
+
+    return RecommendationEngine.from_catalog(df, similarities, tfidf, tfidf_matrix, configured_index(tfidf_matrix))
+
+
+def configured_index(tfidf_matrix, postings=None):
+    """Retrieval index chosen by RECOMMENDER_INDEX; `postings` reuses saved inverted-index arrays."""
+    kind = settings.RECOMMENDER_INDEX
+    if kind == "inverted" and postings is not None:
+        return InvertedIndex(postings["indptr"], postings["rows"], postings["weights"],
+                             settings.RECOMMENDER_MAX_POSTINGS)
+    return build_index(
+        kind,
+        tfidf_matrix,
+        max_postings=settings.RECOMMENDER_MAX_POSTINGS,
+        n_lists=settings.RECOMMENDER_IVF_LISTS,
+        n_probe=settings.RECOMMENDER_IVF_PROBE,
+    )
+
+
+class TextColumn:
+    """
+    Read-only string column stored as one UTF-8 byte blob plus row offsets
+    (int64, one more than the rows). Both may be memory maps; a row costs its
+    own bytes, unlike a fixed-width 'U' array where every row costs 4 bytes
+    times the longest value. Indexing with an array returns an object array,
+    so engine code reads it like the in-memory columns.
+    """
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    @classmethod
+    def from_values(cls, values):
+        values = pd.Series(values, dtype=object)
+        encoded = [v.encode("utf-8") for v in values.where(values.notna(), "").astype(str)]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _value(self, row):
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return self.data[start:end].tobytes().decode("utf-8")
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            rows = np.arange(len(self))[idx]
+        elif np.ndim(idx) == 0:
+            return self._value(int(idx))
+        else:
+            rows = np.asarray(idx, dtype=np.intp)
+        return np.array([self._value(int(row)) for row in rows], dtype=object)
+
+    def tolist(self):
+        blob = self.data.tobytes()
+        bounds = self.offsets.tolist()
+        return [blob[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+
+
+def _fixed_width(values):
+    """Object/str column -> fixed-width unicode array (missing values become "")."""
+    values = pd.Series(values, dtype=object)
+    return values.where(values.notna(), "").astype(str).to_numpy(dtype=str)
+
+
+def save(engine, artifact_dir, signature):
+    """
+    Persist the precomputed engine. Written to a temp dir and renamed into
+    place, so concurrent workers never see a half-written artifact; workers
+    still mapping a replaced artifact keep reading the unlinked files.
+    """
+    parent = os.path.dirname(os.path.abspath(artifact_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix='.recommender_artifact.', dir=parent)
+    try:
+        # mkdtemp makes it 0700; workers may run as a different user than the build
+        os.chmod(tmp, 0o755)
+        os.mkdir(os.path.join(tmp, 'columns'))
+        for key, values in engine.columns.items():
+            text = values if isinstance(values, TextColumn) else TextColumn.from_values(values)
+            np.save(os.path.join(tmp, 'columns', f'{key}.offsets.npy'), text.offsets)
+            np.save(os.path.join(tmp, 'columns', f'{key}.utf8.npy'), text.data)
+
+        tfidf = engine.tfidf_matrix
+        for part in ('data', 'indices', 'indptr'):
+            np.save(os.path.join(tmp, f'tfidf_{part}.npy'), getattr(tfidf, part))
+        postings = engine.index if isinstance(engine.index, InvertedIndex) else InvertedIndex.from_matrix(tfidf)
+        for part, values in postings.arrays.items():
+            np.save(os.path.join(tmp, f'postings_{part}.npy'), values)
+        np.save(os.path.join(tmp, 'static_scores.npy'), engine.static_scores)
+        if engine.esg_scores is not None:
+            np.save(os.path.join(tmp, 'esg_scores.npy'), engine.esg_scores)
+            np.save(os.path.join(tmp, 'esg_badges.npy'), _fixed_width(engine.esg_badges))
+        if engine.similarities is not None:
+            np.save(os.path.join(tmp, 'similarities.npy'), np.asarray(engine.similarities))
+        joblib.dump(engine.vectorizer, os.path.join(tmp, 'vectorizer.joblib'))
+
+        with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+            json.dump({
+                **signature,
+                "size": engine.size,
+                "columns": list(engine.columns),
+                "tfidf_shape": list(tfidf.shape),
+            }, f)
+
+        old = None
+        if os.path.exists(artifact_dir):
+            old = f"{artifact_dir}.old.{os.getpid()}"
+            os.replace(artifact_dir, old)
+        os.replace(tmp, artifact_dir)
+        if old:
+            shutil.rmtree(old, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def load(artifact_dir, signature=None, mmap=True):
+    """
+    Load a saved engine with its arrays memory-mapped read-only (mmap=False
+    reads them into private memory). Returns None if missing or built from
+    other sources.
+    """
+    meta_path = os.path.join(artifact_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if signature is not None and {k: meta.get(k) for k in signature} != signature:
+        return None
+
+    mmap_mode = 'r' if mmap else None
+
+    def array(name):
+        path = os.path.join(artifact_dir, name)
+        return np.load(path, mmap_mode=mmap_mode) if os.path.exists(path) else None
+
+    columns = {
+        key: TextColumn(array(os.path.join('columns', f'{key}.offsets.npy')),
+                        array(os.path.join('columns', f'{key}.utf8.npy')))
+        for key in meta["columns"]
+    }
+    tfidf = sparse.csr_matrix(
+        (array('tfidf_data.npy'), array('tfidf_indices.npy'), array('tfidf_indptr.npy')),
+        shape=tuple(meta["tfidf_shape"]),
+        copy=False,
+    )
+    postings = {part: array(f'postings_{part}.npy') for part in ('indptr', 'rows', 'weights')}
+    return RecommendationEngine(
+        columns,
+        array('static_scores.npy'),
+        joblib.load(os.path.join(artifact_dir, 'vectorizer.joblib')),
+        tfidf,
+        array('esg_scores.npy'),
+        array('esg_badges.npy'),
+        similarities=array('similarities.npy'),
+        index=configured_index(tfidf, postings),
+        version=hashlib.sha1(json.dumps(meta, sort_keys=True).encode()).hexdigest()[:12],
+    )
+
+
+def build(model_path=None, esg_model_path=None, artifact_dir=None):
+    """Rebuild the artifact from the source pickle unconditionally; returns the artifact dir."""
+    model_path, esg_model_path, artifact_dir = _resolve(model_path, esg_model_path, artifact_dir)
+    signature = source_signature(model_path, esg_model_path)
+    save(build_engine(model_path, esg_model_path), artifact_dir, signature)
+    return artifact_dir
+
+
+def _resolve(model_path, esg_model_path, artifact_dir):
+    defaults = default_paths()
+    return model_path or defaults[0], esg_model_path or defaults[1], artifact_dir or defaults[2]
+
+
+def load_or_build(model_path=None, esg_model_path=None, artifact_dir=None):
+    """Serve from the artifact when it matches the sources; otherwise rebuild and persist it."""
+    model_path, esg_model_path, artifact_dir = _resolve(model_path, esg_model_path, artifact_dir)
+    signature = source_signature(model_path, esg_model_path)
+    try:
+        engine = load(artifact_dir, signature)
+    except Exception:
+        logger.exception("Recommender artifact at %s is unreadable; rebuilding", artifact_dir)
+        engine = None
+    if engine is not None:
+        return engine
+
+    engine = build_engine(model_path, esg_model_path)
+    try:
+        save(engine, artifact_dir, signature)
+    except OSError:
+        logger.exception("Could not persist recommender artifact to %s", artifact_dir)
+        return engine
+    # serve the mapped copy so this worker shares pages with the others
+    return load(artifact_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recommender artifact tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="build the memory-mappable artifact from the model pickle")
+    build_cmd.add_argument("--model", help="recommender pickle (default: settings / models/)")
+    build_cmd.add_argument("--esg-model", help="ESG model (default: settings / models/)")
+    build_cmd.add_argument("--out", help="artifact directory (default: settings / models/recommender_artifact)")
+    args = parser.parse_args(argv)
+
+    artifact_dir = build(args.model, args.esg_model, args.out)
+    engine = load(artifact_dir)
+    print(f"Built recommender artifact at {artifact_dir} ({engine.size} products)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# services/retrieval.py
+import numpy as np
+from scipy import sparse
+
+# Retrieval indexes for RecommendationEngine: given a TF-IDF query vector,
+# return the catalog rows worth scoring and their text similarity, instead
+# of taking the dot product with every product. search() returns
+# (rows, text_scores) with rows unique and ascending; rows left out are
+# treated as text similarity 0.
+
+
+def _gather(starts, ends):
+    """Flat positions covering [starts[i], ends[i]) for every i, without a Python loop."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=np.intp), lengths
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return offsets + np.arange(total), lengths
+
+
+class InvertedIndex:
+    """
+    Term -> postings (catalog rows with that term), impact-ordered.
+
+    A query only touches the postings of its own terms, so its cost is the
+    number of matching (term, product) pairs rather than the catalog size.
+    With max_postings=None the text scores are exact; otherwise only the
+    max_postings highest-weighted products per term are considered, trading
+    recall for a bounded cost on very common terms.
+    """
+
+    kind = "inverted"
+
+    def __init__(self, indptr, rows, weights, max_postings=None):
+        self.indptr = indptr
+        self.rows = rows
+        self.weights = weights
+        self.max_postings = max_postings or None
+
+    @classmethod
+    def from_matrix(cls, tfidf_matrix, max_postings=None):
+        by_term = sparse.csc_matrix(tfidf_matrix)
+        by_term.sort_indices()
+        terms = np.repeat(np.arange(by_term.shape[1]), np.diff(by_term.indptr))
+        # within each term, highest weight first (ties keep catalog order)
+        order = np.lexsort((by_term.indices, -by_term.data, terms))
+        return cls(by_term.indptr.copy(), by_term.indices[order], by_term.data[order], max_postings)
+
+    @property
+    def arrays(self):
+        """Arrays persisted in the recommender artifact."""
+        return {"indptr": self.indptr, "rows": self.rows, "weights": self.weights}
+
+    def search(self, query_vector):
+        query_vector = sparse.csr_matrix(query_vector)
+        terms, term_weights = query_vector.indices, query_vector.data
+        starts, ends = self.indptr[terms], self.indptr[terms + 1]
+        if self.max_postings:
+            ends = np.minimum(ends, starts + self.max_postings)
+        positions, lengths = _gather(starts, ends)
+        if not positions.size:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        rows, inverse = np.unique(self.rows[positions], return_inverse=True)
+        contributions = self.weights[positions] * np.repeat(term_weights, lengths)
+        return rows, np.bincount(inverse, weights=contributions, minlength=rows.size)
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index over dense LSA embeddings of the TF-IDF rows.
+
+    Products are clustered into n_lists k-means cells; a query is embedded,
+    the n_probe nearest cells are scanned, and their members are re-scored
+    with the exact sparse TF-IDF similarity. Unlike InvertedIndex this also
+    catches products that share no literal term with the query, but may miss
+    matches in unprobed cells.
+    """
+
+    kind = "ivf"
+
+    def __init__(self, tfidf_matrix, svd, centroids, list_indptr, list_rows, n_probe):
+        self.tfidf_matrix = tfidf_matrix
+        self.svd = svd
+        self.centroids = centroids
+        self.list_indptr = list_indptr
+        self.list_rows = list_rows
+        self.n_probe = n_probe
+
+    @classmethod
+    def from_matrix(cls, tfidf_matrix, n_lists=64, n_probe=8, dims=64, seed=0):
+        from sklearn.cluster import KMeans
+        from sklearn.decomposition import TruncatedSVD
+
+        tfidf_matrix = sparse.csr_matrix(tfidf_matrix)
+        n, vocab = tfidf_matrix.shape
+        svd = TruncatedSVD(n_components=max(1, min(dims, vocab - 1, n - 1)), random_state=seed)
+        embeddings = _normalize(svd.fit_transform(tfidf_matrix))
+        n_lists = max(1, min(n_lists, n))
+        kmeans = KMeans(n_clusters=n_lists, n_init=1, random_state=seed).fit(embeddings)
+
+        labels = kmeans.labels_
+        list_rows = np.argsort(labels, kind="stable")
+        list_indptr = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=n_lists))))
+        return cls(tfidf_matrix, svd, _normalize(kmeans.cluster_centers_), list_indptr, list_rows,
+                   min(n_probe, n_lists))
+
+    def search(self, query_vector):
+        embedded = _normalize(self.svd.transform(query_vector))[0]
+        cells = np.argpartition(-(self.centroids @ embedded), self.n_probe - 1)[:self.n_probe]
+        positions, _ = _gather(self.list_indptr[cells], self.list_indptr[cells + 1])
+        rows = np.sort(self.list_rows[positions])
+        text = (self.tfidf_matrix[rows] @ sparse.csr_matrix(query_vector).T).toarray().ravel()
+        return rows, text
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+INDEX_KINDS = ("exact", "inverted", "ivf")
+
+
+def build_index(kind, tfidf_matrix, max_postings=None, n_lists=64, n_probe=8):
+    """Index of the given kind for `tfidf_matrix`; None for "exact" (full scan)."""
+    if kind == "exact":
+        return None
+    if kind == "inverted":
+        return InvertedIndex.from_matrix(tfidf_matrix, max_postings)
+    if kind == "ivf":
+        return IVFIndex.from_matrix(tfidf_matrix, n_lists=n_lists, n_probe=n_probe)
+    raise ValueError(f"unknown retrieval index {kind!r}; expected one of {INDEX_KINDS}")
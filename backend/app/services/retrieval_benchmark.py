@@ -0,0 +1,107 @@
+# services/retrieval_benchmark.py
+"""
+Recall-vs-latency of the retrieval indexes against the exact full scan.
+
+    python -m backend.app.services.retrieval_benchmark                    # served catalog
+    python -m backend.app.services.retrieval_benchmark --synthetic 200000 # synthetic catalog
+
+Recall is |top-k(index) ∩ top-k(exact)| / k over the final weighted scores,
+so it measures what /api/recommend would actually return.
+"""
+import argparse
+import sys
+import time
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from .recommender import RecommendationEngine
+from .retrieval import build_index
+
+
+def synthetic_engine(n_products, vocab_size=5000, words_per_product=12, seed=0):
+    """A catalog of Zipf-distributed random "words", large enough to time the indexes."""
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(vocab_size)])
+    weights = 1.0 / np.arange(1, vocab_size + 1)
+    weights /= weights.sum()
+    words = rng.choice(vocab, size=(n_products, words_per_product), p=weights)
+    texts = [" ".join(row) for row in words]
+    vectorizer = TfidfVectorizer()
+    matrix = vectorizer.fit_transform(texts)
+    ids = np.arange(n_products).astype(str)
+    columns = {key: ids for key in ("product_id", "title", "description", "category", "color", "image_url")}
+    static = 0.4 * rng.random(n_products)
+    queries = [" ".join(rng.choice(vocab[:500], size=rng.integers(1, 4))) for _ in range(200)]
+    return RecommendationEngine(columns, static, vectorizer, matrix), queries
+
+
+def catalog_queries(engine, count=200, seed=0):
+    """Queries made of 1-3 words taken from catalog titles."""
+    rng = np.random.default_rng(seed)
+    words = sorted({w for title in engine.columns["title"].tolist() for w in str(title).lower().split()})
+    return [" ".join(rng.choice(words, size=rng.integers(1, 4))) for _ in range(count)]
+
+
+def benchmark(engine, queries, k, configs):
+    """
+    Time engine.recommend() per index config and compare with the exact scan.
+    `configs` maps a label to build_index() keyword arguments.
+    """
+    engine.index = None
+    exact = [set(engine.recommend(q, k)[0].tolist()) for q in queries]
+    results = []
+    for label, options in configs.items():
+        started = time.perf_counter()
+        engine.index = build_index(tfidf_matrix=engine.tfidf_matrix, **options)
+        build_seconds = time.perf_counter() - started
+        latencies, hits = [], 0
+        for query, expected in zip(queries, exact):
+            started = time.perf_counter()
+            idx, _ = engine.recommend(query, k)
+            latencies.append(time.perf_counter() - started)
+            hits += len(expected & set(idx.tolist()))
+        latencies = np.array(latencies) * 1000
+        results.append({
+            "index": label,
+            "recall": hits / max(1, sum(len(e) for e in exact)),
+            "mean_ms": float(latencies.mean()),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "build_s": build_seconds,
+        })
+    engine.index = None
+    return results
+
+
+def default_configs(n_products):
+    lists = max(1, int(np.sqrt(n_products)))
+    configs = {
+        "exact": {"kind": "exact"},
+        "inverted": {"kind": "inverted"},
+        "inverted/256": {"kind": "inverted", "max_postings": 256},
+    }
+    for probe in (1, 4, 16):
+        configs[f"ivf/{lists}x{probe}"] = {"kind": "ivf", "n_lists": lists, "n_probe": probe}
+    return configs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, help="benchmark a synthetic catalog of this many products")
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        engine, queries = synthetic_engine(args.synthetic)
+    else:
+        from .recommender_artifact import load_or_build
+        engine = load_or_build()
+        queries = catalog_queries(engine)
+
+    print(f"{engine.size} products, {len(queries)} queries, k={args.k}")
+    print(f"{'index':<16}{'recall':>8}{'mean ms':>10}{'p95 ms':>10}{'build s':>10}")
+    for row in benchmark(engine, queries, args.k, default_configs(engine.size)):
+        print(f"{row['index']:<16}{row['recall']:>8.3f}{row['mean_ms']:>10.3f}{row['p95_ms']:>10.3f}{row['build_s']:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# services/scheduler.py
+from collections import deque
+
+
+class DagScheduler:
+    """
+    In-memory ready-queue scheduler for a single run.
+
+    Built once from the run's step ids, the predecessor map and the current
+    RunStep statuses. Each pending step keeps an indegree counter (number of
+    predecessors that are not yet "done"); steps whose counter reaches zero
+    are pushed onto a FIFO ready queue. Completing a step only touches its
+    successors, so the executor never has to re-query step state.
+    """
+
+    def __init__(self, step_ids, preds, statuses):
+        self.step_ids = list(step_ids)
+        self.statuses = dict(statuses)
+        self.succs = {sid: [] for sid in self.step_ids}
+        self.indegree = {}
+        self.ready = deque()
+        # steps parked or failed in an earlier pass still decide the run outcome
+        self.waiting = [sid for sid in self.step_ids if self.statuses.get(sid) == "waiting_for_signal"]
+        self.failed = [sid for sid in self.step_ids if self.statuses.get(sid) == "failed"]
+
+        for sid in self.step_ids:
+            for p in preds.get(sid, ()):
+                self.succs.setdefault(p, []).append(sid)
+
+        for sid in self.step_ids:
+            if self.statuses.get(sid) != "pending":
+                continue
+            # unknown predecessors never complete, so they keep the step blocked
+            self.indegree[sid] = sum(
+                1 for p in preds.get(sid, ()) if self.statuses.get(p) != "done"
+            )
+            if self.indegree[sid] == 0:
+                self.ready.append(sid)
+
+    def has_ready(self):
+        return bool(self.ready)
+
+    def pop(self):
+        """Take the next ready step and mark it running."""
+        sid = self.ready.popleft()
+        self.statuses[sid] = "running"
+        return sid
+
+    def mark_done(self, sid):
+        """Record `sid` as done and release successors whose predecessors are all done."""
+        self.statuses[sid] = "done"
+        released = []
+        for nxt in self.succs.get(sid, ()):
+            if nxt not in self.indegree or self.statuses.get(nxt) != "pending":
+                continue
+            self.indegree[nxt] -= 1
+            if self.indegree[nxt] == 0:
+                self.ready.append(nxt)
+                released.append(nxt)
+        return released
+
+    def park(self, sid):
+        """Record `sid` as waiting for an external signal; successors stay blocked."""
+        self.statuses[sid] = "waiting_for_signal"
+        self.waiting.append(sid)
+
+    def mark_failed(self, sid):
+        self.statuses[sid] = "failed"
+        self.failed.append(sid)
+
+    def blocked(self):
+        """Pending steps that can no longer become ready in this pass."""
+        return [
+            sid for sid in self.step_ids
+            if self.statuses.get(sid) == "pending" and sid not in self.ready
+        ]
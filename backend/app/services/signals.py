@@ -1,53 +1,102 @@
 # services/signals.py
 import json
+from datetime import datetime
+from sqlalchemy import update
 from ..database import db
-from ..models import Run, RunStep
+from ..models import Run, RunStep, Signal, SignalWait
+from ..event_publisher import publish_workflow_event
 from flask import current_app
 
-def handle_signal(run_id, signal_name, payload=None):
+
+def register_wait(session, run_id, step_id, signal_name=None):
+    """
+    Index a parked step under the signal it waits for. Called by the executor
+    when a step parks; the row is committed with the executor's wave.
+    """
+    session.add(SignalWait(run_id=run_id, step_id=step_id, signal_name=signal_name))
+
+
+def handle_signal(run_id, signal_name, payload=None, resume=True):
     """
-    Find steps in the given run that are waiting for this signal and resume them.
+    Find the step in the given run that is waiting for this signal and resume it.
     Returns True if a waiting step was found and resumed, otherwise False.
 
-    This implementation:
-    - searches for RunSteps with status == "waiting_for_signal" and payload_json contains an entry "signal": "<name>"
-      OR
-    - if no explicit 'signal' found, resumes the first waiting step found.
+    The waiting step is looked up in the signal index:
+    - a step that declared this signal name wins,
+    - otherwise the oldest step that parked without declaring a signal.
+    The step is completed with the signal payload as its output and, when
+    `resume` is set, the run is re-entered right away so successors execute
+    without waiting for another run_workflow pass.
     """
     run = Run.query.get(run_id)
     if not run:
         raise ValueError("run not found")
 
-    waiting_steps = RunStep.query.filter_by(run_id=run.id, status="waiting_for_signal").all()
-    if not waiting_steps:
-        current_app.logger.info("no waiting_for_signal steps for run %s", run_id)
-        return False
-
-    # prefer step which explicitly declared the signal name in its payload
-    target = None
-    for s in waiting_steps:
-        meta = json.loads(s.payload_json or "{}")
-        expected_signal = meta.get("signal")
-        if expected_signal == signal_name:
-            target = s
-            break
-
-    if not target:
-        # fallback: pick first waiting step
-        target = waiting_steps[0]
-
-    # attach payload to the step or run var
     try:
-        # update step payload_json with signal payload
-        meta = json.loads(target.payload_json or "{}")
-        meta.setdefault("signals", []).append({"name": signal_name, "payload": payload})
-        target.payload_json = json.dumps(meta)
-        # set to pending so executor can pick it up
-        target.status = "pending"
+        target = None
+        for wait in _candidate_waits(run.id, signal_name):
+            claimed = complete_waiting_step(run.id, wait.step_id, {"signal": signal_name, "payload": payload})
+            db.session.delete(wait)
+            if claimed:
+                target = wait.step_id
+                break
+
+        if target is None:
+            db.session.commit()
+            current_app.logger.info("no step waiting for signal %s in run %s", signal_name, run_id)
+            return False
+
+        db.session.add(Signal(run_id=run.id, name=signal_name, payload_json=json.dumps(payload)))
         db.session.commit()
-        current_app.logger.info("resumed step %s for run %s by signal %s", target.step_id, run_id, signal_name)
-        return True
     except Exception:
         current_app.logger.exception("failed to handle signal")
         db.session.rollback()
         raise
+
+    current_app.logger.info("resumed step %s for run %s by signal %s", target, run_id, signal_name)
+    publish_workflow_event(run.id, {"type": "step", "step_id": target, "status": "done"})
+    if resume:
+        resume_run(run.id)
+    return True
+
+
+def complete_waiting_step(run_id, step_id, output=None):
+    """
+    Move a parked step to "done" with `output` as its result; caller commits.
+    The conditional UPDATE claims the step, so a concurrent signal, timer or
+    cancel makes it a no-op. Returns True if this call completed the step.
+    """
+    return bool(db.session.execute(
+        update(RunStep)
+        .where(RunStep.run_id == run_id, RunStep.step_id == step_id,
+               RunStep.status == "waiting_for_signal")
+        .values(status="done", ended_at=datetime.utcnow(), output_json=json.dumps(output))
+        .execution_options(synchronize_session=False)
+    ).rowcount)
+
+
+def resume_run(run_id):
+    """Re-enter the scheduler for a single run, inline or on Celery (FLOW_ASYNC_START)."""
+    if current_app.config.get("FLOW_ASYNC_START", False):
+        from backend.app.tasks.orchestration import run_workflow_task
+        run_workflow_task.apply_async(args=[run_id])
+        return None
+    from .executor import run_workflow
+    return run_workflow(run_id)
+
+
+def clear_waits(run_id):
+    """Drop the signal index entries of a run (e.g. on cancel); caller commits."""
+    SignalWait.query.filter_by(run_id=run_id).delete(synchronize_session=False)
+
+
+def _candidate_waits(run_id, signal_name):
+    named = (
+        SignalWait.query.filter_by(run_id=run_id, signal_name=signal_name)
+        .order_by(SignalWait.id).all()
+    )
+    anonymous = (
+        SignalWait.query.filter(SignalWait.run_id == run_id, SignalWait.signal_name.is_(None))
+        .order_by(SignalWait.id).all()
+    )
+    return named + anonymous
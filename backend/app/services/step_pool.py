@@ -0,0 +1,65 @@
+# services/step_pool.py
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from ..config.settings import settings
+
+# Caps in-flight steps across every run executing in this process
+_global_slots = threading.BoundedSemaphore(settings.EXECUTOR_GLOBAL_CONCURRENCY)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class InlineExecutor:
+    """Executor that runs the callable immediately on the calling thread (serial mode)."""
+
+    def submit(self, fn, *args, **kwargs):
+        fut = Future()
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            fut.set_exception(e)
+        return fut
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def get_pool(mode="serial", max_workers=8):
+    """
+    Return the shared executor for `mode` ("serial", "thread" or "process").
+    Pools are created lazily and reused by every run in the process.
+    """
+    if mode not in ("serial", "thread", "process"):
+        raise ValueError(f"Unknown executor mode: {mode}")
+
+    with _pools_lock:
+        pool = _pools.get(mode)
+        if pool is None:
+            if mode == "thread":
+                pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="step")
+            elif mode == "process":
+                pool = ProcessPoolExecutor(max_workers=max_workers)
+            else:
+                pool = InlineExecutor()
+            _pools[mode] = pool
+        return pool
+
+
+def submit(pool, fn, *args):
+    """Submit `fn` to `pool`, blocking while the global concurrency limit is reached."""
+    _global_slots.acquire()
+    try:
+        fut = pool.submit(fn, *args)
+    except Exception:
+        _global_slots.release()
+        raise
+    fut.add_done_callback(lambda _: _global_slots.release())
+    return fut
+
+
+def shutdown():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=True)
+        _pools.clear()
@@ -0,0 +1,108 @@
+# services/timers.py
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from ..database import db
+from ..models import WaitStepTimer
+from ..event_publisher import publish_workflow_event
+from ..services import signals
+from flask import current_app
+
+# The wait_step_timers table is the durable timer heap: pending rows ordered by
+# trigger_at (indexed on status, trigger_at). A periodic tick pops every due
+# timer in batches, so a parked wait step holds no worker while it sleeps.
+# A fired timer whose run could not be enqueued goes to "retry": its step is
+# already done, so the next tick only enqueues the run again.
+DUE_STATUSES = ("pending", "retry")
+
+
+def schedule_timer(session, run_id, step_id, wait_seconds, payload=None, now=None):
+    """Add a timer that resumes `step_id` after `wait_seconds`; caller commits."""
+    now = now or datetime.utcnow()
+    timer = WaitStepTimer(
+        run_id=run_id,
+        step_id=step_id,
+        trigger_at=now + timedelta(seconds=float(wait_seconds or 0)),
+        payload_json=payload or {},
+        status="pending",
+    )
+    session.add(timer)
+    return timer
+
+
+def pop_due(limit, now=None):
+    """
+    Claim up to `limit` due timers (earliest first) and mark them triggered.
+    Row locks with SKIP LOCKED let concurrent ticks split the work on Postgres.
+    """
+    now = now or datetime.utcnow()
+    due = (
+        db.session.query(WaitStepTimer)
+        .filter(WaitStepTimer.status.in_(DUE_STATUSES), WaitStepTimer.trigger_at <= now)
+        .order_by(WaitStepTimer.trigger_at, WaitStepTimer.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if due:
+        db.session.execute(
+            update(WaitStepTimer)
+            .where(WaitStepTimer.id.in_([t.id for t in due]), WaitStepTimer.status.in_(DUE_STATUSES))
+            .values(status="triggered", updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+    return due
+
+
+def fire_due(now=None, batch_size=None, max_batches=None):
+    """
+    Fire every due timer: complete its waiting step and enqueue each affected
+    run once per batch on Celery. Returns the number of timers fired.
+    """
+    from backend.app.tasks.orchestration import run_workflow_task
+
+    batch_size = batch_size or int(current_app.config.get("TIMER_BATCH_SIZE", 500))
+    fired = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        due = pop_due(batch_size, now)
+        if not due:
+            break
+        batches += 1
+
+        resumed = {}  # run_id -> [(timer id, step_id)], insertion ordered
+        for timer in due:
+            output = {"timer": timer.id, "payload": timer.payload_json}
+            # pop_due does not refresh the loaded rows: status is still the one it was popped in
+            if timer.status == "retry" or signals.complete_waiting_step(timer.run_id, timer.step_id, output):
+                resumed.setdefault(timer.run_id, []).append((timer.id, timer.step_id))
+        db.session.commit()
+        fired += len(due)
+
+        for run_id, run_timers in resumed.items():
+            for _, step_id in run_timers:
+                publish_workflow_event(run_id, {"type": "step", "step_id": step_id, "status": "done"})
+            # always on a worker: running whole workflows inline would hold the tick past its time limit
+            try:
+                run_workflow_task.apply_async(args=[run_id])
+            except Exception:
+                current_app.logger.exception("failed to enqueue run %s after timer; retrying next tick", run_id)
+                db.session.execute(
+                    update(WaitStepTimer)
+                    .where(WaitStepTimer.id.in_([timer_id for timer_id, _ in run_timers]))
+                    .values(status="retry")
+                    .execution_options(synchronize_session=False)
+                )
+                db.session.commit()
+
+        if len(due) < batch_size:
+            break
+    return fired
+
+
+def next_deadline():
+    """Earliest pending trigger_at, or None when no timer is pending."""
+    return (
+        db.session.query(db.func.min(WaitStepTimer.trigger_at))
+        .filter(WaitStepTimer.status == "pending")
+        .scalar()
+    )
@@ -1,18 +1,17 @@
 # backend/app/sse.py
-from flask import Blueprint, Response
-import redis
-import json
+from flask import Blueprint
+from backend.app.sse_hub import hub
 
 sse_bp = Blueprint("sse", __name__)
-r = redis.Redis(host='localhost', port=6379, db=0)
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
 def event_stream(run_id):
-    pubsub = r.pubsub()
-    pubsub.subscribe(f"workflow_{run_id}")
-    for message in pubsub.listen():
-        if message['type'] == 'message':
-            yield f"data: {message['data'].decode()}\n\n"
+    # all clients share the process-wide subscriber; this only attaches a local buffer
+    sub = hub.subscribe(f"workflow_{run_id}")
+    return hub.stream(sub)
 
 @sse_bp.route("/stream/<int:run_id>")
 def stream(run_id):
-    return Response(event_stream(run_id), mimetype="text/event-stream")
+    # released on close even if the body is never iterated
+    return hub.response(f"workflow_{run_id}", headers=SSE_HEADERS)
@@ -0,0 +1,201 @@
+# backend/app/sse_hub.py
+import json
+import logging
+import queue
+import threading
+import time
+import redis
+from backend.app.config.settings import settings
+from backend.app.metrics import SSE_CLIENTS_GAUGE, SSE_EVICTIONS_COUNTER
+
+logger = logging.getLogger(__name__)
+
+# In-process channel fed by event_publisher.push_update (no Redis round-trip)
+LOCAL_CHANNEL = "local"
+
+_EVICTED = object()
+
+
+class Subscription:
+    """One SSE client: a bounded buffer of pending frames for a single channel."""
+
+    def __init__(self, channel, maxsize):
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.evicted = False
+
+
+class SseHub:
+    """
+    Per-process fan-out of Redis pub/sub channels to SSE clients.
+
+    A single pubsub connection, owned by a background listener thread, is
+    subscribed to the union of channels that local clients watch. Every
+    message is copied into the bounded queue of each client on that channel;
+    a client whose queue is full is evicted instead of stalling the others.
+    Streams emit a comment frame every `heartbeat` seconds so idle
+    connections stay open and dead ones are noticed.
+    """
+
+    def __init__(self, redis_url=None, client_queue_size=None, heartbeat=None):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.client_queue_size = client_queue_size or settings.SSE_CLIENT_QUEUE_SIZE
+        self.heartbeat = heartbeat or settings.SSE_HEARTBEAT_SECONDS
+        self._subs = {}  # channel -> set(Subscription)
+        self._lock = threading.Lock()
+        self._commands = queue.SimpleQueue()  # ("subscribe" | "unsubscribe", channel) for the listener
+        self._wakeup = threading.Event()
+        self._listener = None
+        self._stopped = threading.Event()
+
+    # ---------------- client side ----------------
+    def subscribe(self, channel):
+        sub = Subscription(channel, self.client_queue_size)
+        with self._lock:
+            subs = self._subs.setdefault(channel, set())
+            first = not subs
+            subs.add(sub)
+        SSE_CLIENTS_GAUGE.inc()
+        if first and channel != LOCAL_CHANNEL:
+            self._send_command("subscribe", channel)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subs.get(sub.channel)
+            if not subs or sub not in subs:
+                return
+            subs.discard(sub)
+            last = not subs
+            if last:
+                del self._subs[sub.channel]
+        SSE_CLIENTS_GAUGE.dec()
+        if last and sub.channel != LOCAL_CHANNEL:
+            self._send_command("unsubscribe", sub.channel)
+
+    def stream(self, sub):
+        """Yield SSE frames for `sub` until the client disconnects or is evicted."""
+        try:
+            while True:
+                try:
+                    item = sub.queue.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+                    continue
+                if item is _EVICTED or sub.evicted:
+                    yield "event: evicted\ndata: {}\n\n"
+                    return
+                yield f"data: {item}\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+    def response(self, channel, headers=None):
+        """
+        A text/event-stream Response for a new client of `channel`. The
+        subscription is taken now, so no event published after the request is
+        missed, and released when the response is closed, even if the body
+        was never iterated (client gone before the first frame, aborted request).
+        """
+        from flask import Response
+
+        sub = self.subscribe(channel)
+        resp = Response(self.stream(sub), mimetype="text/event-stream", headers=headers)
+        resp.call_on_close(lambda: self.unsubscribe(sub))
+        return resp
+
+    # ---------------- fan-out ----------------
+    def dispatch(self, channel, payload):
+        """Copy `payload` (a JSON string) to every client of `channel`."""
+        if not isinstance(payload, str):
+            payload = payload.decode() if isinstance(payload, bytes) else json.dumps(payload)
+        with self._lock:
+            subs = list(self._subs.get(channel, ()))
+        for sub in subs:
+            try:
+                sub.queue.put_nowait(payload)
+            except queue.Full:
+                self._evict(sub)
+
+    def _evict(self, sub):
+        logger.warning("Evicting slow SSE client on %s", sub.channel)
+        sub.evicted = True
+        SSE_EVICTIONS_COUNTER.inc()
+        self.unsubscribe(sub)
+        # make room for the sentinel so a blocked reader wakes up and stops
+        try:
+            sub.queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            sub.queue.put_nowait(_EVICTED)
+        except queue.Full:
+            pass
+
+    def client_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subs.get(channel, ()))
+            return sum(len(s) for s in self._subs.values())
+
+    # ---------------- Redis listener ----------------
+    def _send_command(self, op, channel):
+        self._commands.put((op, channel))
+        self._wakeup.set()
+        self._ensure_listener()
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._stopped.clear()
+                self._listener = threading.Thread(target=self._listen, name="sse-hub", daemon=True)
+                self._listener.start()
+
+    def _apply_commands(self, pubsub):
+        while True:
+            try:
+                op, channel = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            if op == "subscribe":
+                pubsub.subscribe(channel)
+            else:
+                pubsub.unsubscribe(channel)
+
+    def _listen(self):
+        backoff = 0.5
+        while not self._stopped.is_set():
+            pubsub = None
+            try:
+                pubsub = redis.from_url(self.redis_url).pubsub(ignore_subscribe_messages=True)
+                # (re)subscribe to everything local clients currently watch
+                with self._lock:
+                    channels = [c for c in self._subs if c != LOCAL_CHANNEL]
+                if channels:
+                    pubsub.subscribe(*channels)
+                backoff = 0.5
+                while not self._stopped.is_set():
+                    self._wakeup.clear()
+                    self._apply_commands(pubsub)
+                    if not pubsub.subscribed:
+                        self._wakeup.wait(timeout=1.0)
+                        continue
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message["type"] == "message":
+                        self.dispatch(message["channel"].decode(), message["data"])
+            except redis.RedisError as e:
+                logger.warning("SSE hub Redis listener error: %s; reconnecting in %.1fs", e, backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+
+hub = SseHub()
@@ -0,0 +1,190 @@
+# backend/app/taskpulse_sender.py
+import atexit
+import itertools
+import json
+import logging
+import os
+from collections import OrderedDict
+import requests
+from backend.app.buffered_worker import EXIT_FLUSH_TIMEOUT, BufferedWorker
+from backend.app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TaskPulseSender(BufferedWorker):
+    """
+    Background, batched delivery of workflow updates to TaskPulseOS.
+
+    submit() only enqueues, so callers on the step hot path never wait on the
+    network. A daemon thread takes batches of up to `batch_size` events every
+    `flush_interval` seconds (sooner when a batch fills). With
+    `payload="event"` (the TaskPulseOS contract) each event is posted as its
+    own JSON body over a kept-alive session; `payload="batch"` posts the
+    whole batch as {"events": [...]}, for receivers that accept it. Pending
+    updates for the same (run_id, step_id) are coalesced: the latest status
+    wins and keeps the slot of the first one.
+
+    Failed posts are retried with exponential backoff; batches that still
+    fail, and events that overflow `max_pending`, are appended to a spill
+    file capped at `spill_max_bytes`. The spill file is replayed after the
+    next successful post.
+    """
+
+    def __init__(self, url, batch_size=100, flush_interval=0.5, max_pending=10000, max_retries=5,
+                 retry_backoff=0.5, spill_path=None, spill_max_bytes=10 * 1024 * 1024, timeout=2.0,
+                 payload="event"):
+        if payload not in ("event", "batch"):
+            raise ValueError(f"payload must be 'event' or 'batch', not {payload!r}")
+        super().__init__(batch_size, flush_interval, "taskpulse-sender")
+        self.url = url
+        self.payload = payload
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.spill_path = spill_path
+        self.spill_max_bytes = spill_max_bytes
+        self.timeout = timeout
+
+        self._queue = OrderedDict()  # coalesce key -> event
+        self._seq = itertools.count()
+        self._session = requests.Session()
+        self.stats = {"sent": 0, "coalesced": 0, "spilled": 0, "dropped": 0, "retries": 0}
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            settings.TASKPULSEOS_URL,
+            batch_size=settings.TASKPULSEOS_BATCH_SIZE,
+            flush_interval=settings.TASKPULSEOS_FLUSH_INTERVAL,
+            max_pending=settings.TASKPULSEOS_MAX_PENDING,
+            max_retries=settings.TASKPULSEOS_MAX_RETRIES,
+            retry_backoff=settings.TASKPULSEOS_RETRY_BACKOFF,
+            spill_path=settings.TASKPULSEOS_SPILL_PATH,
+            spill_max_bytes=settings.TASKPULSEOS_SPILL_MAX_BYTES,
+            payload=settings.TASKPULSEOS_PAYLOAD,
+        )
+
+    # ---------------- producer side ----------------
+    def submit(self, event: dict):
+        """Queue `event` for delivery; never blocks on I/O except when spilling overflow."""
+        if event.get("step_id") is not None:
+            key = (event.get("run_id"), event.get("step_id"))
+        else:
+            key = ("seq", next(self._seq))
+        overflow = None
+        with self._cond:
+            if key in self._queue:
+                self.stats["coalesced"] += 1
+            elif len(self._queue) >= self.max_pending:
+                overflow = self._queue.popitem(last=False)[1]
+            self._queue[key] = event
+            self._added()
+        if overflow is not None:
+            self._spill([overflow])
+        self._ensure_thread()
+
+    # ---------------- delivery ----------------
+    def _pending(self):
+        return len(self._queue)
+
+    def _take(self):
+        batch = []
+        while self._queue and len(batch) < self.batch_size:
+            batch.append(self._queue.popitem(last=False)[1])
+        return batch
+
+    def _write(self, batch):
+        self._deliver(batch)
+
+    def _deliver(self, batch):
+        with self._write_lock:
+            undelivered = self._post(batch)
+            if not undelivered:
+                self._replay_spill()
+                return True
+            self._spill(undelivered)
+            return False
+
+    def _post(self, batch):
+        """Deliver `batch` in the configured payload format; returns the events not delivered."""
+        if self.payload == "batch":
+            return [] if self._send({"events": batch}, len(batch)) else batch
+        for i, event in enumerate(batch):
+            if not self._send(event, 1):
+                return batch[i:]
+        return []
+
+    def _send(self, body, count):
+        delay = self.retry_backoff
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                if self._stopped.wait(delay):
+                    return False  # shutting down: stop retrying, the caller spills
+                self.stats["retries"] += 1
+                delay = min(delay * 2, 30)
+            try:
+                resp = self._session.post(self.url, json=body, timeout=self.timeout)
+            except requests.RequestException as e:
+                logger.warning("TaskPulseOS push failed (attempt %d): %s", attempt + 1, e)
+                continue
+            if resp.status_code < 300:
+                self.stats["sent"] += count
+                return True
+            if 400 <= resp.status_code < 500 and resp.status_code not in (408, 429):
+                # rejected payload: retrying or spilling would not help
+                logger.error("TaskPulseOS rejected %d events: HTTP %d", count, resp.status_code)
+                self.stats["dropped"] += count
+                return True
+            logger.warning("TaskPulseOS push failed (attempt %d): HTTP %d", attempt + 1, resp.status_code)
+        return False
+
+    # ---------------- spill file ----------------
+    def _spill(self, events):
+        if not self.spill_path:
+            self.stats["dropped"] += len(events)
+            return
+        try:
+            size = os.path.getsize(self.spill_path) if os.path.exists(self.spill_path) else 0
+            lines = []
+            for event in events:
+                line = json.dumps(event, default=str) + "\n"
+                if size + len(line) > self.spill_max_bytes:
+                    self.stats["dropped"] += 1
+                    continue
+                size += len(line)
+                lines.append(line)
+            if lines:
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+                self.stats["spilled"] += len(lines)
+        except OSError as e:
+            logger.error("TaskPulseOS spill failed: %s", e)
+            self.stats["dropped"] += len(events)
+
+    def _replay_spill(self):
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return
+        # claim the file atomically so concurrent processes do not replay it twice
+        claimed = f"{self.spill_path}.{os.getpid()}.replay"
+        try:
+            os.replace(self.spill_path, claimed)
+        except OSError:
+            return
+        try:
+            with open(claimed, encoding="utf-8") as f:
+                events = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            logger.error("TaskPulseOS spill replay failed: %s", e)
+            events = []
+        for i in range(0, len(events), self.batch_size):
+            batch = events[i:i + self.batch_size]
+            undelivered = self._post(batch)
+            if undelivered:
+                self._spill(undelivered + events[i + len(batch):])
+                break
+        os.remove(claimed)
+
+
+sender = TaskPulseSender.from_settings()
+atexit.register(sender.close, EXIT_FLUSH_TIMEOUT)
@@ -0,0 +1,25 @@
+# backend/app/tasks/catalog.py
+from backend.celery_app import celery_app
+from backend.app.tasks.orchestration import _get_flask_app
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    name="backend.app.tasks.catalog.rebuild_catalog_artifact",
+    time_limit=1800,
+    soft_time_limit=1770,
+    queue="default",
+)
+def rebuild_catalog_artifact():
+    """
+    Fold the catalog delta into a new recommender artifact and trim the
+    change list. Enqueued by a worker whose delta grew past CATALOG_DELTA_MAX.
+    """
+    from backend.app.services.catalog_index import catalog_index
+
+    with _get_flask_app().app_context():
+        version = catalog_index.publish_artifact()
+        logger.info(f"Catalog artifact rebuild published version {version}")
+        return {"version": version}
@@ -24,13 +24,12 @@ def submit_step(step_def: dict, run_id: int):
 def start_run_from_dsl(dsl_text: str, workflow_id: int, version: str, input_json: str | None = None):
     db = db_module.session()
     try:
-        dag = compiler.compile_workflow_from_yaml(dsl_text)
+        dag = compiler.compile_workflow_from_yaml(dsl_text, version)
         step_defs = dag["nodes"]
         run = create_run(db, workflow_id, version, inputs_json=input_json)
         create_run_steps(db, run.id, step_defs)
-        # enqueue entry steps (no incoming edges)
-        entry_nodes = [n for n in step_defs if not n.get("incoming")]
-        for n in entry_nodes:
+        # enqueue entry steps (no incoming edges), precomputed by the compiler
+        for n in dag["entry"]:
             submit_step(n, run.id)
         return {"run_id": run.id, "dag": dag}
     finally:
@@ -0,0 +1,36 @@
+# backend/app/tasks/orchestration.py
+from backend.celery_app import celery_app
+import logging
+
+logger = logging.getLogger(__name__)
+
+_flask_app = None
+
+
+def _get_flask_app():
+    """Build the Flask app once per worker process; run_workflow needs its app context."""
+    global _flask_app
+    if _flask_app is None:
+        from backend.app import create_app
+        _flask_app = create_app()
+    return _flask_app
+
+
+@celery_app.task(
+    bind=True,
+    name="backend.app.tasks.orchestration.run_workflow_task",
+    time_limit=900,
+    soft_time_limit=870,
+    queue="default",
+)
+def run_workflow_task(self, run_id: int):
+    """
+    Drive a persisted Run to completion (or until it parks on a signal).
+    Enqueued by POST /flow/run/start in async mode.
+    """
+    from backend.app.services.executor import run_workflow
+
+    with _get_flask_app().app_context():
+        run = run_workflow(run_id)
+        logger.info(f"Run {run_id} finished orchestration pass with status {run.status}")
+        return {"run_id": run_id, "status": run.status}
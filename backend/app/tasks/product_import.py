@@ -0,0 +1,26 @@
+# backend/app/tasks/product_import.py
+from backend.celery_app import celery_app
+from backend.app.tasks.orchestration import _get_flask_app
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    name="backend.app.tasks.product_import.import_products_task",
+    time_limit=None,
+    soft_time_limit=None,
+    queue="default",
+)
+def import_products_task(self, job_id: int):
+    """
+    Run a bulk product import. Enqueued by POST /product/import; a redelivered
+    task (worker lost mid-import) resumes after the last committed chunk.
+    """
+    from backend.app.services.product_import import run_import
+
+    with _get_flask_app().app_context():
+        job = run_import(job_id)
+        logger.info(f"Product import {job_id} {job.status}: {job.inserted} inserted, {job.rejected} rejected")
+        return {"job_id": job_id, "status": job.status, "inserted": job.inserted, "rejected": job.rejected}
@@ -1,9 +1,9 @@
-import joblib
-import os
+import numpy as np
 import pandas as pd
+from ..services.model_registry import esg_model
 
-model_path = os.path.join('models', 'esg_model.pkl')
-model = joblib.load(model_path)
+# Model inputs, in the order the ESG model was trained on
+ESG_FEATURES = ['water_use', 'carbon_emission', 'ethical_rating']
 
 def assign_esg_badge(score):
     if score >= 75:
@@ -13,10 +13,20 @@ def assign_esg_badge(score):
     else:
         return 'Low'
 
+def _feature(value):
+    # missing or blank inputs count as 0, like the catalog pipeline's fillna(0)
+    return 0.0 if value is None or value == '' else float(value)
+
+def compute_esg_scores(products):
+    """Scores for a batch of products: one (N, 3) feature matrix, one model.predict."""
+    if not products:
+        return []
+    features = np.array([[_feature(p.get(name)) for name in ESG_FEATURES] for p in products], dtype=float)
+    scores = esg_model.get().predict(pd.DataFrame(features, columns=ESG_FEATURES))
+    return [round(float(score), 2) for score in scores]
+
 def compute_esg_score(data):
-    input_df = pd.DataFrame([data])[['water_use', 'carbon_emission', 'ethical_rating']]
-    score = float(model.predict(input_df)[0])
-    return round(score, 2)
+    return compute_esg_scores([data])[0]
 
 def suggest_alternative(material):
     if not material:
@@ -35,14 +45,16 @@ def suggest_alternative(material):
     return alternatives.get(material, 'recycled nylon')
 
 # Final ESG pipeline
-def process_product_esg(product_json):
-    score = compute_esg_score(product_json)
-    badge = assign_esg_badge(score)
-    suggestion = suggest_alternative(product_json.get('material', ''))
-
-    return {
-        'score': score, 
-        'badge': badge,
-        'sustainable_alternative': suggestion
-    }
+def process_products_esg(products):
+    """process_product_esg() for many products with a single model call."""
+    return [
+        {
+            'score': score,
+            'badge': assign_esg_badge(score),
+            'sustainable_alternative': suggest_alternative(product.get('material', '')),
+        }
+        for product, score in zip(products, compute_esg_scores(products))
+    ]
 
+def process_product_esg(product_json):
+    return process_products_esg([product_json])[0]
@@ -27,36 +27,54 @@ def suggest_alternative(material):
         return "The provided material is a sustainable material."
     return alternatives.get(material, 'recycled nylon')
 
-def generate_esg_columns(df, seed=42):
-    np.random.seed(seed)  
-
-    def generate_values(row):
-        material = str(row['material']).lower().strip()
-
-        if 'tencel' in material:
-            water_use = np.random.uniform(4000000, 5000000)
-            carbon_emission = np.random.uniform(1, 5)
-            ethical_rating = np.random.randint(3, 5)
-        elif 'vegan leather' in material:
-            water_use = np.random.uniform(1500000, 2500000)
-            carbon_emission = np.random.uniform(100, 350)
-            ethical_rating = np.random.randint(2, 5)
-        elif 'bamboo' in material:
-            water_use = np.random.uniform(800000, 2000000)
-            carbon_emission = np.random.uniform(150, 420)
-            ethical_rating = np.random.randint(2, 5)
-        elif 'recycled' in material or 'organic' in material:
-            water_use = np.random.uniform(200000, 700000)
-            carbon_emission = np.random.uniform(50, 150)
-            ethical_rating = np.random.randint(4, 6)
-        else:
-            water_use = np.random.uniform(800000, 2500000)
-            carbon_emission = np.random.uniform(100, 300)
-            ethical_rating = np.random.randint(2, 5)
+# Material categories, checked in order (first match wins)
+MATERIAL_PATTERNS = ('tencel', 'vegan leather', 'bamboo', 'recycled|organic')
+# Synthetic ESG input ranges: one (low, high) per pattern above, then the default.
+# ethical_rating is an integer in [low, high)
+ESG_INPUT_RANGES = {
+    'water_use': ((4000000, 5000000), (1500000, 2500000), (800000, 2000000), (200000, 700000), (800000, 2500000)),
+    'carbon_emission': ((1, 5), (100, 350), (150, 420), (50, 150), (100, 300)),
+    'ethical_rating': ((3, 5), (2, 5), (2, 5), (4, 6), (2, 5)),
+}
+
+# Score adjustments by material, checked in order (first match wins)
+MATERIAL_ADJUSTMENTS = (
+    ('leather', -15),  # animal leather only; vegan leather is excluded below
+    ('polyester', -10),
+    ('organic cotton', 10),
+    ('bamboo', 8),
+    ('recycled', 12),
+)
+
 
-        return pd.Series([round(water_use, 2), round(carbon_emission, 2), ethical_rating])
+def _materials(df):
+    if 'material' not in df:
+        return pd.Series('', index=df.index)
+    return df['material'].astype(str).str.lower().str.strip()
 
-    df[['water_use', 'carbon_emission', 'ethical_rating']] = df.apply(generate_values, axis=1)
+
+def _contains(materials, pattern):
+    return materials.str.contains(pattern, regex=True).to_numpy()
+
+
+def generate_esg_columns(df, seed=42):
+    """
+    Synthetic water_use / carbon_emission / ethical_rating per product, drawn
+    from the ranges of its material category. One uniform draw per column,
+    scaled into each row's range, so the same seed gives the same values.
+    """
+    rng = np.random.default_rng(seed)
+    materials = _materials(df)
+    masks = [_contains(materials, pattern) for pattern in MATERIAL_PATTERNS]
+
+    for column, ranges in ESG_INPUT_RANGES.items():
+        low = np.select(masks, [r[0] for r in ranges[:-1]], default=ranges[-1][0])
+        high = np.select(masks, [r[1] for r in ranges[:-1]], default=ranges[-1][1])
+        u = rng.random(len(df))
+        if column == 'ethical_rating':
+            df[column] = (low + np.floor(u * (high - low))).astype(int)
+        else:
+            df[column] = np.round(low + u * (high - low), 2)
     return df
 
 def get_esg_badge(score):
@@ -66,37 +84,28 @@ def get_esg_badge(score):
         return '🟡'
     return '🔴'
 
+def esg_badges(scores):
+    """Vectorized get_esg_badge; unscored products (NaN) get no badge."""
+    scores = np.asarray(scores, dtype=float)
+    return np.select([np.isnan(scores), scores >= 80, scores >= 50], ['', '🟢', '🟡'], default='🔴').astype(object)
+
 def compute_esg_score(df, model):
     features = df[['water_use', 'carbon_emission', 'ethical_rating']].fillna(0)
-    df['esg_score'] = model.predict(features)
+    scores = np.asarray(model.predict(features), dtype=float)
 
     #Category-specific weighting
-    def adjust_score(row):
-        material = str(row.get('material', '')).lower().strip()
-        score = row['esg_score']
-
-        if 'leather' in material and 'vegan' not in material:
-            score -= 15
-        elif 'polyester' in material:
-            score -= 10
-        elif 'organic cotton' in material:
-            score += 10
-        elif 'bamboo' in material:
-            score += 8
-        elif 'recycled' in material:
-            score += 12
-
-        return score
-
-    df['esg_score'] = df.apply(adjust_score, axis=1)
+    materials = _materials(df)
+    masks = [_contains(materials, pattern) for pattern, _ in MATERIAL_ADJUSTMENTS]
+    masks[0] &= ~_contains(materials, 'vegan')
+    scores = scores + np.select(masks, [delta for _, delta in MATERIAL_ADJUSTMENTS], default=0)
 
     # Validation: ensure ESG score is between 0 and 100
-    if (df['esg_score'] < 0).any() or (df['esg_score'] > 100).any():
+    if (scores < 0).any() or (scores > 100).any():
         print("Warning: Some ESG scores fall outside the expected range (0–100). Clipping them.")
-        df['esg_score'] = df['esg_score'].clip(lower=0, upper=100)
-    
+        scores = np.clip(scores, 0, 100)
+    df['esg_score'] = scores
+
     # Add ESG badge column
-    df['esg_badge'] = df['esg_score'].apply(get_esg_badge)
+    df['esg_badge'] = esg_badges(scores)
 
     return df
-
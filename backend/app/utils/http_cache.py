@@ -0,0 +1,44 @@
+# backend/app/utils/http_cache.py
+"""
+Validators and Cache-Control for read-mostly routes.
+
+Views compute a strong ETag from something cheap (a content hash or row
+versions) *before* loading blobs or full rows, answer conditional requests
+with not_modified(), and stamp full responses with with_validators():
+
+    tag = strong_etag("design", design_id, image_key)
+    early = not_modified(tag, "IMAGE_CACHE_CONTROL")
+    if early:
+        return early
+    ...
+    return with_validators(resp, tag, "IMAGE_CACHE_CONTROL")
+
+Policies are config keys, so each route's Cache-Control is set per deployment.
+"""
+import hashlib
+from flask import current_app, request
+
+
+def strong_etag(*parts):
+    """A strong validator for the given parts (versions, hashes, query args)."""
+    return hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+def _cache_control(policy):
+    return current_app.config.get(policy) or "no-cache"
+
+
+def not_modified(etag, policy):
+    """A 304 response if the request already holds `etag`, else None."""
+    if request.method not in ("GET", "HEAD") or not request.if_none_match.contains(etag):
+        return None
+    resp = current_app.response_class(status=304)
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = _cache_control(policy)
+    return resp
+
+
+def with_validators(resp, etag, policy):
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = _cache_control(policy)
+    return resp
@@ -0,0 +1,73 @@
+# backend/app/utils/pagination.py
+"""
+Keyset (cursor) pagination, newest first, on a (timestamp, id) pair.
+
+A page is `WHERE (ts, id) < (cursor_ts, cursor_id) ORDER BY ts DESC, id
+DESC LIMIT n`, answered from the (ts, id) index in O(page size) however
+deep the page is, unlike OFFSET, which reads and discards every row
+before it. The cursor is an opaque token naming the last row served.
+"""
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import tuple_
+
+
+def encode_cursor(timestamp, row_id):
+    raw = json.dumps([timestamp.isoformat() if timestamp else None, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """(timestamp, id) from a cursor token; ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def keyset_page(query, timestamp_col, id_col, cursor=None, limit=20, offset=0):
+    """
+    Apply a keyset page to `query` (which must select rows exposing
+    `timestamp_col` and `id_col`). Returns (rows, next_cursor), next_cursor
+    being None on the last page. `offset` supports the older offset paging
+    (same order, O(offset)) and is ignored when a cursor is given.
+    """
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(timestamp_col, id_col) < tuple_(timestamp, row_id))
+    query = query.order_by(timestamp_col.desc(), id_col.desc()).limit(limit + 1)
+    if offset and not cursor:
+        query = query.offset(offset)
+    rows = query.all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, timestamp_col.key), getattr(last, id_col.key))
+
+
+def id_page(query, id_col, cursor=None, limit=50):
+    """
+    Keyset page ordered by id ascending, for tables without a timestamp;
+    the cursor is the last id served. Returns (rows, next_cursor).
+    """
+    if cursor:
+        try:
+            query = query.filter(id_col > int(cursor))
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor!r}")
+    rows = query.order_by(id_col).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, str(getattr(rows[-1], id_col.key))
+
+
+def page_limit(value, default, maximum):
+    """The `limit` query argument, clamped to 1..maximum; ValueError if not an integer."""
+    if value in (None, ""):
+        return default
+    return max(1, min(int(value), maximum))
@@ -0,0 +1,53 @@
+# backend/app/utils/queries.py
+"""
+Query shapes for user and role lookups.
+
+Each helper loads what its callers read in a fixed number of queries:
+roles come joined or as a projected column instead of one lazy load per
+user, permissions come in one selectin query for all roles, and the
+profile image blob (User.image_url, deferred on the model) is only loaded
+where it is served.
+"""
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload, selectinload, undefer
+from ..database import db
+from ..models import Design, Product, Role, User
+
+
+def user_summaries():
+    """Rows of (id, name, email, status, role) for listings: one query, no ORM objects, no blob."""
+    return (
+        db.session.query(User.id, User.name, User.email, User.status, Role.role_name.label("role"))
+        .outerjoin(Role, User.role_id == Role.id)
+    )
+
+
+def user_with_role(with_image=False, **filters):
+    """The first User matching `filters`, with its role joined (and its profile image if asked)."""
+    options = [joinedload(User.role)]
+    if with_image:
+        options.append(undefer(User.image_url))
+    return User.query.options(*options).filter_by(**filters).first()
+
+
+def role_name_of(user_id):
+    return (
+        db.session.query(Role.role_name)
+        .join(User, User.role_id == Role.id)
+        .filter(User.id == int(user_id))
+        .scalar()
+    )
+
+
+def roles_with_permissions():
+    return Role.query.options(selectinload(Role.permissions)).order_by(Role.id)
+
+
+def content_counts(user_id):
+    """(designs, products) owned by the user, in one query."""
+    return db.session.execute(
+        select(
+            select(func.count(Design.id)).where(Design.user_id == user_id).scalar_subquery(),
+            select(func.count(Product.id)).where(Product.user_id == user_id).scalar_subquery(),
+        )
+    ).one()
@@ -11,6 +11,8 @@ celery_app = Celery(
     "workflow_engine",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
+    include=["backend.app.tasks.orchestration", "backend.app.tasks.wait_signal", "backend.app.tasks.product_import",
+             "backend.app.tasks.catalog"],
 )
 
 celery_app.conf.update(
@@ -37,6 +39,19 @@ celery_app.conf.task_queues = (
 celery_app.conf.task_routes = {
     "backend.app.tasks.http_call.http_call": {"queue": "io"},
     "backend.app.tasks.python_fn.python_fn": {"queue": "cpu"},
+    "backend.app.tasks.orchestration.run_workflow_task": {"queue": "default"},
+    "backend.app.tasks.wait_signal.fire_due_timers": {"queue": "default"},
+    "backend.app.tasks.product_import.import_products_task": {"queue": "default"},
+    "backend.app.tasks.catalog.rebuild_catalog_artifact": {"queue": "default"},
+}
+
+# durable wait-step timers are fired by a periodic tick (the `beat` service in docker-compose.yml)
+celery_app.conf.beat_schedule = {
+    "fire-due-wait-timers": {
+        "task": "backend.app.tasks.wait_signal.fire_due_timers",
+        "schedule": settings.TIMER_TICK_SECONDS,
+        "options": {"expires": settings.TIMER_TICK_SECONDS * 5},
+    },
 }
 
 # register signals so they're active in worker process
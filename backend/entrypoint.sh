@@ -19,12 +19,12 @@ done
 
 echo "Postgres is up - continuing"
 
-# Optional: run DB migrations or create tables
-# If you use Flask-Migrate / alembic, you could run: flask db upgrade
-# Keep this simple: if you want to run a custom migrate script, place it here
+# Optional: run DB migrations. Fresh databases get their schema from db.create_all();
+# `flask db stamp head` marks them current (upgrade also works: migrations skip what exists).
+# A failed upgrade stops the container (set -e) instead of serving a half-migrated schema.
 if [ -n "$FLASK_MIGRATE" ]; then
   echo "Running flask db upgrade"
-  flask db upgrade || true
+  flask db upgrade
 fi
 
 # start the passed CMD (gunicorn) or fallback to flask run
@@ -1,3 +1,4 @@
+import os
 import pytest
 from backend.app import create_app
 from backend.app.database import db
@@ -6,6 +7,12 @@ from backend.app.models.user import User
 from werkzeug.security import generate_password_hash
 from flask_jwt_extended import create_access_token, create_refresh_token
 from backend.app.database import SessionLocal, Base, engine
+from backend.app.services.catalog_index import catalog_index
+from backend.app.services.query_cache import query_cache
+from backend.app.services.image_store import image_store
+from backend.app.request_audit import request_audit
+from backend.app import event_log, taskpulse_sender
+from backend.app.buffered_worker import EXIT_FLUSH_TIMEOUT
 # ---------------------------
 # App fixture
 # ---------------------------
@@ -20,6 +27,7 @@ def app_ctx():
         db.drop_all()
         db.create_all()
         yield app
+        request_audit.flush()
         db.session.remove()
         db.drop_all()
 
@@ -32,6 +40,51 @@ def clean_db(app_ctx):
     for tbl in reversed(db.metadata.sorted_tables):
         db.session.execute(tbl.delete())
     db.session.commit()
+    # cached recommendations and catalog deltas must not outlive the rows they were built from
+    catalog_index.reset()
+    query_cache.bump_product_version()
+
+# ---------------------------
+# Image store in a per-test directory
+# ---------------------------
+@pytest.fixture(autouse=True)
+def image_store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_store, "root", str(tmp_path / "images"))
+    return image_store.root
+
+# ---------------------------
+# Event logs (recommendation log, AI mock logs) in a per-test directory, not the tracked data/logs
+# ---------------------------
+@pytest.fixture(autouse=True)
+def event_log_dir(app_ctx, tmp_path, monkeypatch):
+    logs = list(event_log._logs.values())
+    for log in logs:
+        monkeypatch.setattr(log, "path", str(tmp_path / "logs" / os.path.basename(log.path)))
+    yield str(tmp_path / "logs")
+    # written out before the real paths are restored
+    for log in logs:
+        log.flush()
+
+# ---------------------------
+# Request audit rows are written by request_audit.flush(), not by the timer mid-test
+# ---------------------------
+@pytest.fixture(autouse=True)
+def request_audit_no_timer(monkeypatch):
+    monkeypatch.setattr(request_audit, "flush_interval", 3600)
+
+# ---------------------------
+# TaskPulseOS updates go nowhere: the shared sender would otherwise retry the
+# real URL in the background and flush at exit after pytest closed its streams
+# ---------------------------
+@pytest.fixture(scope="session", autouse=True)
+def taskpulse_offline():
+    def accept(url, json, timeout):
+        return type("Response", (), {"status_code": 200})()
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(taskpulse_sender.sender._session, "post", accept)
+        yield
+        taskpulse_sender.sender.close(EXIT_FLUSH_TIMEOUT)
 
 # ---------------------------
 # Test client fixture
@@ -0,0 +1,98 @@
+# backend/tests/test_admin_queries.py
+from contextlib import contextmanager
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from backend.app.database import db
+from backend.app.models import Design, Permission, Product, Role, User
+
+
+@contextmanager
+def _selects():
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        # token revocation checks run once per JWT verification, whatever the route loads
+        if statement.startswith("SELECT") and "FROM token_blocklist" not in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+
+def _admin_headers(seed_roles_and_users):
+    admin, _ = seed_roles_and_users
+    # no role claim: exercises role_required's database fallback too
+    return {"Authorization": f"Bearer {create_access_token(identity=str(admin.id))}"}
+
+
+def test_user_listing_costs_two_queries_per_page(client, seed_roles_and_users):
+    headers = _admin_headers(seed_roles_and_users)
+    user_role = Role.query.filter_by(role_name="user").one()
+    db.session.add_all([
+        User(name=f"u{i}", email=f"u{i}@example.com", role_id=user_role.id, status="Active",
+             image_url=b"x" * 10000)
+        for i in range(25)
+    ])
+    db.session.commit()
+
+    seen, url = [], "/admin/users?limit=10&role=user"
+    while url:
+        with _selects() as selects:
+            resp = client.get(url, headers=headers)
+        assert resp.status_code == 200
+        # role check + one projected page query, whatever the page size; never the image blob
+        assert len(selects) == 2 and not any("image_url" in s for s in selects)
+        seen += resp.get_json()
+        url = resp.headers.get("Link", "").split(";")[0].strip("<>")
+
+    assert len(seen) == 26 and {u["role"] for u in seen} == {"user"}
+    assert [u["id"] for u in seen] == sorted(u["id"] for u in seen)
+    assert client.get("/admin/users?cursor=abc", headers=headers).status_code == 400
+    # the admin dashboard is served from another origin and follows the cursor header
+    resp = client.get("/admin/users?limit=10", headers={**headers, "Origin": "http://localhost:8080"})
+    assert "X-Next-Cursor" in resp.headers.get("Access-Control-Expose-Headers", "")
+
+
+def test_roles_list_and_delete_are_set_based(client, seed_roles_and_users):
+    headers = _admin_headers(seed_roles_and_users)
+    for name in ("editor", "viewer", "brand"):
+        role = Role(role_name=name)
+        db.session.add(role)
+        db.session.flush()
+        db.session.add_all([Permission(role_id=role.id, system=s, module_access="read") for s in ("a", "b")])
+    db.session.commit()
+
+    with _selects() as selects:
+        roles = client.get("/admin/roles", headers=headers).get_json()
+    assert len(selects) == 3  # role check, roles, all their permissions
+    assert {r["role_name"]: len(r["permissions"]) for r in roles}["editor"] == 2
+
+    user_role = Role.query.filter_by(role_name="user").one()
+    assert client.delete(f"/admin/roles/{user_role.id}", headers=headers).status_code == 200
+    db.session.expire_all()
+    assert User.query.filter_by(email="alice@example.com").one().role_id is None
+    editor_id = Role.query.filter_by(role_name="editor").one().id
+    assert client.delete(f"/admin/roles/{editor_id}", headers=headers).status_code == 200
+    assert Permission.query.filter_by(role_id=editor_id).count() == 0
+
+
+def test_profile_loads_user_role_image_and_counts_in_two_queries(client, seed_roles_and_users):
+    _, alice = seed_roles_and_users
+    alice.image_url, alice.image_mime = b"png", "image/png"
+    db.session.add(Product(title="p", category="c", user_id=alice.id))
+    db.session.add(Design(title="d", description="d", category="c", image_mime="image/png", user_id=alice.id))
+    db.session.commit()
+    db.session.expire_all()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(alice.id))}"}
+
+    with _selects() as selects:
+        profile = client.get("/auth/profile", headers=headers).get_json()
+
+    assert len(selects) == 2
+    assert profile["role"] == "user" and profile["profile_image_url"] == "data:image/png;base64,cG5n"
+    assert (profile["design_count"], profile["saved_count"]) == (1, 1)
+    # updating without a role no longer fails
+    assert client.post("/auth/update_profile", data={"bio": "hi"}, headers=headers).status_code == 200
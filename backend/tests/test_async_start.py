@@ -0,0 +1,98 @@
+# backend/tests/test_async_start.py
+import pytest
+from backend.app.database import db
+from backend.app.models import WorkflowDef, Run, RunStep
+from backend.app.tasks import orchestration
+
+
+@pytest.fixture
+def workflow_instance(app_ctx):
+    wf = WorkflowDef(name="Async Workflow", version="1.0", dsl_yaml="steps: []", created_by="pytest")
+    db.session.add(wf)
+    db.session.commit()
+    return wf
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        orchestration.run_workflow_task, "apply_async",
+        lambda args=None, **kwargs: calls.append(args)
+    )
+    return calls
+
+
+def test_async_start_returns_202_and_enqueues(client, workflow_instance, enqueued):
+    payload = {
+        "workflow_id": workflow_instance.id,
+        "async": True,
+        "dsl": {"steps": [{"id": "a", "action": "noop"}, {"id": "b", "action": "noop", "depends_on": ["a"]}]},
+    }
+
+    resp = client.post("/flow/run/start", json=payload)
+    assert resp.status_code == 202
+    data = resp.get_json()
+    assert data["status"] == "pending"
+    assert data["stream_url"] == f"/stream/{data['run_id']}"
+    assert enqueued == [[data["run_id"]]]
+
+    # the run is persisted but not executed by the request
+    assert Run.query.get(data["run_id"]).status == "pending"
+    assert RunStep.query.filter_by(run_id=data["run_id"], status="pending").count() == 2
+
+
+def test_orchestration_task_drives_run(app_ctx, client, workflow_instance, enqueued, monkeypatch):
+    monkeypatch.setattr(orchestration, "_flask_app", app_ctx)
+    payload = {"workflow_id": workflow_instance.id, "async": True, "dsl": {"steps": [{"id": "a", "action": "noop"}]}}
+    run_id = client.post("/flow/run/start", json=payload).get_json()["run_id"]
+
+    result = orchestration.run_workflow_task.run(run_id)
+
+    assert result == {"run_id": run_id, "status": "completed"}
+
+
+def test_sync_start_still_returns_final_status(client, workflow_instance, enqueued):
+    payload = {"workflow_id": workflow_instance.id, "dsl": {"steps": [{"id": "a", "action": "noop"}]}}
+
+    resp = client.post("/flow/run/start", json=payload)
+    assert resp.status_code == 200
+    assert resp.get_json()["status"] == "completed"
+    assert enqueued == []
+
+
+@pytest.mark.parametrize("value, status", [("false", 200), (0, 200), ("true", 202), ("maybe", 400), ([], 400)])
+def test_async_flag_is_parsed_as_a_boolean(client, workflow_instance, enqueued, value, status):
+    payload = {"workflow_id": workflow_instance.id, "async": value, "dsl": {"steps": [{"id": "a", "action": "noop"}]}}
+
+    resp = client.post("/flow/run/start", json=payload)
+
+    assert resp.status_code == status
+    assert len(enqueued) == (1 if status == 202 else 0)
+
+
+def test_worker_leaves_a_cancelled_run_alone(app_ctx, client, workflow_instance, enqueued, monkeypatch):
+    monkeypatch.setattr(orchestration, "_flask_app", app_ctx)
+    payload = {"workflow_id": workflow_instance.id, "async": True,
+               "dsl": {"steps": [{"id": "a", "action": "noop"}, {"id": "b", "action": "noop", "depends_on": ["a"]}]}}
+    run_id = client.post("/flow/run/start", json=payload).get_json()["run_id"]
+    assert client.post(f"/flow/run/{run_id}/cancel").get_json()["status"] == "cancelled"
+
+    result = orchestration.run_workflow_task.run(run_id)
+
+    assert result == {"run_id": run_id, "status": "cancelled"}
+    steps = RunStep.query.filter_by(run_id=run_id).all()
+    assert {s.status for s in steps} == {"cancelled"} and all(s.started_at is None for s in steps)
+
+
+def test_a_run_is_driven_by_one_pass_at_a_time(app_ctx, workflow_instance):
+    from backend.app.services.executor import run_workflow, start_run_from_dag
+
+    run = start_run_from_dag([{"id": "a", "action": "noop"}], workflow_id=workflow_instance.id)
+    run_id = run.id
+    # another pass holds the run
+    db.session.query(Run).filter_by(id=run_id).update({"status": "running"})
+    db.session.commit()
+
+    assert run_workflow(run_id).status == "running"
+    assert RunStep.query.filter_by(run_id=run_id, step_id="a").one().status == "pending"
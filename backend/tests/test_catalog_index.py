@@ -0,0 +1,187 @@
+# backend/tests/test_catalog_index.py
+import numpy as np
+import pytest
+from flask_jwt_extended import create_access_token
+from backend.app.database import db
+from backend.app.models import Product
+from backend.app.services.catalog_index import SegmentedEngine, catalog_index
+from backend.app.services.model_registry import recommender
+
+
+def _add(pid, title, description, esg_score=90.0):
+    db.session.add(Product(id=pid, title=title, description=description, category="dress",
+                           colors="red", esg_score=esg_score, user_id=1))
+    db.session.commit()
+
+
+def test_new_product_is_searchable_without_refit(app_ctx):
+    base = catalog_index.engine()
+    vocabulary = base.vectorizer.vocabulary_
+    word = next(iter(vocabulary))
+    _add(1000, f"{word} {word}", word)
+
+    catalog_index.product_changed(1000)
+    engine = catalog_index.engine()
+
+    assert isinstance(engine, SegmentedEngine) and engine.base is base
+    assert engine.base.vectorizer.vocabulary_ is vocabulary
+    assert engine.size == base.size + 1
+    row = engine.row_of(1000)
+    assert row == base.size and engine.esg_of(row) == (90.0, "🟢")
+    idx, _ = engine.recommend(word, 3)
+    assert row in idx.tolist()
+    assert engine.rows([row])[0]["title"] == f"{word} {word}"
+
+
+def test_updated_and_deleted_products_replace_base_rows(app_ctx):
+    base = catalog_index.engine()
+    updated, deleted = base.product_ids[:2].tolist()
+    _add(int(updated), "renamed", "renamed")
+
+    catalog_index.product_changed(updated)
+    catalog_index.product_changed(deleted)  # not in the Product table: removed
+    engine = catalog_index.engine()
+
+    assert engine.size == base.size - 1
+    assert engine.row_of(deleted) is None
+    new_row = engine.row_of(updated)
+    assert new_row >= base.size and engine.rows([new_row])[0]["title"] == "renamed"
+    for _ in range(5):
+        idx, _ = engine.recommend("dress", base.size)
+        assert not {0, 1} & set(idx.tolist())
+
+    catalog_index.reset()
+    assert recommender.get() is base
+
+
+def test_product_routes_update_the_served_catalog(client):
+    base = catalog_index.engine()
+    pid = base.product_ids[0]
+    _add(int(pid), "before", "before")
+    headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+
+    assert client.put(f"/product/{pid}", json={"title": "after"}, headers=headers).status_code == 200
+
+    engine = catalog_index.engine()
+    assert engine.rows([engine.row_of(pid)])[0]["title"] == "after"
+    assert engine.version != base.version
+
+
+class _ListRedis:
+    """The handful of Redis commands the catalog change list uses, shared in memory."""
+
+    def __init__(self):
+        self.data = {}
+
+    def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(str(v).encode() for v in values)
+        return len(self.data[key])
+
+    def llen(self, key):
+        return len(self.data.get(key, []))
+
+    def lrange(self, key, start, end):
+        return self.data.get(key, [])[start:end + 1]
+
+    def ltrim(self, key, start, end):
+        self.data[key] = self.data.get(key, [])[start:]
+
+    def mget(self, *keys):
+        return [None if self.data.get(k) is None else str(self.data[k]).encode() for k in keys]
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+
+def test_delta_past_cap_is_folded_into_a_published_artifact(app_ctx, tmp_path, monkeypatch):
+    from backend.app.config.settings import settings
+    from backend.app.services import catalog_index as module
+    from backend.app.services.recommender_artifact import load
+    from backend.app.tasks.catalog import rebuild_catalog_artifact
+
+    monkeypatch.setattr(settings, "RECOMMENDER_ARTIFACT_DIR", str(tmp_path / "artifact"))
+    shared = _ListRedis()
+    monkeypatch.setattr(catalog_index, "_redis", shared)
+    monkeypatch.setattr(catalog_index, "_redis_down_until", 0.0)
+    monkeypatch.setattr(catalog_index, "delta_max", 2)
+    queued = []
+    monkeypatch.setattr(rebuild_catalog_artifact, "apply_async", lambda *a, **kw: queued.append(1))
+
+    base = catalog_index.engine()
+    deleted = base.product_ids[0]
+    for pid in (1000, 1001, 1002):
+        _add(pid, f"new {pid}", "new")
+    catalog_index.products_changed([1000, 1001])
+    assert not queued
+    catalog_index.products_changed([1002, int(deleted)])
+    catalog_index.products_changed([1002])
+    assert len(queued) == 1  # the lock keeps later syncs from queueing another
+
+    version = catalog_index.publish_artifact()
+    assert shared.llen(module.CHANGES_KEY) == 0 and module.REBUILD_LOCK_KEY not in shared.data
+    folded = load(settings.RECOMMENDER_ARTIFACT_DIR)
+    assert folded.version == version and folded.size == base.size + 2
+    assert folded.row_of(deleted) is None and folded.row_of("1001") is not None
+
+    _add(1003, "after fold", "after")
+    catalog_index.product_changed(1003)
+    engine = catalog_index.engine()
+    assert engine.base.version == version and engine.size == folded.size + 1
+    assert engine.rows([engine.row_of(1003)])[0]["title"] == "after fold"
+    assert engine.delta.size == 1
+
+    # back to the session's artifact for the other tests
+    recommender.set(base)
+    catalog_index.reset()
+
+
+def test_replacing_rows_keeps_base_image_and_static_score(app_ctx):
+    base = catalog_index.engine()
+    pid = base.product_ids[2]
+    row = base.row_of(pid)
+    _add(int(pid), "renamed", "renamed")
+    _add(1000, "brand new", "new", esg_score=None)
+
+    catalog_index.products_changed([int(pid), 1000])
+    engine = catalog_index.engine()
+
+    new_row = engine.row_of(pid)
+    assert engine.rows([new_row])[0]["image_url"] == base.rows([row])[0]["image_url"]
+    assert engine.delta.static_scores[new_row - engine.offset] == base.static_scores[row]
+    # unscored products stay in the ESG ranking, without a score or badge
+    assert engine.esg_of(engine.row_of(1000)) == (None, "")
+    idx, _ = engine.recommend_esg("brand new", engine.size)
+    assert engine.row_of(1000) in idx.tolist()
+
+
+def test_replaced_rows_are_masked_inside_the_base_ranking(app_ctx, monkeypatch):
+    base = catalog_index.engine()
+    replaced = base.product_ids[:base.size // 2].tolist()
+    catalog_index.products_changed(int(pid) for pid in replaced)  # none in the Product table: removed
+    engine = catalog_index.engine()
+    tombstones = np.isin(np.arange(base.size), [base.row_of(pid) for pid in replaced])
+
+    expected = {method: getattr(base, method)("dress", 3, exclude=tombstones)[0].tolist()
+                for method in ("recommend", "recommend_esg")}
+
+    # k stays k: the base answers from its candidate index, never a full scan
+    monkeypatch.setattr(base, "score", lambda query: pytest.fail("full scan"))
+    for method, rows in expected.items():
+        idx, _ = getattr(engine, method)("dress", 3)
+        assert idx.tolist() == rows and rows and not tombstones[rows].any()
@@ -0,0 +1,80 @@
+# backend/tests/test_esg_scoring.py
+import io
+from flask_jwt_extended import create_access_token
+from backend.app.models import Product
+from backend.app.services.model_registry import esg_model
+from backend.app.utils.esg_module import compute_esg_score, process_product_esg
+
+PRODUCTS = [
+    {"water_use": 30, "carbon_emission": 40, "ethical_rating": 70, "material": "leather"},
+    {"water_use": 10, "carbon_emission": 20, "ethical_rating": 90, "material": "organic cotton"},
+    {"water_use": None, "carbon_emission": 20, "ethical_rating": 80, "material": "denim"},
+]
+
+
+def _headers():
+    return {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+
+
+class _CountingModel:
+    def __init__(self, model):
+        self.model = model
+        self.calls = []
+
+    def predict(self, features):
+        self.calls.append(len(features))
+        return self.model.predict(features)
+
+
+def test_batch_endpoint_scores_all_products_in_one_predict(client):
+    model = esg_model.get()
+    counting = _CountingModel(model)
+    esg_model.set(counting)
+    try:
+        resp = client.post("/api/esg-score/batch", json={"products": PRODUCTS}, headers=_headers())
+    finally:
+        esg_model.set(model)
+
+    assert resp.status_code == 200
+    assert counting.calls == [3]
+    assert resp.get_json()["results"] == [process_product_esg(p) for p in PRODUCTS]
+
+
+def test_batch_endpoint_rejects_bad_payloads(client):
+    assert client.post("/api/esg-score/batch", json={"products": "x"}, headers=_headers()).status_code == 400
+    bad_value = {"products": [{"water_use": "lots"}]}
+    assert client.post("/api/esg-score/batch", json=bad_value, headers=_headers()).status_code == 400
+    assert client.post("/api/esg-score", json=PRODUCTS[0], headers=_headers()).get_json() == process_product_esg(PRODUCTS[0])
+
+
+def test_add_product_scores_esg_in_process(client, monkeypatch):
+    monkeypatch.setattr("requests.post", lambda *a, **k: (_ for _ in ()).throw(AssertionError("HTTP call")))
+    form = {
+        "title": "Eco tee", "category": "tops", "description": "organic cotton tee",
+        "water_use": "10", "carbon_emission": "20", "ethical_rating": "90", "material": "organic cotton",
+        "product_images[]": [(io.BytesIO(b"img%d" % i), f"{i}.jpg") for i in range(4)],
+    }
+
+    resp = client.post("/product", data=form, headers=_headers(), content_type="multipart/form-data")
+
+    assert resp.status_code == 201
+    expected = compute_esg_score({"water_use": 10, "carbon_emission": 20, "ethical_rating": 90})
+    assert resp.get_json()["esg_score"] == expected
+    assert Product.query.one().esg_score == expected
+
+
+def test_add_product_logs_scoring_failures(client, monkeypatch, caplog):
+    def broken(data):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr("backend.app.routes.product_routes.compute_esg_score", broken)
+    form = {
+        "title": "Plain tee", "category": "tops", "description": "cotton tee",
+        "product_images[]": [(io.BytesIO(b"img%d" % i), f"{i}.jpg") for i in range(4)],
+    }
+
+    resp = client.post("/product", data=form, headers=_headers(), content_type="multipart/form-data")
+
+    assert resp.status_code == 201
+    assert Product.query.one().esg_score == 0.0
+    assert [str(r.exc_info[1]) for r in caplog.records if r.exc_info] == ["model unavailable"]
@@ -0,0 +1,78 @@
+# backend/tests/test_event_log.py
+import csv
+import multiprocessing
+import os
+from backend.app.event_log import EventLog
+
+FIELDS = ["timestamp", "product_id", "action"]
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_rows_are_buffered_then_written_in_one_batch(tmp_path):
+    path = str(tmp_path / "events.csv")
+    log = EventLog(path, FIELDS, batch_size=1000, flush_interval=60)
+
+    log.write(["t1", "1", "shown"])
+    log.write({"timestamp": "t2", "product_id": "2", "action": "clicked"})
+    assert not os.path.exists(path) and log.pending_count() == 2
+
+    log.flush()
+    log.write(["t3", "3", "shown"])
+    log.close()
+
+    assert _read(path) == [FIELDS, ["t1", "1", "shown"], ["t2", "2", "clicked"], ["t3", "3", "shown"]]
+    assert log.stats["written"] == 3
+
+
+def test_ring_buffer_drops_oldest_when_full(tmp_path):
+    path = str(tmp_path / "events.csv")
+    log = EventLog(path, FIELDS, capacity=2, batch_size=1000, flush_interval=60)
+
+    for i in range(3):
+        log.write([f"t{i}", str(i), "shown"])
+    log.close()
+
+    assert [row[1] for row in _read(path)[1:]] == ["1", "2"]
+    assert log.stats["dropped"] == 1
+
+
+def test_size_rotation_starts_a_new_file_with_header(tmp_path):
+    path = str(tmp_path / "events.csv")
+    log = EventLog(path, FIELDS, max_bytes=60, flush_interval=60)
+
+    for i in range(4):
+        log.write([f"t{i}", str(i), "shown"])
+        log.flush()
+
+    rotated = sorted(p for p in os.listdir(tmp_path) if p.startswith("events.") and p != "events.csv.lock")
+    assert log.stats["rotations"] >= 1 and len(rotated) == log.stats["rotations"] + 1
+    for name in rotated:
+        assert _read(str(tmp_path / name))[0] == FIELDS
+    data_rows = [row for name in rotated for row in _read(str(tmp_path / name))[1:]]
+    assert sorted(row[1] for row in data_rows) == ["0", "1", "2", "3"]
+
+
+def _write_many(path, worker):
+    log = EventLog(path, FIELDS, batch_size=50, flush_interval=0.01)
+    for i in range(500):
+        log.write([f"t{i}", f"{worker}-{i}", "x" * 200])
+    log.close()
+
+
+def test_concurrent_processes_do_not_interleave_rows(tmp_path):
+    path = str(tmp_path / "events.csv")
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_write_many, args=(path, w)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+    rows = _read(path)
+    assert rows[0] == FIELDS and FIELDS not in rows[1:]
+    assert len(rows) == 1 + 4 * 500
+    assert all(len(row) == 3 and row[2] == "x" * 200 for row in rows[1:])
@@ -0,0 +1,76 @@
+# backend/tests/test_http_cache.py
+import io
+from contextlib import contextmanager
+from datetime import datetime
+from PIL import Image
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from backend.app.database import db
+from backend.app.models import Design, Product
+from backend.app.services.image_store import image_store
+
+
+def _jpeg():
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 64)).save(buf, "JPEG")
+    return buf.getvalue()
+
+
+@contextmanager
+def _statements():
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+
+def test_catalog_page_revalidates_until_a_product_changes(client):
+    db.session.add_all([Product(id=i, title=f"p{i}", category="c", user_id=1, created_at=datetime(2026, 1, i))
+                        for i in range(1, 4)])
+    db.session.commit()
+
+    first = client.get("/product?limit=2")
+    assert first.status_code == 200 and first.headers["Cache-Control"].startswith("public")
+    etag = first.headers["ETag"]
+    assert [p["id"] for p in first.get_json()["products"]] == [3, 2]
+
+    assert client.get("/product?limit=2", headers={"If-None-Match": etag}).status_code == 304
+    # other pages and other rows do not share or disturb the validator
+    assert client.get("/product?limit=2&offset=1", headers={"If-None-Match": etag}).status_code == 200
+    Product.query.get(1).title = "changed"
+    db.session.commit()
+    assert client.get("/product?limit=2", headers={"If-None-Match": etag}).status_code == 304
+
+    headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+    assert client.put("/product/2", json={"title": "renamed"}, headers=headers).status_code == 200
+    after = client.get("/product?limit=2", headers={"If-None-Match": etag})
+    assert after.status_code == 200 and after.get_json()["products"][1]["title"] == "renamed"
+
+
+def test_design_image_304_skips_the_blob(client):
+    jpeg = _jpeg()
+    stored = Design(title="t", description="d", category="c", image_mime="image/jpeg", user_id=1)
+    legacy = Design(title="t", description="d", category="c", image_mime="image/jpeg", user_id=1, image_url=jpeg)
+    stored.image_key = image_store.put(jpeg)
+    db.session.add_all([stored, legacy])
+    db.session.commit()
+
+    for design in (stored, legacy):
+        url = f"/designs/design-image/{design.id}"
+        resp = client.get(url)
+        assert resp.data == jpeg and resp.headers["Cache-Control"] == "public, max-age=300"
+
+        with _statements() as statements:
+            again = client.get(url, headers={"If-None-Match": resp.headers["ETag"]})
+
+        assert again.status_code == 304 and again.data == b""
+        selects = [st for st in statements if st.startswith("SELECT")]
+        assert len(selects) == 1 and "image_url" not in selects[0].split("FROM")[0]
+
+    assert client.get("/designs/design-image/999").status_code == 404
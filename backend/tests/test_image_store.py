@@ -0,0 +1,88 @@
+# backend/tests/test_image_store.py
+import io
+from PIL import Image
+from flask_jwt_extended import create_access_token
+from backend.app.database import db
+from backend.app.models import Design, Product, ProductImage, User
+from backend.app.services.image_store import image_store, move_blobs
+
+
+def _image(mode="RGB", size=(800, 600), fmt="JPEG"):
+    buf = io.BytesIO()
+    Image.new(mode, size).save(buf, fmt)
+    return buf.getvalue()
+
+
+def _headers():
+    return {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+
+
+def test_store_dedupes_and_generates_thumbnails():
+    jpeg, png = _image(), _image("RGBA", (300, 900), "PNG")
+
+    key = image_store.put(jpeg)
+    assert image_store.put(jpeg) == key and image_store.read(key) == jpeg
+
+    path, mimetype = image_store.open_path(key, 128)
+    assert mimetype == "image/jpeg" and Image.open(path).size == (128, 96)
+    path, mimetype = image_store.open_path(image_store.put(png), 512)
+    assert mimetype == "image/png" and Image.open(path).size == (171, 512)
+
+    # undecodable bytes and unconfigured sizes fall back to the original
+    junk = image_store.put(b"not an image")
+    assert image_store.open_path(junk, 128) == (image_store.path(junk), "application/octet-stream")
+    assert image_store.open_path(key, 300)[0] == image_store.path(key)
+    assert image_store.open_path("../" + key) is None
+
+
+def test_design_lists_return_urls_served_with_immutable_caching(client):
+    jpeg = _image()
+    data = {"title": "Look", "description": "d", "category": "Dresses", "image": (io.BytesIO(jpeg), "look.jpg", "image/jpeg")}
+    db.session.add(User(id=1, name="A", email="a@example.com", password_hash="x"))
+    db.session.commit()
+
+    assert client.post("/designs/upload", data=data, headers=_headers(), content_type="multipart/form-data").status_code == 200
+    design = client.get("/designs/designs").get_json()[0]
+
+    assert design["image_data_url"] == design["image"]["thumbnails"]["512"]
+    resp = client.get(design["image"]["url"])
+    assert resp.data == jpeg and resp.mimetype == "image/jpeg"
+    assert "immutable" in resp.headers["Cache-Control"]
+    assert client.get(design["image"]["url"], headers={"If-None-Match": resp.headers["ETag"]}).status_code == 304
+    thumb = client.get(design["image_data_url"])
+    assert Image.open(io.BytesIO(thumb.data)).size == (512, 384)
+    assert Design.query.one().image_url is None
+
+
+def test_my_products_links_stored_and_legacy_images(client):
+    jpeg = _image()
+    product = Product(title="Tee", category="tops", user_id=1, images=[
+        ProductImage(image_key=image_store.put(jpeg), image_mime="image/jpeg"),
+        ProductImage(image_data=b"legacy bytes"),
+    ])
+    db.session.add(product)
+    db.session.commit()
+
+    listed = client.get("/product/my-products", headers=_headers()).get_json()[0]
+
+    stored, legacy = listed["image_urls"]
+    assert listed["images"] == [stored["preview"], legacy["preview"]]
+    assert client.get(stored["url"]).data == jpeg
+    assert client.get(legacy["url"]).data == b"legacy bytes"
+
+
+def test_move_blobs_empties_the_tables(app_ctx):
+    jpeg = _image()
+    db.session.add(Product(id=1, title="Tee", category="tops", user_id=1,
+                           images=[ProductImage(image_data=jpeg), ProductImage(image_data=jpeg)]))
+    db.session.add(Design(title="t", description="d", category="c", image_url=jpeg, image_mime="image/jpeg", user_id=1))
+    db.session.commit()
+
+    with db.engine.begin() as connection:
+        assert move_blobs(connection, batch_size=1) == 3
+        assert move_blobs(connection) == 0
+    db.session.expire_all()
+
+    keys = {img.image_key for img in ProductImage.query} | {Design.query.one().image_key}
+    assert len(keys) == 1 and image_store.read(keys.pop()) == jpeg
+    assert all(img.image_data is None and img.image_mime == "image/jpeg" for img in ProductImage.query)
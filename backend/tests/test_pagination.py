@@ -0,0 +1,96 @@
+# backend/tests/test_pagination.py
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from backend.app.database import db
+from backend.app.models import Design, Product, ProductImage
+
+
+@contextmanager
+def _selects():
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        if statement.startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+
+def _seed_products(n):
+    start = datetime(2026, 1, 1)
+    for i in range(1, n + 1):
+        # pairs share a created_at, so the id breaks ties
+        db.session.add(Product(id=i, title=f"p{i}", category="c", user_id=1,
+                               created_at=start + timedelta(minutes=i // 2),
+                               images=[ProductImage(image_data=b"x" * 1000) for _ in range(2)]))
+    db.session.commit()
+
+
+def test_catalog_cursor_walks_every_product_once_newest_first(client):
+    _seed_products(25)
+    expected = [p.id for p in Product.query.order_by(Product.created_at.desc(), Product.id.desc())]
+
+    seen, cursor = [], None
+    while True:
+        url = "/product?limit=10" + (f"&cursor={cursor}" if cursor else "")
+        with _selects() as selects:
+            body = client.get(url).get_json()
+        # page keys, page rows, image ids: no per-product lazy loads and no image bytes
+        assert len(selects) == 3
+        assert not any("image_data" in s for s in selects)
+        assert all(len(p["images"]) == 2 for p in body["products"])
+        seen += [p["id"] for p in body["products"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == expected
+    # the older offset paging returns the same order
+    legacy = client.get("/product?limit=5&offset=10").get_json()
+    assert [p["id"] for p in legacy["products"]] == expected[10:15] and legacy["next_cursor"]
+    assert client.get("/product?cursor=not-a-cursor").status_code == 400
+
+
+def test_design_gallery_pages_without_loading_blobs(client):
+    for i in range(5):
+        db.session.add(Design(title=f"d{i}", description="d", category="c", image_mime="image/png",
+                              image_url=b"x" * 1000, user_id=1, timestamp=datetime(2026, 1, 1)))
+    db.session.commit()
+
+    with _selects() as selects:
+        first = client.get("/designs/designs?limit=3")
+    assert not any("image_url" in s.split("FROM")[0] for s in selects)
+    assert [d["title"] for d in first.get_json()] == ["d4", "d3", "d2"]
+
+    second = client.get(first.headers["Link"].split(";")[0].strip("<>"))
+    assert [d["title"] for d in second.get_json()] == ["d1", "d0"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_my_designs_follow_the_cursor_within_a_category(client, seed_roles_and_users):
+    _, alice = seed_roles_and_users
+    for i in range(5):
+        db.session.add(Design(title=f"d{i}", description="d", category="Casual" if i % 2 else "Formal",
+                              image_mime="image/png", user_id=alice.id, timestamp=datetime(2026, 1, 1, i)))
+    db.session.add(Design(title="other", description="d", category="Casual", image_mime="image/png",
+                          user_id=alice.id + 100, timestamp=datetime(2026, 1, 2)))
+    db.session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(alice.id))}"}
+
+    first = client.get("/designs/my-designs?limit=2", headers=headers)
+    assert [d["title"] for d in first.get_json()] == ["d4", "d3"]
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/designs/my-designs?limit=2&cursor={cursor}", headers=headers)
+    assert [d["title"] for d in second.get_json()] == ["d2", "d1"]
+
+    casual = client.get("/designs/my-designs?category=Casual&limit=1", headers=headers)
+    assert [d["title"] for d in casual.get_json()] == ["d3"]
+    rest = client.get(casual.headers["Link"].split(";")[0].strip("<>"), headers=headers)
+    assert [d["title"] for d in rest.get_json()] == ["d1"]
+    assert "X-Next-Cursor" not in rest.headers
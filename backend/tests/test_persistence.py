@@ -0,0 +1,67 @@
+# backend/tests/test_persistence.py
+from backend.app.database import db
+from backend.app.models import WorkflowDef, Run, RunStep
+from backend.app import persistence
+
+
+def _make_run():
+    wf = WorkflowDef(name="Persistence Workflow", version="1.0", dsl_yaml="steps: []", created_by="pytest")
+    db.session.add(wf)
+    db.session.commit()
+    return persistence.create_run(db.session, wf.id, "1.0")
+
+
+def test_create_run_steps_bulk_inserts_rows(app_ctx):
+    run = _make_run()
+    created = persistence.create_run_steps(db.session, run.id, [{"id": f"s{i}"} for i in range(25)])
+
+    assert [s.step_id for s in created] == [f"s{i}" for i in range(25)]
+    assert RunStep.query.filter_by(run_id=run.id, status="pending").count() == 25
+
+
+def test_step_write_buffer_groups_transitions(app_ctx):
+    run = _make_run()
+    persistence.create_run_steps(db.session, run.id, [{"id": "a"}, {"id": "b"}, {"id": "c"}])
+
+    writes = persistence.StepWriteBuffer(db.session, run.id)
+    writes.transition("a", "running")
+    writes.transition("b", "running")
+    writes.commit()
+    writes.transition("a", "done")
+    writes.transition("b", "failed")
+    writes.commit()
+
+    steps = {s.step_id: s for s in RunStep.query.filter_by(run_id=run.id).all()}
+    assert steps["a"].status == "done" and steps["a"].attempt == 1 and steps["a"].ended_at
+    assert steps["b"].status == "failed"
+    assert steps["c"].status == "pending" and steps["c"].started_at is None
+
+
+def test_update_step_finish_rolls_up_run_status(app_ctx):
+    run = _make_run()
+    persistence.create_run_steps(db.session, run.id, [{"id": "a"}, {"id": "b"}])
+
+    for sid in ("a", "b"):
+        persistence.update_step_start(db.session, run.id, sid)
+        step = persistence.update_step_finish(db.session, run.id, sid, True, '{"ok": true}', None)
+        assert step.status == "success"
+
+    assert db.session.get(Run, run.id).status == "succeeded"
+
+
+def test_running_transitions_only_claim_pending_steps(app_ctx):
+    run = _make_run()
+    persistence.create_run_steps(db.session, run.id, [{"id": "a"}, {"id": "b"}])
+    RunStep.query.filter_by(run_id=run.id, step_id="b").update({"status": "cancelled"})
+    db.session.commit()
+
+    writes = persistence.StepWriteBuffer(db.session, run.id)
+    writes.transition("a", "running")
+    writes.transition("b", "running")
+    assert writes.commit() == [("a", "running")]
+    # a second claim of the same step finds it running already
+    assert persistence.claim_steps(db.session, run.id, ["a", "b"]) == []
+
+    steps = {s.step_id: s for s in RunStep.query.filter_by(run_id=run.id).all()}
+    assert (steps["a"].status, steps["a"].attempt) == ("running", 1)
+    assert steps["b"].status == "cancelled" and steps["b"].started_at is None
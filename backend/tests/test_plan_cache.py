@@ -0,0 +1,79 @@
+# backend/tests/test_plan_cache.py
+import pytest
+from flask_jwt_extended import create_access_token
+from backend.app.database import db
+from backend.app.models import WorkflowDef, RunStep
+from backend.app.routes import workflow_routes
+from backend.app.services import planner
+from backend.app.services.plan_cache import PlanCache, build_plan, plan_cache, plan_key
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    plan_cache.clear()
+    yield
+    plan_cache.clear()
+
+
+def test_build_plan_indexes_graph():
+    plan = build_plan(["a", "b", "c", "d"], [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")])
+
+    assert plan.topo_ids == ["a", "b", "c", "d"]
+    assert plan.entry == frozenset({"a"})
+    assert plan.preds[3] == (1, 2)
+    assert plan.succs[0] == (1, 2)
+
+
+def test_build_plan_rejects_cycles_and_unknown_deps():
+    with pytest.raises(ValueError, match="Cycle"):
+        build_plan(["a", "b"], [("a", "b"), ("b", "a")])
+    with pytest.raises(ValueError, match="unknown step 'x'"):
+        build_plan(["a"], [("x", "a")])
+
+
+def test_lru_evicts_least_recently_used():
+    cache = PlanCache(maxsize=2)
+    cache.put("k1", "p1")
+    cache.put("k2", "p2")
+    assert cache.get("k1") == "p1"      # k2 becomes least recent
+    cache.put("k3", "p3")
+
+    assert cache.get("k2") is None
+    assert cache.get("k1") == "p1" and cache.get("k3") == "p3"
+
+
+def test_parse_dsl_is_compiled_once_per_content_and_version():
+    dsl = "steps:\n  - id: a\n  - id: b\n    depends_on: [a]\n"
+
+    first = planner.parse_dsl(dsl, "1.0")
+    again = planner.parse_dsl(dsl, "1.0")
+    other_version = planner.parse_dsl(dsl, "2.0")
+
+    assert first is again
+    assert other_version is not first
+    assert plan_cache.stats()["misses"] == 2
+    assert planner.compile_dsl(dsl, "1.0").entry == frozenset({"a"})
+    assert plan_key("planner", {"x": 1, "y": 2}) == plan_key("planner", {"y": 2, "x": 1})
+
+
+def test_workflow_start_reuses_compiled_plan(client, monkeypatch):
+    wf = WorkflowDef(
+        name="Cached", version="1.0", created_by="pytest",
+        dsl_yaml="steps:\n  - id: A\n    type: task\n  - id: B\n    type: task\n    depends_on: A\n",
+    )
+    db.session.add(wf)
+    db.session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+
+    calls = []
+    compile_yaml = workflow_routes._compile_yaml
+    monkeypatch.setattr(workflow_routes, "_compile_yaml", lambda text: calls.append(text) or compile_yaml(text))
+
+    for _ in range(3):
+        resp = client.post(f"/flow/workflows/{wf.id}/start", headers=headers)
+        assert resp.status_code == 200
+        run_id = resp.get_json()["run_id"]
+
+    assert len(calls) == 1
+    steps = RunStep.query.filter_by(run_id=run_id).order_by(RunStep.id).all()
+    assert [s.step_id for s in steps] == ["A", "B"]
@@ -0,0 +1,107 @@
+# backend/tests/test_product_import.py
+import csv
+import json
+import pytest
+from flask_jwt_extended import create_access_token
+from backend.app.models import Product, ProductImage, ProductImport
+from backend.app.services import product_import
+from backend.app.services.catalog_index import catalog_index
+from backend.app.services.image_store import image_store
+from backend.app.utils.esg_module import compute_esg_score
+
+FIELDS = ["title", "category", "description", "brand", "sale_price", "colors",
+          "water_use", "carbon_emission", "ethical_rating", "material", "images"]
+
+
+def _catalog(tmp_path, rows):
+    images = tmp_path / "images"
+    images.mkdir()
+    for i in range(4):
+        (images / f"{i}.jpg").write_bytes(b"img%d" % i)
+    manifest = tmp_path / "catalog.csv"
+    with open(manifest, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(manifest), str(images)
+
+
+def _row(i, **overrides):
+    row = {"title": f"Linen shirt {i}", "category": "tops", "description": "breezy linen shirt",
+           "brand": "Acme", "sale_price": "19.5", "colors": "white", "water_use": str(10 + i),
+           "carbon_emission": "20", "ethical_rating": "80", "material": "linen",
+           "images": "0.jpg;1.jpg;2.jpg;3.jpg"}
+    row.update(overrides)
+    return row
+
+
+def test_import_validates_scores_and_publishes_in_chunks(app_ctx, tmp_path, monkeypatch):
+    published = []
+    changed = catalog_index.products_changed
+    monkeypatch.setattr(catalog_index, "products_changed", lambda ids: (published.append(list(ids)), changed(ids)))
+    rows = [_row(0), _row(1, title=""), _row(2), _row(3, images="0.jpg;1.jpg;2.jpg;missing.jpg"),
+            _row(4, sale_price="cheap"), _row(5)]
+    manifest, images = _catalog(tmp_path, rows)
+    progress = []
+
+    job = product_import.start_import(manifest, images, user_id=1)
+    job = product_import.run_import(job.id, chunk_size=4, progress=lambda j: progress.append(j.rows_done))
+
+    assert progress == [4, 6]
+    assert (job.status, job.rows_done, job.inserted, job.rejected) == ("completed", 6, 3, 3)
+    assert [e["row"] for e in job.errors] == [2, 4, 5]
+    products = Product.query.order_by(Product.id).all()
+    assert [p.title for p in products] == ["Linen shirt 0", "Linen shirt 2", "Linen shirt 5"]
+    assert products[1].esg_score == compute_esg_score({"water_use": 12, "carbon_emission": 20, "ethical_rating": 80})
+    assert ProductImage.query.count() == 12
+    assert [image_store.read(img.image_key) for img in products[0].images] == [b"img0", b"img1", b"img2", b"img3"]
+
+    # one delta rebuild for the whole job
+    assert published == [[p.id for p in products]]
+    engine = catalog_index.engine()
+    assert all(engine.row_of(p.id) is not None for p in products)
+
+
+def test_interrupted_import_resumes_after_last_committed_chunk(app_ctx, tmp_path):
+    manifest, images = _catalog(tmp_path, [_row(i) for i in range(5)])
+    job = product_import.start_import(manifest, images, user_id=1)
+
+    def crash(_):
+        raise RuntimeError("worker lost")
+
+    with pytest.raises(RuntimeError):
+        product_import.run_import(job.id, chunk_size=2, progress=crash)
+    assert (job.status, job.rows_done, Product.query.count()) == ("failed", 2, 2)
+
+    resumed = product_import.start_import(manifest, images, user_id=1)
+    assert resumed.id == job.id
+    resumed = product_import.run_import(resumed.id, chunk_size=2)
+
+    assert (resumed.status, resumed.rows_done, resumed.inserted) == ("completed", 5, 5)
+    assert sorted(p.title for p in Product.query) == [f"Linen shirt {i}" for i in range(5)]
+    # a finished manifest starts a fresh job
+    assert product_import.start_import(manifest, images, user_id=1).id != job.id
+
+
+def test_import_route_enqueues_jsonl_job(client, tmp_path, monkeypatch):
+    manifest, images = _catalog(tmp_path, [])
+    jsonl = tmp_path / "catalog.jsonl"
+    jsonl.write_text(json.dumps(dict(_row(0), images=["0.jpg", "1.jpg", "2.jpg", "3.jpg"])) + "\n")
+    client.application.config["PRODUCT_IMPORT_DIR"] = str(tmp_path)
+    enqueued = []
+    monkeypatch.setattr("backend.app.tasks.product_import.import_products_task.apply_async",
+                        lambda args: enqueued.append(args))
+    headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+
+    escaped = client.post("/product/import", json={"manifest": "../x.csv", "image_dir": "images"}, headers=headers)
+    assert escaped.status_code == 400
+
+    resp = client.post("/product/import", json={"manifest": "catalog.jsonl", "image_dir": "images"}, headers=headers)
+    assert resp.status_code == 202
+    job_id = resp.get_json()["import"]["id"]
+    assert enqueued == [[job_id]]
+
+    product_import.run_import(job_id)
+    status = client.get(resp.headers["Location"], headers=headers).get_json()
+    assert (status["status"], status["inserted"]) == ("completed", 1)
+    assert ProductImport.query.count() == 1 and Product.query.one().title == "Linen shirt 0"
@@ -0,0 +1,76 @@
+# backend/tests/test_query_cache.py
+from flask_jwt_extended import create_access_token
+from backend.app.database import db
+from backend.app.models import Product
+from backend.app.services.model_registry import recommender
+from backend.app.services.query_cache import QueryCache, normalize_query
+
+
+def _headers():
+    return {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+
+
+def _count_calls(monkeypatch, engine, name):
+    calls = []
+    original = getattr(engine, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(engine, name, wrapper)
+    return calls
+
+
+def test_normalize_query():
+    assert normalize_query("  Floral   DRESS ") == "floral dress"
+
+
+def test_repeated_queries_are_served_from_cache(client, monkeypatch):
+    calls = _count_calls(monkeypatch, recommender.get(), "recommend")
+
+    first = client.post("/api/recommend", json={"query": "floral dress", "k": 4}, headers=_headers())
+    again = client.post("/api/recommend", json={"query": "  Floral   dress", "k": 4}, headers=_headers())
+    other_k = client.post("/api/recommend", json={"query": "floral dress", "k": 2}, headers=_headers())
+
+    assert first.get_json() == again.get_json()
+    assert len(other_k.get_json()["results"]) == 2
+    assert len(calls) == 2
+
+
+def test_product_writes_invalidate_recommend_full(client, monkeypatch):
+    engine = recommender.get()
+    # same text as the catalog, so re-indexing an edited product keeps its rank
+    for row, esg_score in zip(engine.rows(range(engine.size)), engine.esg_scores.tolist()):
+        db.session.add(Product(id=int(row["product_id"]), title=row["title"], description=row["description"],
+                               category="c", user_id=1, esg_score=esg_score))
+    db.session.commit()
+    calls = _count_calls(monkeypatch, engine, "recommend_esg")
+
+    first = client.post("/api/recommend-full", json={"query": "floral dress", "k": 3}, headers=_headers())
+    top_id = first.get_json()["results"][0]["id"]
+    client.post("/api/recommend-full", json={"query": "floral dress", "k": 3}, headers=_headers())
+    assert len(calls) == 1
+
+    resp = client.put(f"/product/{top_id}", json={"brand": "Acme"}, headers=_headers())
+    assert resp.status_code == 200
+    after = client.post("/api/recommend-full", json={"query": "floral dress", "k": 3}, headers=_headers())
+
+    assert len(calls) == 2
+    assert after.get_json()["results"][0]["brand"] == "Acme"
+
+
+def test_local_tier_expires_and_evicts():
+    cache = QueryCache(maxsize=2, ttl=60)
+    keys = [cache.key("recommend", f"q{i}", 3, "v1") for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, {"n": i})
+
+    assert cache.get(keys[0]) is None  # least recently used, evicted
+    assert cache.get(keys[2]) == {"n": 2}
+    # a new engine version never sees the old entries
+    assert cache.get(cache.key("recommend", "q2", 3, "v2")) is None
+
+    cache.ttl = -1
+    cache.put(keys[1], {"n": 1})
+    assert cache.get(keys[1]) is None
@@ -0,0 +1,215 @@
+# backend/tests/test_recommender.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from flask_jwt_extended import create_access_token
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from backend.app.database import db
+from backend.app.models import Product
+import threading
+from backend.app.services import recommender_artifact
+from backend.app.services.catalog_index import catalog_index
+from backend.app.services.model_registry import ModelRegistry, recommender
+from backend.app.services.recommender import RecommendationEngine, top_k
+from backend.app.services.retrieval import build_index
+from backend.app.services.retrieval_benchmark import benchmark, synthetic_engine
+
+
+@pytest.fixture
+def engine():
+    catalog = pd.DataFrame({
+        "product_id": ["1", "2", "3", "4"],
+        "title": ["red dress", "blue jeans", "red scarf", "green coat"],
+        "descriptions": ["summer dress", "denim jeans", "wool scarf", "warm coat"],
+        "category": ["dress", "denim", "accessory", "outerwear"],
+        "color": ["red", "blue", "red", "green"],
+        "image_url": ["a", "b", "c", "d"],
+        "esg_score": [40.0, 90.0, 75.0, 60.0],
+        "esg_badge": ["🔴", "🟢", "🟡", "🟡"],
+    })
+    text = catalog["title"] + " " + catalog["descriptions"]
+    tfidf = TfidfVectorizer(stop_words="english")
+    matrix = tfidf.fit_transform(text)
+    similarities = np.array([[1, .2, .9, .1], [.2, 1, .1, .3], [.9, .1, 1, .2], [.1, .3, .2, .5]])
+    return RecommendationEngine.from_catalog(catalog, similarities, tfidf, matrix), tfidf, matrix, similarities
+
+
+def test_top_k_matches_full_sort():
+    scores = np.random.default_rng(0).random(10_000)
+    scores[[5, 17]] = 2.0  # tie at the top keeps catalog order
+
+    expected = [i for i, _ in sorted(enumerate(scores), key=lambda x: x[1], reverse=True)[:25]]
+
+    assert top_k(scores, 25).tolist() == expected
+    assert top_k(scores, 0).size == 0
+    # ties straddling the k-th place also keep catalog order
+    assert top_k(np.array([1.0, 2.0, 1.0, 1.0, 1.0]), 3).tolist() == [1, 0, 2]
+    assert top_k(scores[:3], 10).size == 3
+
+
+def test_engine_scores_match_reference_formula(engine):
+    eng, tfidf, matrix, similarities = engine
+    text = cosine_similarity(tfidf.transform(["red dress"]), matrix).flatten()
+    reference = 0.6 * text + 0.2 * np.max(similarities, axis=1) + 0.2 * np.max(similarities, axis=1)
+
+    idx, scores = eng.recommend("red dress", 2)
+
+    np.testing.assert_allclose(eng.score("red dress"), reference)
+    assert idx.tolist() == [0, 2]
+    rows = eng.rows(idx, scores)
+    assert rows[0] == {
+        "product_id": "1", "title": "red dress", "description": "summer dress",
+        "category": "dress", "color": "red", "image_url": "a", "score": pytest.approx(reference[0]),
+    }
+
+
+def test_recommend_endpoint_honours_k(client):
+    headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+
+    resp = client.post("/api/recommend", json={"query": "floral dress", "k": 5}, headers=headers)
+    assert resp.status_code == 200
+    results = resp.get_json()["results"]
+    assert len(results) == 5
+    assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+
+    assert client.post("/api/recommend", json={"query": "dress", "k": 0}, headers=headers).status_code == 400
+
+
+def test_esg_stage_boosts_and_filters(engine):
+    eng = engine[0]
+    base = eng.score("red")
+
+    idx, scores = eng.recommend_esg("red", 10)
+
+    # row 0 (ESG 40) is filtered; rows 1/2 boosted x1.2/x1.1; row 3 unboosted
+    assert 0 not in idx.tolist() and len(idx) == 3
+    expected = {1: base[1] * 1.2, 2: base[2] * 1.1, 3: base[3]}
+    assert dict(zip(idx.tolist(), scores.tolist())) == pytest.approx(expected)
+    assert scores.tolist() == sorted(scores.tolist(), reverse=True)
+    assert eng.row_of(3) == 2 and eng.row_of("99") is None
+
+
+def test_recommend_full_returns_ranked_eligible_products(client):
+    engine = recommender.get()
+    for pid in engine.product_ids.tolist():
+        db.session.add(Product(id=int(pid), title=f"p{pid}", category="c", user_id=1))
+    db.session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+
+    resp = client.post("/api/recommend-full", json={"query": "floral dress", "k": 4}, headers=headers)
+
+    assert resp.status_code == 200
+    results = resp.get_json()["results"]
+    assert 0 < len(results) <= 4
+    assert all(r["esg_score"] >= 50 for r in results)
+    assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+
+
+
+def test_recommend_errors_are_logged_not_returned(client, monkeypatch, caplog):
+    def broken():
+        raise RuntimeError("secret detail")
+
+    monkeypatch.setattr(catalog_index, "engine", broken)
+    headers = {"Authorization": f"Bearer {create_access_token(identity='1')}"}
+
+    for route in ("/api/recommend", "/api/recommend-full"):
+        resp = client.post(route, json={"query": "dress"}, headers=headers)
+        assert resp.status_code == 500
+        assert resp.get_json() == {"error": "Internal server error"}
+    assert [str(r.exc_info[1]) for r in caplog.records if r.exc_info] == ["secret detail"] * 2
+
+def test_registry_loads_once_on_first_use():
+    calls = []
+    gate = threading.Event()
+
+    def loader():
+        calls.append(1)
+        gate.wait(1)
+        return "model"
+
+    registry = ModelRegistry("test", loader)
+    assert not registry.is_ready() and calls == []
+
+    registry.warm_up()
+    results = []
+    readers = [threading.Thread(target=lambda: results.append(registry.get())) for _ in range(4)]
+    for t in readers:
+        t.start()
+    gate.set()
+    for t in readers:
+        t.join()
+
+    assert results == ["model"] * 4 and calls == [1]
+
+
+def test_artifact_round_trip_and_staleness(tmp_path):
+    model_path, esg_path, _ = recommender_artifact.default_paths()
+    artifact_dir = str(tmp_path / "artifact")
+
+    built = recommender_artifact.load_or_build(model_path, esg_path, artifact_dir)
+    signature = recommender_artifact.source_signature(model_path, esg_path)
+    # readable by workers running as another user than the build
+    assert os.stat(artifact_dir).st_mode & 0o777 == 0o755
+    loaded = recommender_artifact.load(artifact_dir, signature)
+
+    np.testing.assert_allclose(loaded.score("floral dress"), built.score("floral dress"))
+    np.testing.assert_array_equal(loaded.esg_scores, built.esg_scores)
+    assert loaded.product_ids.tolist() == built.product_ids.tolist()
+    # an artifact built from other sources is ignored
+    assert recommender_artifact.load(artifact_dir, {**signature, "version": -1}) is None
+
+
+def test_artifact_arrays_are_shared_memory_maps(tmp_path):
+    model_path, esg_path, _ = recommender_artifact.default_paths()
+    artifact_dir = str(tmp_path / "artifact")
+
+    assert recommender_artifact.main(["build", "--model", model_path, "--esg-model", esg_path,
+                                      "--out", artifact_dir]) == 0
+    engine = recommender_artifact.load(artifact_dir)
+
+    mapped = [engine.static_scores, engine.esg_scores, engine.similarities,
+              *(part for col in engine.columns.values() for part in (col.offsets, col.data))]
+    assert all(isinstance(a, np.memmap) and not a.flags.writeable for a in mapped)
+    # scipy wraps the CSR components in views, but still over the mapped files
+    assert not engine.tfidf_matrix.data.flags.owndata and not engine.tfidf_matrix.data.flags.writeable
+    assert engine.similarities.shape == (engine.size, engine.size)
+    # text columns cost their UTF-8 bytes, not rows x the longest value, and still
+    # materialize plain JSON-able rows
+    description = engine.columns["description"]
+    assert description.data.nbytes == sum(len(d.encode()) for d in description.tolist())
+    idx, scores = engine.recommend("floral dress", 3)
+    rows = engine.rows(idx, scores)
+    assert all(isinstance(r["title"], str) for r in rows)
+    assert [r["product_id"] for r in rows] == [engine.product_ids[i] for i in idx]
+
+
+def test_inverted_index_matches_full_scan(engine):
+    eng = engine[0]
+    full = [(eng.recommend(q, 3), eng.recommend_esg(q, 3)) for q in ("red dress", "coat", "nothing")]
+
+    eng.index = build_index("inverted", eng.tfidf_matrix)
+    for q, (plain, esg) in zip(("red dress", "coat", "nothing"), full):
+        idx, scores = eng.recommend(q, 3)
+        assert idx.tolist() == plain[0].tolist()
+        np.testing.assert_allclose(scores, plain[1])
+        idx, scores = eng.recommend_esg(q, 3)
+        assert idx.tolist() == esg[0].tolist()
+        np.testing.assert_allclose(scores, esg[1])
+
+
+def test_benchmark_reports_recall_against_exact():
+    eng, queries = synthetic_engine(2000, vocab_size=300, seed=1)
+    configs = {
+        "exact": {"kind": "exact"},
+        "inverted": {"kind": "inverted"},
+        "ivf": {"kind": "ivf", "n_lists": 8, "n_probe": 8},  # probing every cell is exhaustive
+    }
+
+    results = {row["index"]: row for row in benchmark(eng, queries[:20], 5, configs)}
+
+    assert results["exact"]["recall"] == 1.0
+    assert results["inverted"]["recall"] == 1.0
+    assert results["ivf"]["recall"] == 1.0
@@ -0,0 +1,53 @@
+# backend/tests/test_request_audit.py
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from backend.app.database import db
+from backend.app.models import RequestLog
+from backend.app.request_audit import RequestAudit, parse_sample_rules, request_audit
+
+
+def test_requests_are_queued_then_bulk_inserted(client, seed_roles_and_users):
+    _, alice = seed_roles_and_users
+    request_audit.flush()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=str(alice.id))}"}
+    inserts = []
+
+    def listener(conn, cursor, statement, *args):
+        if statement.startswith("INSERT INTO request_log"):
+            inserts.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        client.get("/product")
+        client.get("/auth/profile", headers=headers)
+        client.get("/metrics")
+        client.get("/scripts/missing.js")
+        assert not inserts and request_audit.pending_count() == 2
+        flushed = request_audit.stats["flushed"]
+        request_audit.flush()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+    # one executemany for the whole batch; excluded paths never queued
+    assert len(inserts) == 1 and request_audit.stats["flushed"] == flushed + 2
+    rows = RequestLog.query.order_by(RequestLog.id).all()
+    assert [(r.endpoint, r.user_id) for r in rows] == [("/product", None), ("/auth/profile", alice.id)]
+    assert all(r.timestamp is not None for r in rows)
+
+
+def test_sampling_rules_and_overflow(app_ctx):
+    audit = RequestAudit(capacity=2, flush_interval=3600, sample_rate=1.0,
+                         rules=parse_sample_rules("/product=0,/product/images/=1"), exclude=("/metrics",))
+    audit.init_app(app_ctx)
+
+    assert audit.wants("/product/images/3") and audit.wants("/auth/profile")
+    assert not audit.wants("/product") and not audit.wants("/metrics")
+    assert audit.stats["sampled_out"] == 1
+
+    for i in range(3):
+        audit.record(f"/r{i}")
+    assert audit.stats["dropped"] == 1
+    audit.close()
+
+    assert [r.endpoint for r in RequestLog.query.order_by(RequestLog.id)] == ["/r1", "/r2"]
+    assert audit.stats["flushed"] == 2
@@ -0,0 +1,114 @@
+# backend/tests/test_scheduler.py
+import pytest
+from backend.app.database import db
+from backend.app.models import WorkflowDef, RunStep
+from backend.app.services.scheduler import DagScheduler
+from backend.app.services.executor import start_run_from_dag, run_workflow
+
+
+@pytest.fixture
+def workflow_instance(app_ctx):
+    wf = WorkflowDef(name="Scheduler Workflow", version="1.0", dsl_yaml="steps: []", created_by="pytest")
+    db.session.add(wf)
+    db.session.commit()
+    return wf
+
+
+def test_scheduler_releases_successors_once_all_preds_done():
+    preds = {"a": set(), "b": {"a"}, "c": {"a"}, "d": {"b", "c"}}
+    sched = DagScheduler(["a", "b", "c", "d"], preds, {s: "pending" for s in preds})
+
+    assert sched.pop() == "a"
+    assert not sched.has_ready()
+    assert sched.mark_done("a") == ["b", "c"]
+
+    assert sched.pop() == "b"
+    assert sched.mark_done("b") == []
+    assert sched.pop() == "c"
+    assert sched.mark_done("c") == ["d"]
+    assert sched.pop() == "d"
+    sched.mark_done("d")
+    assert sched.blocked() == []
+
+
+def test_scheduler_resumes_from_existing_statuses():
+    preds = {"a": set(), "b": {"a"}, "c": {"b"}}
+    sched = DagScheduler(["a", "b", "c"], preds, {"a": "done", "b": "pending", "c": "pending"})
+
+    assert sched.pop() == "b"
+    assert sched.blocked() == ["c"]
+
+
+def test_scheduler_parked_step_blocks_successors():
+    preds = {"a": set(), "b": {"a"}}
+    sched = DagScheduler(["a", "b"], preds, {"a": "pending", "b": "pending"})
+
+    sched.park(sched.pop())
+    assert sched.waiting == ["a"]
+    assert sched.blocked() == ["b"]
+
+
+def test_run_workflow_fan_out_completes(workflow_instance):
+    steps = [{"step_id": "root", "action": "noop"}]
+    steps += [{"step_id": f"leaf{i}", "action": "noop", "depends_on": ["root"]} for i in range(20)]
+    steps.append({"step_id": "join", "action": "noop", "depends_on": [f"leaf{i}" for i in range(20)]})
+
+    run = start_run_from_dag(steps, workflow_id=workflow_instance.id)
+    run = run_workflow(run.id)
+
+    assert run.status == "completed"
+    statuses = {s.status for s in RunStep.query.filter_by(run_id=run.id).all()}
+    assert statuses == {"done"}
+
+
+def test_run_workflow_wait_step_parks_run(workflow_instance):
+    steps = [
+        {"step_id": "approve", "action": "wait_for_signal"},
+        {"step_id": "ship", "action": "noop", "depends_on": ["approve"]},
+    ]
+
+    run = start_run_from_dag(steps, workflow_id=workflow_instance.id)
+    run = run_workflow(run.id)
+
+    assert run.status == "waiting_for_signal"
+    ship = RunStep.query.filter_by(run_id=run.id, step_id="ship").first()
+    assert ship.status == "pending"
+
+
+def test_run_workflow_thread_mode_runs_branches_concurrently(app_ctx, workflow_instance, monkeypatch):
+    import time
+    from backend.app.services import executor
+
+    def slow_action(step_id, step_meta):
+        time.sleep(0.3)
+        return "done"
+
+    monkeypatch.setattr(executor, "execute_action", slow_action)
+    app_ctx.config["EXECUTOR_MODE"] = "thread"
+    app_ctx.config["EXECUTOR_RUN_CONCURRENCY"] = 5
+
+    steps = [{"step_id": f"branch{i}", "action": "http_call"} for i in range(5)]
+    run = start_run_from_dag(steps, workflow_id=workflow_instance.id)
+
+    started = time.time()
+    run = run_workflow(run.id)
+    elapsed = time.time() - started
+
+    assert run.status == "completed"
+    assert elapsed < 1.0  # serial execution would take ~1.5s
+
+
+def test_run_workflow_thread_mode_failure_compensates(app_ctx, workflow_instance):
+    from backend.app.models import Compensation
+
+    app_ctx.config["EXECUTOR_MODE"] = "thread"
+    steps = [
+        {"step_id": "ok", "action": "noop"},
+        {"step_id": "boom", "action": "fail"},
+    ]
+    run = start_run_from_dag(steps, workflow_id=workflow_instance.id)
+    run = run_workflow(run.id)
+
+    assert run.status == "failed"
+    assert RunStep.query.filter_by(run_id=run.id, step_id="boom").first().status == "failed"
+    assert Compensation.query.filter_by(run_id=run.id, step_id="boom").count() == 1
@@ -0,0 +1,100 @@
+# backend/tests/test_signals.py
+import pytest
+from backend.app.database import db
+from backend.app.models import WorkflowDef, Run, RunStep, Signal, SignalWait
+
+
+@pytest.fixture
+def workflow_instance(app_ctx):
+    wf = WorkflowDef(name="Signal Workflow", version="1.0", dsl_yaml="steps: []", created_by="pytest")
+    db.session.add(wf)
+    db.session.commit()
+    return wf
+
+
+def _start(client, wf, steps):
+    resp = client.post("/flow/run/start", json={"workflow_id": wf.id, "dsl": {"steps": steps}})
+    assert resp.status_code == 200
+    return resp.get_json()
+
+
+def test_parked_step_is_indexed_and_signal_resumes_run(client, workflow_instance):
+    data = _start(client, workflow_instance, [
+        {"id": "approve", "action": "wait_for_signal", "signal": "approve"},
+        {"id": "ship", "action": "noop", "depends_on": ["approve"]},
+    ])
+    assert data["status"] == "waiting_for_signal"
+    wait = SignalWait.query.filter_by(run_id=data["run_id"]).one()
+    assert (wait.step_id, wait.signal_name) == ("approve", "approve")
+
+    resp = client.post("/flow/run/signal/approve", json={"run_id": data["run_id"], "payload": {"by": "alice"}})
+
+    body = resp.get_json()
+    assert body["handled"] is True
+    assert body["status"] == "completed"
+    statuses = dict(db.session.query(RunStep.step_id, RunStep.status).filter_by(run_id=data["run_id"]))
+    assert statuses == {"approve": "done", "ship": "done"}
+    assert SignalWait.query.count() == 0
+    assert Signal.query.filter_by(run_id=data["run_id"], name="approve").count() == 1
+
+
+def test_signal_only_matches_declared_name(client, workflow_instance):
+    data = _start(client, workflow_instance, [
+        {"id": "approve", "action": "wait_for_signal", "signal": "approve"},
+    ])
+
+    resp = client.post("/flow/run/signal/reject", json={"run_id": data["run_id"]})
+
+    assert resp.get_json()["handled"] is False
+    assert Run.query.get(data["run_id"]).status == "waiting_for_signal"
+    assert SignalWait.query.count() == 1
+
+
+def test_cancelled_run_drops_index(client, workflow_instance):
+    data = _start(client, workflow_instance, [{"id": "gate", "action": "wait_for_signal"}])
+
+    client.post(f"/flow/run/{data['run_id']}/cancel")
+    resp = client.post("/flow/run/signal/anything", json={"run_id": data["run_id"]})
+
+    assert resp.get_json()["handled"] is False
+    assert SignalWait.query.count() == 0
+
+
+def test_concurrent_resumes_run_each_step_once(app_ctx, client, workflow_instance, monkeypatch):
+    import threading
+    from backend.app.services import executor, signals
+
+    data = _start(client, workflow_instance, [
+        {"id": "a", "action": "wait_for_signal", "signal": "a"},
+        {"id": "b", "action": "wait_for_signal", "signal": "b"},
+        {"id": "after_a", "action": "noop", "depends_on": ["a"]},
+        {"id": "after_b", "action": "noop", "depends_on": ["b"]},
+    ])
+    run_id = data["run_id"]
+    executed = []
+    execute = executor.execute_action
+
+    def second_signal():
+        with app_ctx.app_context():
+            signals.handle_signal(run_id, "b")
+            # resending the first signal finds nothing left to resume
+            assert signals.handle_signal(run_id, "a") is False
+            db.session.remove()
+
+    def action(sid, meta):
+        executed.append(sid)
+        if sid == "after_a":
+            # signal "b" lands while the pass resumed by "a" holds the run
+            worker = threading.Thread(target=second_signal)
+            worker.start()
+            worker.join()
+        return execute(sid, meta)
+
+    monkeypatch.setattr(executor, "execute_action", action)
+    assert signals.handle_signal(run_id, "a") is True
+
+    db.session.expire_all()
+    assert sorted(executed) == ["after_a", "after_b"]
+    assert Run.query.get(run_id).status == "completed"
+    statuses = dict(db.session.query(RunStep.step_id, RunStep.status).filter_by(run_id=run_id))
+    assert set(statuses.values()) == {"done"}
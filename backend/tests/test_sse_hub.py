@@ -0,0 +1,67 @@
+# backend/tests/test_sse_hub.py
+import pytest
+from backend.app.sse_hub import SseHub, LOCAL_CHANNEL
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    h = SseHub(redis_url="redis://unused", client_queue_size=2, heartbeat=0.01)
+    monkeypatch.setattr(h, "_ensure_listener", lambda: None)  # no Redis listener thread
+    return h
+
+
+def _commands(h):
+    out = []
+    while not h._commands.empty():
+        out.append(h._commands.get())
+    return out
+
+
+def test_one_redis_subscription_per_channel_fans_out_to_clients(hub):
+    a = hub.subscribe("workflow_1")
+    b = hub.subscribe("workflow_1")
+    other = hub.subscribe("workflow_2")
+
+    hub.dispatch("workflow_1", b'{"step_id": "s1"}')
+
+    assert next(hub.stream(a)) == 'data: {"step_id": "s1"}\n\n'
+    assert b.queue.get_nowait() == '{"step_id": "s1"}'
+    assert other.queue.empty()
+    assert _commands(hub) == [("subscribe", "workflow_1"), ("subscribe", "workflow_2")]
+
+
+def test_slow_consumer_is_evicted_without_blocking_others(hub):
+    slow = hub.subscribe("workflow_1")
+    fast = hub.subscribe("workflow_1")
+
+    for i in range(3):
+        hub.dispatch("workflow_1", f'{{"n": {i}}}')
+        fast.queue.get_nowait()
+
+    assert slow.evicted and not fast.evicted
+    assert hub.client_count("workflow_1") == 1
+    assert list(hub.stream(slow)) == ["event: evicted\ndata: {}\n\n"]
+
+
+def test_idle_stream_sends_heartbeat_and_releases_subscription_on_close(hub):
+    sub = hub.subscribe(LOCAL_CHANNEL)
+    frames = hub.stream(sub)
+
+    assert next(frames) == ": heartbeat\n\n"
+    frames.close()
+
+    assert hub.client_count() == 0
+    assert _commands(hub) == []  # the local channel never touches Redis
+
+
+def test_response_releases_subscription_when_closed_without_being_iterated(hub):
+    from flask import Flask
+
+    with Flask(__name__).test_request_context():
+        resp = hub.response("workflow_7")
+        assert hub.client_count("workflow_7") == 1
+
+        resp.close()  # what the WSGI server does when the client aborts before the first frame
+
+    assert hub.client_count() == 0
+    assert _commands(hub) == [("subscribe", "workflow_7"), ("unsubscribe", "workflow_7")]
@@ -5,6 +5,7 @@ import time
 from flask import Flask
 from backend.app.sse import sse_bp, event_stream
 from backend.app.event_publisher import publish_step_event
+from backend.app import taskpulse_sender
 import redis
 
 # Use a test Redis database
@@ -50,16 +51,19 @@ def test_taskpulseos_push(monkeypatch):
     run_id = 1000
     pushed_events = []
 
-    # Mock requests.post to TaskPulseOS
+    # Mock the background sender's HTTP post to TaskPulseOS (one event per post)
     def fake_post(url, json, timeout):
         pushed_events.append(json)
         return type("Response", (), {"status_code": 200})()
 
-    monkeypatch.setattr("backend.app.event_publisher.requests.post", fake_post)
+    monkeypatch.setattr(taskpulse_sender.sender._session, "post", fake_post)
 
     publish_step_event(run_id, "taskA", "completed")
     publish_step_event(run_id, "taskB", "failed")
+    taskpulse_sender.sender.flush()
 
+    # the shared sender may still hold updates queued by earlier tests
+    pushed_events = [e for e in pushed_events if e["run_id"] == run_id]
     assert len(pushed_events) == 2
     statuses = [e["status"] for e in pushed_events]
     assert "completed" in statuses
@@ -0,0 +1,135 @@
+# backend/tests/test_taskpulse_sender.py
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from backend.app.taskpulse_sender import TaskPulseSender
+
+
+class StubTaskPulse:
+    """
+    Local HTTP server recording posted batches (a single-event body counts as
+    a batch of one); `fail_next` requests, and every request once `fail_after`
+    batches were recorded, get a 503.
+    """
+
+    def __init__(self):
+        self.batches = []
+        self.fail_next = 0
+        self.fail_after = None
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if stub.fail_after is not None and len(stub.batches) >= stub.fail_after:
+                    self.send_response(503)
+                elif stub.fail_next:
+                    stub.fail_next -= 1
+                    self.send_response(503)
+                else:
+                    stub.batches.append(body["events"] if "events" in body else [body])
+                    self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/workflow-update"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def events(self):
+        return [e for batch in self.batches for e in batch]
+
+
+@pytest.fixture
+def stub():
+    s = StubTaskPulse()
+    yield s
+    s.server.shutdown()
+
+
+def _sender(url, tmp_path, **kwargs):
+    opts = dict(batch_size=10, flush_interval=60, retry_backoff=0.01, max_retries=2,
+                spill_path=str(tmp_path / "spill.jsonl"), payload="batch")
+    opts.update(kwargs)
+    return TaskPulseSender(url, **opts)
+
+
+def test_submit_does_not_block_and_coalesces_step_updates(stub, tmp_path):
+    sender = _sender(stub.url, tmp_path)
+
+    start = time.perf_counter()
+    sender.submit({"run_id": 1, "step_id": "a", "status": "running"})
+    sender.submit({"run_id": 1, "step_id": "b", "status": "running"})
+    sender.submit({"run_id": 1, "step_id": "a", "status": "success"})
+    assert time.perf_counter() - start < 0.05
+    sender.flush()
+
+    assert stub.batches == [[
+        {"run_id": 1, "step_id": "a", "status": "success"},
+        {"run_id": 1, "step_id": "b", "status": "running"},
+    ]]
+    assert sender.stats["coalesced"] == 1
+
+
+def test_batches_fill_up_to_batch_size_and_retry_on_5xx(stub, tmp_path):
+    sender = _sender(stub.url, tmp_path, batch_size=3)
+    stub.fail_next = 1
+
+    for i in range(7):
+        sender.submit({"run_id": 2, "step_id": f"s{i}", "status": "success"})
+    sender.flush()
+
+    assert [len(b) for b in stub.batches] == [3, 3, 1]
+    assert sender.stats["retries"] == 1
+
+
+def test_unreachable_endpoint_spills_then_replays(stub, tmp_path):
+    down = _sender("http://127.0.0.1:9/unreachable", tmp_path, max_retries=1)
+    down.submit({"run_id": 3, "step_id": "a", "status": "failure"})
+    down.flush()
+    assert (tmp_path / "spill.jsonl").read_text().count("\n") == 1
+
+    up = _sender(stub.url, tmp_path)
+    up.submit({"run_id": 3, "step_id": "b", "status": "success"})
+    up.flush()
+
+    assert [e["step_id"] for e in stub.events()] == ["b", "a"]
+    assert not (tmp_path / "spill.jsonl").exists()
+
+
+def test_spill_file_is_bounded(tmp_path):
+    sender = _sender("http://127.0.0.1:9/unreachable", tmp_path, max_retries=0, spill_max_bytes=200)
+
+    for i in range(20):
+        sender.submit({"run_id": 4, "step_id": f"s{i}", "status": "success"})
+    sender.flush()
+
+    assert (tmp_path / "spill.jsonl").stat().st_size <= 200
+    assert sender.stats["dropped"] > 0
+
+
+def test_event_payload_posts_one_event_per_request(stub, tmp_path):
+    sender = _sender(stub.url, tmp_path, payload="event")
+    events = [{"run_id": 4, "step_id": f"s{i}", "status": "success"} for i in range(3)]
+
+    for event in events:
+        sender.submit(event)
+    sender.flush()
+
+    assert stub.batches == [[event] for event in events]
+
+
+def test_event_payload_spills_only_undelivered_events(stub, tmp_path):
+    sender = _sender(stub.url, tmp_path, payload="event", max_retries=0)
+    stub.fail_after = 1
+    for i in range(3):
+        sender.submit({"run_id": 5, "step_id": f"s{i}", "status": "success"})
+    sender.flush()
+
+    assert [e["step_id"] for e in stub.events()] == ["s0"]
+    spilled = [json.loads(line)["step_id"] for line in (tmp_path / "spill.jsonl").read_text().splitlines()]
+    assert spilled == ["s1", "s2"]
@@ -1,14 +1,107 @@
 # tests/test_wait_signal.py
-def test_wait_signal_timer(db_session, celery_worker):
-    from backend.app.tasks.wait_signal import wait_step_task, schedule_wait_step
-    from backend.app.models import WaitStepTimer  # <-- import from models
+from datetime import datetime, timedelta
+import pytest
+from backend.app.database import db
+from backend.app.models import WorkflowDef, Run, RunStep, WaitStepTimer
+from backend.app.tasks import orchestration
+from backend.app.services import executor, timers
 
-    # Schedule a 1-second wait step
-    timer_id = schedule_wait_step(run_id=1, step_id="approval", wait_seconds=1)
 
-    # Wait for Celery task to complete
-    wait_step_task.apply(args=[timer_id]).get(timeout=10)
+@pytest.fixture
+def workflow_instance(app_ctx):
+    db.session.query(WaitStepTimer).delete()
+    wf = WorkflowDef(name="Timer Workflow", version="1.0", dsl_yaml="steps: []", created_by="pytest")
+    db.session.add(wf)
+    db.session.commit()
+    yield wf
+    db.session.query(WaitStepTimer).delete()
+    db.session.commit()
 
-    # Fetch timer from DB and assert status
-    timer = db_session.query(WaitStepTimer).get(timer_id)
-    assert timer.status == "triggered"
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        orchestration.run_workflow_task, "apply_async",
+        lambda args=None, **kwargs: calls.append(args[0])
+    )
+    return calls
+
+
+def _drive(run_ids):
+    """What the workers do with the runs a tick enqueued."""
+    for run_id in run_ids:
+        executor.run_workflow(run_id)
+    db.session.expire_all()
+
+
+def _start(client, wf, seconds):
+    steps = [
+        {"id": "cool_off", "action": "wait", "args": {"seconds": seconds}},
+        {"id": "notify", "action": "noop", "depends_on": ["cool_off"]},
+    ]
+    data = client.post("/flow/run/start", json={"workflow_id": wf.id, "dsl": {"steps": steps}}).get_json()
+    assert data["status"] == "waiting_for_signal"
+    return data["run_id"]
+
+
+def test_wait_signal_timer(app_ctx, client, workflow_instance, enqueued, monkeypatch):
+    from backend.app.tasks.wait_signal import fire_due_timers
+    monkeypatch.setattr(orchestration, "_flask_app", app_ctx)
+    run_id = _start(client, workflow_instance, seconds=0)
+
+    timer = db.session.query(WaitStepTimer).filter_by(run_id=run_id).one()
+    assert (timer.step_id, timer.status) == ("cool_off", "pending")
+
+    result = fire_due_timers.run()
+
+    assert result["fired"] == 1
+    db.session.expire_all()
+    assert db.session.get(WaitStepTimer, timer.id).status == "triggered"
+    # the tick only completes the wait step and enqueues the run, it never runs it inline
+    assert enqueued == [run_id]
+    assert RunStep.query.filter_by(run_id=run_id, step_id="notify").one().status == "pending"
+
+    _drive(enqueued)
+    assert Run.query.get(run_id).status == "completed"
+    assert RunStep.query.filter_by(run_id=run_id, step_id="notify").one().status == "done"
+
+
+def test_timers_fire_only_when_due_in_batches(client, workflow_instance, enqueued):
+    late = _start(client, workflow_instance, seconds=3600)
+    soon = [_start(client, workflow_instance, seconds=0) for _ in range(3)]
+
+    assert timers.fire_due(batch_size=2) == 3
+
+    assert enqueued == soon
+    _drive(enqueued)
+    assert [Run.query.get(r).status for r in soon] == ["completed"] * 3
+    assert Run.query.get(late).status == "waiting_for_signal"
+    assert timers.next_deadline() > datetime.utcnow() + timedelta(minutes=59)
+
+    # the long wait fires on the first tick after its deadline
+    enqueued.clear()
+    assert timers.fire_due(now=datetime.utcnow() + timedelta(hours=2)) == 1
+    _drive(enqueued)
+    assert Run.query.get(late).status == "completed"
+
+
+def test_failed_enqueue_is_retried_on_the_next_tick(client, workflow_instance, enqueued, monkeypatch):
+    run_id = _start(client, workflow_instance, seconds=0)
+
+    def broker_down(args=None, **kwargs):
+        raise ConnectionError("broker down")
+
+    with monkeypatch.context() as m:
+        m.setattr(orchestration.run_workflow_task, "apply_async", broker_down)
+        assert timers.fire_due() == 1
+    timer = db.session.query(WaitStepTimer).filter_by(run_id=run_id).one()
+    assert timer.status == "retry" and enqueued == []
+
+    # the step is already done; the retry only enqueues the run
+    assert timers.fire_due() == 1
+    assert enqueued == [run_id]
+    db.session.expire_all()
+    assert db.session.get(WaitStepTimer, timer.id).status == "triggered"
+    _drive(enqueued)
+    assert Run.query.get(run_id).status == "completed"
@@ -0,0 +1,63 @@
+"""move product and design image blobs to the image store
+
+Revision ID: 4c1e2a7b9d30
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c1e2a7b9d30'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from backend.app.services.image_store import move_blobs
+
+    # create_app() runs db.create_all() before migrations, so on a fresh database the
+    # tables already have these columns: only add what is missing
+    inspector = sa.inspect(op.get_bind())
+    columns = {c['name']: c for c in inspector.get_columns('product_image')}
+    indexes = {i['name'] for i in inspector.get_indexes('product_image')}
+    if not {'image_key', 'image_mime'} <= set(columns) or not columns['image_data']['nullable']:
+        with op.batch_alter_table('product_image', schema=None) as batch_op:
+            if 'image_key' not in columns:
+                batch_op.add_column(sa.Column('image_key', sa.String(length=64), nullable=True))
+            if 'image_mime' not in columns:
+                batch_op.add_column(sa.Column('image_mime', sa.String(length=50), nullable=True))
+            if not columns['image_data']['nullable']:
+                batch_op.alter_column('image_data', existing_type=sa.LargeBinary(), nullable=True)
+    if 'ix_product_image_image_key' not in indexes:
+        op.create_index('ix_product_image_image_key', 'product_image', ['image_key'], unique=False)
+
+    columns = {c['name'] for c in inspector.get_columns('design')}
+    indexes = {i['name'] for i in inspector.get_indexes('design')}
+    if 'image_key' not in columns:
+        with op.batch_alter_table('design', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('image_key', sa.String(length=64), nullable=True))
+    if 'ix_design_image_key' not in indexes:
+        op.create_index('ix_design_image_key', 'design', ['image_key'], unique=False)
+
+    # copies every blob into IMAGE_STORE_DIR (with thumbnails), then clears it in the row
+    move_blobs(op.get_bind())
+
+
+def downgrade():
+    from backend.app.services.image_store import restore_blobs
+
+    restore_blobs(op.get_bind())
+
+    with op.batch_alter_table('design', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_design_image_key'))
+        batch_op.drop_column('image_key')
+
+    with op.batch_alter_table('product_image', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_product_image_image_key'))
+        batch_op.alter_column('image_data', existing_type=sa.LargeBinary(), nullable=False)
+        batch_op.drop_column('image_mime')
+        batch_op.drop_column('image_key')
@@ -0,0 +1,30 @@
+"""product.updated_at row version for catalog ETags
+
+Revision ID: 5b7d3e9f1a42
+Revises: 4c1e2a7b9d30
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7d3e9f1a42'
+down_revision = '4c1e2a7b9d30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_app() runs db.create_all() before migrations: the column may already exist
+    if 'updated_at' not in {c['name'] for c in sa.inspect(op.get_bind()).get_columns('product')}:
+        with op.batch_alter_table('product', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    op.execute("UPDATE product SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL")
+
+
+def downgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,33 @@
+"""(created_at, id) / (timestamp, id) indexes for keyset-paginated listings
+
+Revision ID: 6e8f0a1b2c53
+Revises: 5b7d3e9f1a42
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e8f0a1b2c53'
+down_revision = '5b7d3e9f1a42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # rows without a timestamp would never match a (timestamp, id) < cursor comparison
+    op.execute("UPDATE product SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    op.execute("UPDATE design SET timestamp = CURRENT_TIMESTAMP WHERE timestamp IS NULL")
+    # create_app() runs db.create_all() before migrations: the indexes may already exist
+    inspector = sa.inspect(op.get_bind())
+    if 'ix_product_created_at_id' not in {i['name'] for i in inspector.get_indexes('product')}:
+        op.create_index('ix_product_created_at_id', 'product', ['created_at', 'id'], unique=False)
+    if 'ix_design_timestamp_id' not in {i['name'] for i in inspector.get_indexes('design')}:
+        op.create_index('ix_design_timestamp_id', 'design', ['timestamp', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_design_timestamp_id', table_name='design')
+    op.drop_index('ix_product_created_at_id', table_name='product')
@@ -0,0 +1,46 @@
+"""signal_waits index of steps parked for a signal
+
+Revision ID: 7a9c1d3e5f64
+Revises: 6e8f0a1b2c53
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a9c1d3e5f64'
+down_revision = '6e8f0a1b2c53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_app() runs db.create_all() before migrations: the table may already exist
+    if 'signal_waits' in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        'signal_waits',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('step_id', sa.String(length=100), nullable=False),
+        sa.Column('signal_name', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['run_id'], ['runs.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('run_id', 'step_id', name='uq_signal_waits_run_step'),
+    )
+    op.create_index('ix_signal_waits_run_signal', 'signal_waits', ['run_id', 'signal_name'], unique=False)
+
+    # steps parked before the index existed wait for any signal
+    op.execute(
+        "INSERT INTO signal_waits (run_id, step_id, signal_name, created_at) "
+        "SELECT run_id, step_id, NULL, CURRENT_TIMESTAMP FROM run_steps WHERE status = 'waiting_for_signal'"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_signal_waits_run_signal', table_name='signal_waits')
+    op.drop_table('signal_waits')
@@ -0,0 +1,47 @@
+"""product_import jobs for bulk catalog imports
+
+Revision ID: 8b0d2e4f6a75
+Revises: 7a9c1d3e5f64
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b0d2e4f6a75'
+down_revision = '7a9c1d3e5f64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_app() runs db.create_all() before migrations: the table may already exist
+    if 'product_import' in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        'product_import',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('manifest', sa.String(length=500), nullable=False),
+        sa.Column('image_dir', sa.String(length=500), nullable=False),
+        sa.Column('fingerprint', sa.String(length=40), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('rows_done', sa.Integer(), nullable=True),
+        sa.Column('inserted', sa.Integer(), nullable=True),
+        sa.Column('rejected', sa.Integer(), nullable=True),
+        sa.Column('errors', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_product_import_fingerprint', 'product_import', ['fingerprint'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_product_import_fingerprint', table_name='product_import')
+    op.drop_table('product_import')
@@ -0,0 +1,27 @@
+"""(status, trigger_at) index for the wait-step timer tick
+
+Revision ID: 9c1e3f5a7b86
+Revises: 8b0d2e4f6a75
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c1e3f5a7b86'
+down_revision = '8b0d2e4f6a75'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_all() creates indexes only with new tables: existing databases still lack this one
+    if 'ix_wait_step_timers_due' in {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('wait_step_timers')}:
+        return
+    op.create_index('ix_wait_step_timers_due', 'wait_step_timers', ['status', 'trigger_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_wait_step_timers_due', table_name='wait_step_timers')